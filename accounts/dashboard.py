@@ -0,0 +1,114 @@
+"""
+Öğrenci paneli: kayıtlı dersler + ders toplamı + LO attainment özeti.
+
+Panel verisi öğrenci başına tek bir cache girdisinde, öğrencinin ``STUDENT``
+versiyonuyla birlikte tutulur (bkz. ``config.cache``); sıcak yolda sayaç ve
+girdi tek ``get_many`` ile okunur, versiyonu eskiyse girdi yeniden kurulur.
+Versiyon öğrencinin türetilmiş verisi (``CourseGrade``, LO attainment), ders
+kayıtları ya da kendi kaydı değişince artar — çağıranlar ``invalidate_*``
+fonksiyonlarını kullanır. Program adı gibi öğrenciye ait olmayan veriler
+girdiye konmaz; view onları ayrıca okur. Paylaşılan cache yoksa
+(``STUDENT_DASHBOARD_CACHE_TTL`` 0) panel her istekte sorgulanır.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from config.cache import STUDENT, bump_versions, get_version, version_key
+
+CACHE_KEY = "accounts:student_dashboard:{}"
+
+
+def dashboard_cache_key(student_id):
+    return CACHE_KEY.format(student_id)
+
+
+def build_student_dashboard(user):
+    """Cache'lenecek (pickle edilebilir) panel verisi; üç düz sorgu."""
+    from assessments.models import CourseGrade  # local import, circular'ı önler
+    from curriculum.models import Curriculum
+    from outcomes.models import LearningOutcomeAttainment
+
+    courses = [
+        {
+            "id": curriculum_id,
+            "code": code,
+            "name": name,
+            "semester": Curriculum.Semester(semester).label,
+            "total": None,
+            "los": [],
+        }
+        for curriculum_id, code, name, semester in (
+            Curriculum.objects.filter(students=user)
+            .order_by("semester", "code")
+            .values_list("id", "code", "name", "semester")
+        )
+    ]
+    by_id = {course["id"]: course for course in courses}
+
+    if by_id:
+        for curriculum_id, total in CourseGrade.objects.filter(
+            student=user, curriculum_id__in=by_id,
+        ).values_list("curriculum_id", "total"):
+            by_id[curriculum_id]["total"] = total
+
+        for curriculum_id, code, attainment in (
+            LearningOutcomeAttainment.objects
+            .filter(student=user, learning_outcome__curriculum_id__in=by_id)
+            .order_by("learning_outcome__order", "learning_outcome__code")
+            .values_list("learning_outcome__curriculum_id", "learning_outcome__code", "attainment")
+        ):
+            by_id[curriculum_id]["los"].append((code, attainment))
+
+    for course in courses:
+        values = [attainment for _, attainment in course["los"]]
+        course["lo_average"] = sum(values) / len(values) if values else None
+
+    return {"courses": courses}
+
+
+def get_student_dashboard(user):
+    if not settings.STUDENT_DASHBOARD_CACHE_TTL:
+        return build_student_dashboard(user)
+
+    counter_key, key = version_key(STUDENT, user.pk), dashboard_cache_key(user.pk)
+    found = cache.get_many([counter_key, key])
+    version = found.get(counter_key)
+    if version is None:
+        version = get_version(STUDENT, user.pk)
+    entry = found.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+
+    # Versiyon veriden önce okunur: kurulum sırasında artarsa girdi bir sonraki istekte eskir
+    data = build_student_dashboard(user)
+    cache.set(key, (version, data), settings.STUDENT_DASHBOARD_CACHE_TTL)
+    return data
+
+
+def invalidate_student_dashboards(student_ids):
+    # Eski girdiler silinmez, sadece bir daha okunmaz (TTL ile düşer)
+    bump_versions(*[(STUDENT, student_id) for student_id in set(student_ids) if student_id])
+
+
+def invalidate_curriculum_dashboards(pending):
+    """
+    ``pending``: {curriculum_id: student_ids | None}. None → dersin tüm
+    öğrencileri (kayıtlı olanlar + notu olanlar, tek sorgu).
+    """
+    from accounts.models import CustomUser  # local import, circular'ı önler
+
+    student_ids = set()
+    whole = []
+    for curriculum_id, ids in pending.items():
+        if ids is None:
+            whole.append(curriculum_id)
+        else:
+            student_ids.update(ids)
+    if whole:
+        student_ids.update(
+            CustomUser.objects.filter(
+                Q(enrolled_curricula__in=whole) | Q(assessment_results__assessment__curriculum__in=whole)
+            ).order_by().values_list("id", flat=True).distinct()
+        )
+    invalidate_student_dashboards(student_ids)
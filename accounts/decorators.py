@@ -2,8 +2,10 @@ from functools import wraps
 
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
+from django.utils.functional import SimpleLazyObject
 
 from .models import CustomUser
+from .permissions import get_request_scope
 
 
 def role_required(*allowed_roles):
@@ -11,12 +13,17 @@ def role_required(*allowed_roles):
     Örnek:
         @role_required(CustomUser.Role.STUDENT_AFFAIRS)
         @role_required(CustomUser.Role.LECTURER, CustomUser.Role.FACULTY_MEMBER)
+
+    View içinde ``request.access_scope`` (bkz. ``accounts.permissions``)
+    ile curriculum / program yetkisi sorgusuz kontrol edilebilir.
     """
     def decorator(view_func):
         @login_required
         @wraps(view_func)
         def _wrapped_view(request, *args, **kwargs):
             user: CustomUser = request.user
+            # Curriculum / program yetki kümeleri ilk kullanımda yüklenir
+            request.access_scope = SimpleLazyObject(lambda: get_request_scope(request))
 
             if user.is_admin or user.role in allowed_roles:
                 return view_func(request, *args, **kwargs)
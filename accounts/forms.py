@@ -1,5 +1,9 @@
 from django import forms
 from django.contrib.auth import get_user_model
+from django.db.models import Q
+
+from organizations.models import Faculty, Program
+from .search import fold_search_text
 
 CustomUser = get_user_model()
 
@@ -96,3 +100,89 @@ class UserCreateForm(forms.ModelForm):
             # M2M'ler
             self.save_m2m()
         return user
+
+
+class StudentImportForm(forms.Form):
+    file = forms.FileField(
+        label="CSV file",
+        help_text="Columns: username, email, first_name, last_name, password, program, grade.",
+    )
+
+
+class StudentPromotionForm(forms.Form):
+    faculty = forms.ModelChoiceField(
+        queryset=Faculty.objects.order_by("code"),
+        required=False,
+        help_text="Promote every program of this faculty.",
+    )
+    program = forms.ModelChoiceField(
+        queryset=Program.objects.order_by("code"),
+        required=False,
+        help_text="…or only this program.",
+    )
+    dry_run = forms.BooleanField(
+        required=False,
+        initial=True,
+        help_text="Only report what would change.",
+    )
+
+    def clean(self):
+        cleaned = super().clean()
+        if not cleaned.get("faculty") and not cleaned.get("program"):
+            raise forms.ValidationError("Select a faculty or a program.")
+        return cleaned
+
+    def program_ids(self):
+        program = self.cleaned_data.get("program")
+        if program:
+            return [program.id]
+        return list(
+            Program.objects.filter(faculty=self.cleaned_data["faculty"])
+            .values_list("id", flat=True)
+        )
+
+
+# Kullanıcı listesinde aranan (katlanmış, indeksli) kolonlar; bkz. accounts.search
+USER_SEARCH_FIELDS = ("search_username", "search_first_name", "search_last_name", "search_email")
+
+
+def _prefix_q(field_name, prefix):
+    # LIKE 'x%' SQLite'ta (case-insensitive LIKE) ve locale collation'lı
+    # PostgreSQL'de indeks kullanmıyor; aralık karşılaştırması kullanıyor
+    return Q(**{f"{field_name}__gte": prefix, f"{field_name}__lt": prefix + "\U0010ffff"})
+
+
+class UserFilterForm(forms.Form):
+    q = forms.CharField(required=False, max_length=150, label="Search")
+    role = forms.ChoiceField(required=False)
+    program = forms.ModelChoiceField(
+        queryset=Program.objects.order_by("code"),
+        required=False,
+    )
+    grade = forms.IntegerField(required=False, min_value=1, max_value=10)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["q"].help_text = "Start of username, first / last name or email."
+        self.fields["role"].choices = [("", "All roles")] + [
+            choice for choice in CustomUser.Role.choices if choice[0] != CustomUser.Role.ADMIN
+        ]
+
+    def filter(self, queryset):
+        """Geçerli filtreleri SQL'e çevirir; form geçersizse queryset olduğu gibi döner."""
+        if not self.is_valid():
+            return queryset
+        data = self.cleaned_data
+        prefix = fold_search_text(data["q"].strip())
+        if prefix:
+            condition = Q()
+            for field_name in USER_SEARCH_FIELDS:
+                condition |= _prefix_q(field_name, prefix)
+            queryset = queryset.filter(condition)
+        if data["role"]:
+            queryset = queryset.filter(role=data["role"])
+        if data["program"]:
+            queryset = queryset.filter(student_program=data["program"])
+        if data["grade"]:
+            queryset = queryset.filter(student_grade=data["grade"])
+        return queryset
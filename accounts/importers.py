@@ -0,0 +1,183 @@
+import csv
+
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+
+from curriculum.enrollment import rebuild_enrollments
+from organizations.models import Program
+from .models import CustomUser
+
+REQUIRED_COLUMNS = ("username", "program", "grade")
+# bulk_create model doğrulamasını atlar; bu alanlar satır satır doğrulanır
+VALIDATED_FIELDS = ("username", "email", "first_name", "last_name")
+MAX_REPORTED_ERRORS = 200
+# pool.map'e giden her işte hash'lenen şifre sayısı (process'ler arası gidiş-geliş)
+HASH_TASK_SIZE = 8
+
+
+class StudentImportReport:
+    """
+    Import sonucu: oluşturulan öğrenci / enrollment sayıları ve satır bazlı
+    hatalar (en fazla ``MAX_REPORTED_ERRORS`` tanesi saklanır).
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.enrollments_added = 0
+        self.error_count = 0
+        self.errors = []
+
+    def add_error(self, line_no, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line_no, message))
+
+    @property
+    def errors_truncated(self):
+        return self.error_count > len(self.errors)
+
+
+def _field_errors(values):
+    """
+    ``values`` (alan adı → değer) için model alanlarının validator'larını
+    (max_length, UnicodeUsernameValidator, EmailValidator...) çalıştırır.
+    """
+    errors = []
+    for name, value in values.items():
+        try:
+            CustomUser._meta.get_field(name).run_validators(value)
+        except ValidationError as exc:
+            errors.append(f"Invalid {name} '{value}': {' '.join(exc.messages)}")
+    return errors
+
+
+def _hash_passwords(passwords, pool):
+    """
+    Şifreleri hash'ler. Hash'leme kasıtlı olarak yavaş olduğu için ``pool``
+    (çağıranın import boyunca açık tuttuğu executor) verilirse paralel,
+    yoksa aynı process'te çalışır. Boş şifre → kullanılamaz (unusable) şifre.
+    """
+    passwords = [password or None for password in passwords]
+    if pool is None or len(passwords) < 2:
+        return [make_password(password) for password in passwords]
+    return list(pool.map(make_password, passwords, chunksize=HASH_TASK_SIZE))
+
+
+def import_students(lines, pool=None, chunk_size=500):
+    """
+    CSV'den toplu öğrenci oluşturur. ``pool``: şifre hash'leme için
+    ``concurrent.futures`` executor'ı (bkz. ``import_students`` komutu);
+    None → hash'ler istek içinde, sırayla.
+
+    Kolonlar: ``username, email, first_name, last_name, password, program, grade``
+    (``program`` = Program.code). Kullanıcılar ``bulk_create`` ile yazıldığı
+    için satır başı post_save / enrollment senkronizasyonu çalışmaz; etkilenen
+    (program, grade) dersleri en sonda tek set-based geçişle güncellenir.
+    """
+    report = StudentImportReport()
+
+    reader = csv.DictReader(lines)
+    fieldnames = [name.strip().lower() for name in (reader.fieldnames or [])]
+    missing = [column for column in REQUIRED_COLUMNS if column not in fieldnames]
+    if missing:
+        report.add_error(1, f"Missing column(s): {', '.join(missing)}.")
+        return report
+    reader.fieldnames = fieldnames
+
+    programs = {
+        code: (program_id, faculty_id)
+        for program_id, code, faculty_id in Program.objects.values_list("id", "code", "faculty_id")
+    }
+
+    seen_usernames = set()
+    affected_programs = set()
+    affected_grades = set()
+    pending = []
+
+    for row in reader:
+        report.rows += 1
+        line_no = reader.line_num
+        values = {name: (row.get(name) or "").strip() for name in VALIDATED_FIELDS}
+        values["username"] = CustomUser.normalize_username(values["username"])
+        values["email"] = CustomUser.objects.normalize_email(values["email"])
+        username = values["username"]
+        program_code = (row.get("program") or "").strip()
+        raw_grade = (row.get("grade") or "").strip()
+
+        if not username:
+            report.add_error(line_no, "Missing username.")
+            continue
+        field_errors = _field_errors(values)
+        if field_errors:
+            report.add_error(line_no, " ".join(field_errors))
+            continue
+        if username in seen_usernames:
+            report.add_error(line_no, f"Duplicate username '{username}' in file.")
+            continue
+
+        program = programs.get(program_code)
+        if program is None:
+            report.add_error(line_no, f"Unknown program '{program_code}'.")
+            continue
+
+        try:
+            grade = int(raw_grade)
+        except ValueError:
+            grade = 0
+        if grade <= 0:
+            report.add_error(line_no, f"Invalid grade '{raw_grade}'.")
+            continue
+
+        seen_usernames.add(username)
+        pending.append((line_no, row, values, program, grade))
+
+        if len(pending) >= chunk_size:
+            _create_chunk(pending, pool, report, affected_programs, affected_grades)
+            pending = []
+
+    if pending:
+        _create_chunk(pending, pool, report, affected_programs, affected_grades)
+
+    # Tüm kullanıcılar yazıldıktan sonra tek geçişte enrollment
+    added, _ = rebuild_enrollments(affected_programs, years=affected_grades)
+    report.enrollments_added = added
+    return report
+
+
+def _create_chunk(pending, pool, report, affected_programs, affected_grades):
+    existing = set(
+        CustomUser.objects.filter(
+            username__in=[values["username"] for _, _, values, _, _ in pending],
+        ).values_list("username", flat=True)
+    )
+
+    rows = []
+    for line_no, row, values, program, grade in pending:
+        if values["username"] in existing:
+            report.add_error(line_no, f"User '{values['username']}' already exists.")
+            continue
+        rows.append((row, values, program, grade))
+
+    hashes = _hash_passwords(
+        [(row.get("password") or "").strip() for row, _, _, _ in rows],
+        pool,
+    )
+
+    users = []
+    for (row, values, (program_id, faculty_id), grade), password_hash in zip(rows, hashes):
+        users.append(
+            CustomUser(
+                **values,
+                password=password_hash,
+                role=CustomUser.Role.STUDENT,
+                student_program_id=program_id,
+                student_faculty_id=faculty_id,
+                student_grade=grade,
+            )
+        )
+        affected_programs.add(program_id)
+        affected_grades.add(grade)
+
+    CustomUser.objects.bulk_create(users)
+    report.created += len(users)
@@ -0,0 +1,56 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.importers import import_students
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-create students from a CSV file "
+        "(username, email, first_name, last_name, password, program, grade)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_path")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Processes used for password hashing (default: CPU count, 1 = no pool).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of users created per bulk insert.",
+        )
+
+    def handle(self, *args, **options):
+        workers = options["workers"] or os.cpu_count() or 1
+        if workers < 1:
+            raise CommandError("--workers must be at least 1.")
+
+        try:
+            with open(options["csv_path"], encoding="utf-8-sig", newline="") as fh:
+                # Pool import boyunca bir kez açılır; chunk'lar aynı process'leri kullanır
+                with ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext() as pool:
+                    report = import_students(
+                        fh,
+                        pool=pool,
+                        chunk_size=options["chunk_size"],
+                    )
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        for line_no, message in report.errors:
+            self.stderr.write(f"line {line_no}: {message}")
+        if report.errors_truncated:
+            self.stderr.write(f"... {report.error_count - len(report.errors)} more errors")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{report.rows} rows read: {report.created} students created, "
+            f"{report.enrollments_added} enrollments added, {report.error_count} errors."
+        ))
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.promotion import FINAL_GRADE, promote_students
+from organizations.models import Program
+
+
+class Command(BaseCommand):
+    help = "Promote every student of the given programs / faculties to the next grade."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--program",
+            action="append",
+            default=[],
+            help="Program code (repeatable).",
+        )
+        parser.add_argument(
+            "--faculty",
+            action="append",
+            default=[],
+            help="Faculty code; promotes all of its programs (repeatable).",
+        )
+        parser.add_argument(
+            "--final-grade",
+            type=int,
+            default=FINAL_GRADE,
+            help="Students already in this grade are not promoted.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Run everything, print the report and roll back.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["program"] and not options["faculty"]:
+            raise CommandError("Give at least one --program or --faculty.")
+
+        programs = Program.objects.filter(code__in=options["program"]) | Program.objects.filter(
+            faculty__code__in=options["faculty"],
+        )
+        program_ids = list(programs.values_list("id", flat=True).distinct())
+        if not program_ids:
+            raise CommandError("No matching programs.")
+
+        report = promote_students(
+            program_ids,
+            final_grade=options["final_grade"],
+            dry_run=options["dry_run"],
+        )
+
+        for row in report.before:
+            self.stdout.write(
+                f"{row['student_program__code']} grade {row['student_grade']}: {row['count']} students"
+            )
+        prefix = "[dry-run] " if report.dry_run else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{report.promoted} promoted, {report.held} kept in final grade, "
+            f"{report.enrollments_added} enrollments added, {report.enrollments_removed} removed."
+        ))
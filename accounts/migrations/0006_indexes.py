@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_rename_faculty_customuser_faculty_member_faculty_and_more'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('curriculum', '0001_initial'),
+        ('organizations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['role', 'student_program', 'student_grade'], name='accounts_student_lookup_idx'),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:27
+
+import accounts.search
+from django.db import migrations, models
+
+SEARCH_FIELDS = {
+    "search_username": "username",
+    "search_first_name": "first_name",
+    "search_last_name": "last_name",
+    "search_email": "email",
+}
+
+
+def fill_search_keys(apps, schema_editor):
+    CustomUser = apps.get_model("accounts", "CustomUser")
+    batch = []
+    for user in CustomUser.objects.only(*SEARCH_FIELDS.values()).iterator(chunk_size=2000):
+        for target, source in SEARCH_FIELDS.items():
+            setattr(user, target, accounts.search.fold_search_text(getattr(user, source))[:255])
+        batch.append(user)
+        if len(batch) >= 2000:
+            CustomUser.objects.bulk_update(batch, list(SEARCH_FIELDS), batch_size=500)
+            batch = []
+    if batch:
+        CustomUser.objects.bulk_update(batch, list(SEARCH_FIELDS), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_indexes'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('curriculum', '0003_updated_at'),
+        ('organizations', '0002_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['role', 'username'], name='accounts_role_username_idx'),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='search_email',
+            field=accounts.search.SearchKeyField(blank=True, db_index=True, default='', editable=False, max_length=255, source='email'),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='search_first_name',
+            field=accounts.search.SearchKeyField(blank=True, db_index=True, default='', editable=False, max_length=255, source='first_name'),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='search_last_name',
+            field=accounts.search.SearchKeyField(blank=True, db_index=True, default='', editable=False, max_length=255, source='last_name'),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='search_username',
+            field=accounts.search.SearchKeyField(blank=True, db_index=True, default='', editable=False, max_length=255, source='username'),
+        ),
+        migrations.RunPython(fill_search_keys, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,9 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
 
+from .search import SearchKeyField
+from .tracking import TrackedFieldsMixin
+
 
 class CustomUserManager(BaseUserManager):
     use_in_migrations = True
@@ -29,7 +32,12 @@ class CustomUserManager(BaseUserManager):
 
         return self.create_user(username, email, password, **extra_fields)
 
-class CustomUser(AbstractUser):
+class CustomUser(TrackedFieldsMixin, AbstractUser):
+    # Enrollment'ı etkileyen alanlar (sadece bunlar değişince senkronize edilir)
+    # + şablonlarda gösterilen username (versiyonlu cache, bkz. config.cache)
+    tracked_fields = ("role", "student_program_id", "student_grade", "username")
+    enrollment_fields = ("role", "student_program_id", "student_grade")
+
     class Role(models.TextChoices):
         ADMIN = "ADMIN", "Admin"
         STUDENT_AFFAIRS = "STUDENT_AFFAIRS", "Student Affairs"
@@ -96,8 +104,25 @@ class CustomUser(AbstractUser):
         null=True,
     )
 
+    # Kullanıcı listesi araması (accounts.forms.UserFilterForm); bkz. accounts.search
+    search_username = SearchKeyField(source="username")
+    search_first_name = SearchKeyField(source="first_name")
+    search_last_name = SearchKeyField(source="last_name")
+    search_email = SearchKeyField(source="email")
+
     objects = CustomUserManager()
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Enrollment senkronizasyonu: role + program + sınıf ile öğrenci listesi
+            models.Index(
+                fields=["role", "student_program", "student_grade"],
+                name="accounts_student_lookup_idx",
+            ),
+            # Kullanıcı listesi: rol filtresiyle username sırasında keyset sayfalama
+            models.Index(fields=["role", "username"], name="accounts_role_username_idx"),
+        ]
+
     def __str__(self):
         return f"{self.username} ({self.role})"
 
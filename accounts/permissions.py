@@ -0,0 +1,85 @@
+"""
+Tek yetkilendirme servisi.
+
+Kullanıcının yönetebildiği curriculum ve program id'leri request başına bir
+kez (tek sorguyla) yüklenir ve request boyunca ``request.access_scope``
+üzerinden O(1) kontrol edilir.
+
+- Lecturer: ``Curriculum.lecturer`` ya da ``lecturer_curricula`` ile atandığı dersler
+- Faculty Member: ``Faculty.responsible`` olduğu fakültelerin programları
+- Admin: her şey
+
+Kapsam request'ler arasında cache'lenmez: varsayılan cache süreç başına
+(locmem) ve signal ile silme sadece değişikliği yapan worker'da çalışır;
+yetkisi kaldırılan biri diğer worker'larda erişmeye devam ederdi.
+"""
+from django.core.exceptions import PermissionDenied
+from django.db.models import CharField, Q, Value
+
+_CURRICULUM = "c"
+_PROGRAM = "p"
+
+
+class AccessScope:
+    def __init__(self, curriculum_ids=(), program_ids=(), is_admin=False):
+        self.curriculum_ids = frozenset(curriculum_ids)
+        self.program_ids = frozenset(program_ids)
+        self.is_admin = is_admin
+
+    def can_manage_curriculum(self, curriculum):
+        curriculum_id = getattr(curriculum, "pk", curriculum)
+        return self.is_admin or curriculum_id in self.curriculum_ids
+
+    def can_manage_program(self, program):
+        program_id = getattr(program, "pk", program)
+        return self.is_admin or program_id in self.program_ids
+
+
+def _load_scope(user):
+    from curriculum.models import Curriculum  # local import, circular'ı önler
+    from organizations.models import Program
+
+    # Ana lecturer FK'si + lecturer_curricula M2M ve sorumlu olunan fakültelerin
+    # programları tek sorguda (UNION)
+    curricula = (
+        Curriculum.objects.filter(Q(lecturer_id=user.pk) | Q(lecturers=user.pk))
+        .order_by()
+        .values_list("id", Value(_CURRICULUM, output_field=CharField()))
+    )
+    programs = (
+        Program.objects.filter(faculty__responsible_id=user.pk)
+        .order_by()
+        .values_list("id", Value(_PROGRAM, output_field=CharField()))
+    )
+
+    curriculum_ids = []
+    program_ids = []
+    for pk, kind in curricula.union(programs):
+        (curriculum_ids if kind == _CURRICULUM else program_ids).append(pk)
+    return AccessScope(curriculum_ids, program_ids)
+
+
+def get_access_scope(user):
+    if not user.is_authenticated:
+        return AccessScope()
+    if user.is_admin:
+        return AccessScope(is_admin=True)
+    return _load_scope(user)
+
+
+def get_request_scope(request):
+    """Request başına bir kez yüklenir (``role_required`` de aynı nesneyi kullanır)."""
+    scope = getattr(request, "_access_scope", None)
+    if scope is None:
+        scope = request._access_scope = get_access_scope(request.user)
+    return scope
+
+
+def require_curriculum_access(request, curriculum):
+    if not get_request_scope(request).can_manage_curriculum(curriculum):
+        raise PermissionDenied("You are not allowed to manage this curriculum.")
+
+
+def require_program_access(request, program):
+    if not get_request_scope(request).can_manage_program(program):
+        raise PermissionDenied("You are not allowed to manage this program.")
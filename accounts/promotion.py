@@ -0,0 +1,61 @@
+"""
+Yıl sonu sınıf atlatma (grade promotion).
+
+Bir program ya da fakültedeki tüm öğrencilerin ``student_grade``'i tek bir
+UPDATE ile bir artırılır, ardından etkilenen derslerin öğrenci listeleri
+set-based olarak yeniden kurulur. Hepsi tek transaction içinde çalışır;
+``dry_run`` ise aynı işlem yapılıp rapor alındıktan sonra geri alınır.
+"""
+from django.db import transaction
+from django.db.models import Count, F
+
+from curriculum.enrollment import rebuild_enrollments
+from curriculum.models import Curriculum
+from .models import CustomUser
+
+FINAL_GRADE = max(Curriculum.Year.values)
+
+
+class PromotionReport:
+    def __init__(self, dry_run):
+        self.dry_run = dry_run
+        self.before = []
+        self.promoted = 0
+        self.held = 0
+        self.enrollments_added = 0
+        self.enrollments_removed = 0
+
+
+def promote_students(program_ids, final_grade=FINAL_GRADE, dry_run=False):
+    """
+    ``program_ids`` içindeki öğrencileri bir üst sınıfa geçirir.
+    ``final_grade``'deki öğrenciler (mezuniyet modellenmediği için) olduğu
+    yerde bırakılır ve ``held`` olarak raporlanır.
+    """
+    program_ids = list(program_ids)
+    report = PromotionReport(dry_run)
+
+    students = CustomUser.objects.filter(
+        role=CustomUser.Role.STUDENT,
+        student_program_id__in=program_ids,
+        student_grade__isnull=False,
+    )
+
+    with transaction.atomic():
+        report.before = list(
+            students.values("student_program__code", "student_grade")
+            .annotate(count=Count("id"))
+            .order_by("student_program__code", "student_grade")
+        )
+
+        report.held = students.filter(student_grade__gte=final_grade).count()
+        report.promoted = students.filter(student_grade__lt=final_grade).update(
+            student_grade=F("student_grade") + 1,
+        )
+
+        report.enrollments_added, report.enrollments_removed = rebuild_enrollments(program_ids)
+
+        if dry_run:
+            transaction.set_rollback(True)
+
+    return report
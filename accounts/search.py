@@ -0,0 +1,45 @@
+"""
+Kullanıcı listesi araması için katlanmış (casefold) arama kolonları.
+
+SQL ``LOWER()`` SQLite'ta sadece ASCII harfleri küçültür (``Çelik`` olduğu
+gibi kalır); Python tarafında küçültülen aramayla eşleşmez. Bu yüzden aranan
+alanların Python'da katlanmış kopyası ayrı, indeksli kolonlarda tutulur ve
+arama iki tarafta da aynı ``fold_search_text`` ile yapılır.
+"""
+from django.db import models
+
+
+def fold_search_text(value):
+    """
+    Büyük/küçük harf ve Türkçe noktalı/noktasız i farkı olmadan karşılaştırma
+    için: ``İ`` / ``I`` / ``ı`` → ``i``, geri kalan Unicode ``casefold``.
+    """
+    return (value or "").replace("İ", "i").casefold().replace("ı", "i")
+
+
+class SearchKeyField(models.CharField):
+    """
+    ``source`` alanının katlanmış kopyası. Değer kayıt sırasında ``pre_save``
+    ile hesaplanır (``bulk_create`` dahil); ``QuerySet.update()``,
+    ``bulk_update`` ya da ``save(update_fields=...)`` kaynağı değiştirirse bu
+    kolon da açıkça yazılmalı / listelenmeli.
+    """
+
+    def __init__(self, *args, source=None, **kwargs):
+        self.source = source
+        kwargs.setdefault("max_length", 255)
+        kwargs.setdefault("editable", False)
+        kwargs.setdefault("blank", True)
+        kwargs.setdefault("default", "")
+        kwargs.setdefault("db_index", True)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs["source"] = self.source
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        value = fold_search_text(getattr(model_instance, self.source))[:self.max_length]
+        setattr(model_instance, self.attname, value)
+        return value
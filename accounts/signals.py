@@ -1,6 +1,11 @@
-from django.db.models.signals import post_save
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
+from config.cache import CURRICULUM, ORGANIZATIONS, PROGRAM, STUDENT, bump_version, bump_versions
+from .dashboard import invalidate_curriculum_dashboards, invalidate_student_dashboards
 from .models import CustomUser
 
 
@@ -9,29 +14,97 @@ def sync_student_curricula(sender, instance: CustomUser, **kwargs):
     """
     When a student user is created or updated, keep their curriculum enrollments
     in sync based on program + grade. Non-students are cleared out.
+
+    Only runs when role / program / grade actually changed, so password changes
+    and last_login updates never touch enrollments.
     """
     user = instance
 
-    # Safety: if relation isn't ready (e.g. migrations), skip.
-    if not hasattr(user, "enrolled_curricula"):
+    if kwargs.get("raw"):
+        return
+
+    if not user.has_tracked_changes(*CustomUser.enrollment_fields):
         return
 
-    # Only students are auto-enrolled.
-    if user.role != CustomUser.Role.STUDENT:
-        user.enrolled_curricula.clear()
+    from curriculum.enrollment import sync_student_enrollments  # local import to avoid circulars
+
+    sync_student_enrollments(user)
+
+
+# --- Öğrenci paneli (accounts.dashboard) cache invalidation -------------------
+# Not / ağırlık değişiklikleri türetilmiş veriyi yenileyen yerlerden
+# (assessments.grades, outcomes.attainment), kayıtlar curriculum.enrollment'tan
+# temizlenir; burada sadece panelde görünen ders / LO bilgileri kalır.
+
+@receiver(post_save, sender="curriculum.Curriculum")
+def invalidate_dashboards_on_curriculum_save(sender, instance, created, raw=False, **kwargs):
+    if created or raw:
         return
+    transaction.on_commit(partial(invalidate_curriculum_dashboards, {instance.pk: None}))
+
 
-    program_id = getattr(user, "student_program_id", None)
-    grade = getattr(user, "student_grade", None)
+@receiver(pre_delete, sender="curriculum.Curriculum")
+def invalidate_dashboards_on_curriculum_delete(sender, instance, **kwargs):
+    # Kayıtlar cascade ile silineceği için öğrenciler şimdiden toplanır
+    student_ids = list(instance.students.values_list("id", flat=True))
+    transaction.on_commit(partial(invalidate_student_dashboards, student_ids))
+
+
+@receiver(post_save, sender="outcomes.LearningOutcome")
+@receiver(post_delete, sender="outcomes.LearningOutcome")
+def invalidate_dashboards_on_learning_outcome_change(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    transaction.on_commit(partial(invalidate_curriculum_dashboards, {instance.curriculum_id: None}))
 
-    if not program_id or not grade:
-        user.enrolled_curricula.clear()
+
+# --- Versiyon sayaçları (config.cache) ---------------------------------------
+
+@receiver(post_save, sender="organizations.Faculty")
+@receiver(post_delete, sender="organizations.Faculty")
+def bump_versions_on_faculty_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_version(ORGANIZATIONS)
+
+
+@receiver(post_save, sender="organizations.Program")
+@receiver(post_delete, sender="organizations.Program")
+def bump_versions_on_program_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_versions((ORGANIZATIONS, None), (PROGRAM, instance.pk))
+
+
+@receiver(post_save, sender="outcomes.ProgramOutcome")
+@receiver(post_delete, sender="outcomes.ProgramOutcome")
+def bump_versions_on_program_outcome_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_version(PROGRAM, instance.program_id)
+
+
+@receiver(post_save, sender="curriculum.Curriculum")
+@receiver(post_delete, sender="curriculum.Curriculum")
+@receiver(post_save, sender="outcomes.LearningOutcome")
+@receiver(post_delete, sender="outcomes.LearningOutcome")
+@receiver(post_save, sender="assessments.Assessment")
+@receiver(post_delete, sender="assessments.Assessment")
+def bump_versions_on_curriculum_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_version(CURRICULUM, getattr(instance, "curriculum_id", instance.pk))
+
+
+@receiver(post_save, sender=CustomUser)
+def bump_versions_on_user_save(sender, instance, created, raw=False, **kwargs):
+    # last_login / şifre güncellemeleri sayaçlara dokunmaz
+    if created or raw or not instance.has_tracked_changes():
         return
+    entities = [(STUDENT, instance.pk)]
+    if instance.has_tracked_changes("username", "role"):
+        # Fakülte sorumlusu / program koordinatörü olarak ağaçta görünebilir
+        entities.append((ORGANIZATIONS, None))
+    bump_versions(*entities)
 
-    from curriculum.models import Curriculum  # local import to avoid circulars
 
-    curricula = Curriculum.objects.filter(
-        program_id=program_id,
-        year=grade,
-    )
-    user.enrolled_curricula.set(curricula)
+@receiver(post_delete, sender=CustomUser)
+def bump_versions_on_user_delete(sender, instance, **kwargs):
+    # responsible / coordinator FK'leri SET_NULL ile (signal'siz) boşalır
+    bump_versions((STUDENT, instance.pk), (ORGANIZATIONS, None))
@@ -1,3 +1,469 @@
-from django.test import TestCase
+import io
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, modify_settings, override_settings
+from django.urls import reverse
+
+from assessments.models import Assessment, AssessmentLearningOutcome, StudentAssessmentResult
+from assessments.services import save_results
+from config import profiling
+from config.cache import STUDENT, get_version
+from config.pagination import encode_cursor
+from config.testing import QueryBudgetMixin
+from curriculum.enrollment import rebuild_enrollments
+from curriculum.models import Curriculum
+from organizations.models import Faculty, Program
+from outcomes.models import LearningOutcome, LearningOutcomeProgramOutcome, ProgramOutcome
+from .dashboard import dashboard_cache_key
+from .models import CustomUser
+from .importers import import_students
+from .promotion import promote_students
+
+
+class StudentCourseDetailQueryBudgetTests(QueryBudgetMixin, TestCase):
+    QUERY_BUDGET = 8
+
+    @classmethod
+    def setUpTestData(cls):
+        faculty = Faculty.objects.create(code="ENG", name="Engineering")
+        cls.program = Program.objects.create(code="CENG", name="Computer Eng.", faculty=faculty)
+        cls.curriculum = Curriculum.objects.create(
+            program=cls.program, code="CENG101", name="Intro", year=1,
+        )
+        po = ProgramOutcome.objects.create(program=cls.program, code="PO1", short_title="PO")
+        cls.assessments = []
+        for i in range(3):
+            lo = LearningOutcome.objects.create(
+                curriculum=cls.curriculum, code=f"LO{i}", short_title="LO",
+            )
+            LearningOutcomeProgramOutcome.objects.create(
+                learning_outcome=lo, program_outcome=po, weight=50,
+            )
+            assessment = Assessment.objects.create(
+                curriculum=cls.curriculum, name=f"A{i}", weight_in_course=30, max_score=100,
+            )
+            AssessmentLearningOutcome.objects.create(
+                assessment=assessment, learning_outcome=lo, weight_in_assessment=100,
+            )
+            cls.assessments.append(assessment)
+
+        cls.student = cls._create_student("student")
+
+    @classmethod
+    def _create_student(cls, username):
+        student = CustomUser.objects.create_user(
+            username,
+            role=CustomUser.Role.STUDENT,
+            student_program=cls.program,
+            student_grade=1,
+        )
+        StudentAssessmentResult.objects.bulk_create(
+            StudentAssessmentResult(assessment=a, student=student, raw_score=Decimal("70"))
+            for a in cls.assessments
+        )
+        return student
+
+    def _get(self):
+        self.client.force_login(self.student)
+        with self.assertMaxQueries(self.QUERY_BUDGET) as queries:
+            response = self.client.get(
+                reverse("accounts:student_course_detail", args=[self.curriculum.id])
+            )
+        self.assertEqual(response.status_code, 200)
+        return len(queries.captured_queries), response
+
+    def test_renders_only_own_results(self):
+        _, response = self._get()
+        rows = response.context["rows"]
+        self.assertEqual(len(rows), 3)
+        self.assertTrue(all(row["result"].student_id == self.student.id for row in rows))
+
+    def test_query_count_does_not_grow_with_class_size(self):
+        baseline, _ = self._get()
+        for i in range(25):
+            self._create_student(f"classmate{i}")
+        after, _ = self._get()
+        self.assertEqual(baseline, after)
+
+
+# Testler tek süreç: locmem paylaşılan cache yerine geçer
+@override_settings(STUDENT_DASHBOARD_CACHE_TTL=3600)
+class StudentDashboardCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        faculty = Faculty.objects.create(code="ENG", name="Engineering")
+        program = Program.objects.create(code="CENG", name="Computer Eng.", faculty=faculty)
+        cls.curriculum = Curriculum.objects.create(program=program, code="CENG101", name="Intro", year=1)
+        lo = LearningOutcome.objects.create(curriculum=cls.curriculum, code="LO1", short_title="LO")
+        cls.assessment = Assessment.objects.create(
+            curriculum=cls.curriculum, name="Midterm", weight_in_course=40, max_score=100,
+        )
+        AssessmentLearningOutcome.objects.create(
+            assessment=cls.assessment, learning_outcome=lo, weight_in_assessment=100,
+        )
+        cls.student = CustomUser.objects.create_user(
+            "student", role=CustomUser.Role.STUDENT, student_program=program, student_grade=1,
+        )
+        cls.other = CustomUser.objects.create_user(
+            "other", role=CustomUser.Role.STUDENT, student_program=program, student_grade=1,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.student)
+
+    def _courses(self):
+        return self.client.get(reverse("accounts:student_dashboard")).context["courses"]
+
+    def test_warm_path_only_loads_session_user_and_program(self):
+        self._courses()
+        # Sadece session + user + program; panel verisi cache'ten, tek get_many ile
+        with self.assertNumQueries(3), mock.patch("accounts.dashboard.cache", wraps=cache) as dashboard_cache:
+            courses = self._courses()
+        self.assertEqual([c["code"] for c in courses], ["CENG101"])
+        self.assertEqual([name for name, _, _ in dashboard_cache.method_calls], ["get_many"])
+
+    def test_stale_version_rebuilds_the_entry(self):
+        self._courses()
+
+        # Öğrencinin kendi kaydı değişince STUDENT versiyonu artar → girdi eskir
+        self.student.username = "renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.save()
+
+        self.assertIsNotNone(cache.get(dashboard_cache_key(self.student.id)))
+        with self.assertNumQueries(6):  # session + user + panelin üç sorgusu + program
+            self._courses()
+
+    @override_settings(STUDENT_DASHBOARD_CACHE_TTL=0)
+    def test_not_cached_without_shared_cache(self):
+        self._courses()
+        self.assertIsNone(cache.get(dashboard_cache_key(self.student.id)))
+
+    def test_program_rename_shows_without_invalidation(self):
+        self._courses()
+        Program.objects.filter(code="CENG").update(name="Computer Engineering")
+
+        response = self.client.get(reverse("accounts:student_dashboard"))
+        self.assertContains(response, "CENG – Computer Engineering")
+
+    def test_result_save_invalidates_only_that_student(self):
+        self.assertIsNone(self._courses()[0]["total"])
+        other_entry = (get_version(STUDENT, self.other.id), {"courses": []})
+        cache.set(dashboard_cache_key(self.other.id), other_entry)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            save_results({(self.assessment.id, self.student.id): Decimal("50")}, {})
+
+        course = self._courses()[0]
+        self.assertEqual(course["total"], Decimal("20.00"))
+        self.assertEqual(course["los"], [("LO1", Decimal("50.00"))])
+        self.assertEqual(get_version(STUDENT, self.other.id), other_entry[0])
+
+
+class UserListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        faculty = Faculty.objects.create(code="ENG", name="Engineering")
+        cls.program = Program.objects.create(code="CENG", name="Computer Eng.", faculty=faculty)
+        cls.affairs = CustomUser.objects.create_user("affairs", role=CustomUser.Role.STUDENT_AFFAIRS)
+        for i in range(7):
+            CustomUser.objects.create_user(
+                f"s{i:02d}", role=CustomUser.Role.STUDENT, student_program=cls.program,
+                student_grade=1 + i % 2, last_name="Yılmaz" if i == 3 else "Kaya",
+            )
+        CustomUser.objects.create_user("lecturer", role=CustomUser.Role.LECTURER, email="Ders@uni.edu")
+
+    def setUp(self):
+        self.client.force_login(self.affairs)
+
+    def _usernames(self, response):
+        return [user.username for user in response.context["page"].items]
+
+    @mock.patch("accounts.views.USER_LIST_PAGE_SIZE", 2)
+    def test_keyset_pages_keep_filters(self):
+        url = reverse("accounts:user_list")
+        first = self.client.get(url, {"role": "STUDENT", "grade": 1})
+        page = first.context["page"]
+        self.assertEqual(self._usernames(first), ["s00", "s02"])
+        self.assertIsNone(page.previous_cursor)
+
+        # Sonraki sayfa da aynı sayıda sorgu: OFFSET yok
+        with self.assertNumQueries(4):
+            second = self.client.get(url, {"role": "STUDENT", "grade": 1, "after": page.next_cursor})
+        self.assertEqual(self._usernames(second), ["s04", "s06"])
+        self.assertIsNone(second.context["page"].next_cursor)
+
+        back = self.client.get(url, {"role": "STUDENT", "grade": 1, "before": second.context["page"].previous_cursor})
+        self.assertEqual(self._usernames(back), ["s00", "s02"])
+
+    def test_prefix_search_is_case_insensitive_across_fields(self):
+        url = reverse("accounts:user_list")
+        self.assertEqual(self._usernames(self.client.get(url, {"q": "KAY", "grade": 2})), ["s01", "s05"])
+        self.assertEqual(self._usernames(self.client.get(url, {"q": "ders"})), ["lecturer"])
+        self.assertEqual(self._usernames(self.client.get(url, {"q": "S0"})), [f"s{i:02d}" for i in range(7)])
+        # Bozuk cursor ilk sayfaya düşer
+        self.assertEqual(len(self._usernames(self.client.get(url, {"after": "???"}))), 9)
+
+    def test_prefix_search_matches_turkish_initials(self):
+        CustomUser.objects.create_user("celik", first_name="İpek", last_name="Çelik", email="OZGE@uni.edu")
+        CustomUser.objects.create_user("sahin", first_name="Işıl", last_name="Şahin")
+        url = reverse("accounts:user_list")
+        for q, expected in (
+            ("çel", ["celik"]), ("ÇEL", ["celik"]), ("ipek", ["celik"]), ("İPEK", ["celik"]),
+            ("şah", ["sahin"]), ("ŞAHİN", ["sahin"]), ("ışıl", ["sahin"]), ("IŞIL", ["sahin"]),
+            ("özg", []), ("ozge", ["celik"]),
+        ):
+            self.assertEqual(self._usernames(self.client.get(url, {"q": q})), expected, q)
+
+        # Kaynak alan değişince arama kolonu da güncellenir
+        user = CustomUser.objects.get(username="sahin")
+        user.last_name = "Öztürk"
+        user.save()
+        self.assertEqual(self._usernames(self.client.get(url, {"q": "ÖZT"})), ["sahin"])
+
+    def test_wrongly_typed_cursor_falls_back_to_first_page(self):
+        url = reverse("accounts:user_list")
+        for values in (["a", "x"], [None, 1], ["a"], [["a"], 1], ["a", 10 ** 30]):
+            for direction in ("after", "before"):
+                response = self.client.get(url, {direction: encode_cursor(values)})
+                self.assertEqual(response.status_code, 200, values)
+                self.assertEqual(len(self._usernames(response)), 9, values)
+
+
+class AccessScopeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        faculty = Faculty.objects.create(code="ENG", name="Engineering")
+        program = Program.objects.create(code="CENG", name="Computer Eng.", faculty=faculty)
+        cls.curriculum = Curriculum.objects.create(program=program, code="CENG101", name="Intro", year=1)
+        cls.lecturer = CustomUser.objects.create_user("lecturer", role=CustomUser.Role.LECTURER)
+        cls.lecturer.lecturer_curricula.add(cls.curriculum)
+
+    def test_revoked_assignment_applies_on_next_request(self):
+        self.client.force_login(self.lecturer)
+        url = reverse("outcomes:learning_outcome_manage", args=[self.curriculum.id])
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        # Signal'siz (başka bir worker'daki gibi) kaldırma da hemen geçerli: kapsam cache'lenmiyor
+        CustomUser.lecturer_curricula.through.objects.filter(customuser=self.lecturer).delete()
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+
+@override_settings(PROFILING_ENABLED=True, PROFILING_REPEATED_QUERY_THRESHOLD=3)
+@modify_settings(MIDDLEWARE={"prepend": "config.profiling.ProfilingMiddleware"})
+class ProfilingMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.affairs = CustomUser.objects.create_user("affairs", role=CustomUser.Role.STUDENT_AFFAIRS)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.affairs)
+
+    def test_server_timing_and_rolling_summary(self):
+        with self.assertLogs("loms.profiling", level="INFO") as logs:
+            response = self.client.get(reverse("accounts:performance_summary"))
+
+        self.assertIn('db;dur=', response["Server-Timing"])
+        self.assertIn('"url_name": "accounts:performance_summary"', logs.output[0])
+        rows = profiling.summary()
+        self.assertEqual([row["url_name"] for row in rows], ["accounts:performance_summary"])
+
+        with self.assertLogs("loms.profiling", level="INFO"):
+            response = self.client.get(reverse("accounts:performance_summary"))
+        self.assertEqual(response.context["rows"][0]["requests"], 1)
+
+    def test_repeated_query_patterns_are_flagged(self):
+        profile = profiling.RequestProfile()
+        for pk in (1, 2, 3):
+            profile.record_query(lambda *args: None, f"SELECT * FROM t WHERE id = {pk}", None, False, {})
+        profile.record_query(lambda *args: None, "SELECT * FROM t WHERE id IN (1, 2)", None, False, {})
+
+        self.assertEqual(profile.repeated_queries(3), [{"sql": "SELECT * FROM t WHERE id = ?", "count": 3}])
+
+
+class StudentPromotionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        faculty = Faculty.objects.create(code="ENG", name="Engineering")
+        cls.program = Program.objects.create(code="CENG", name="Computer Eng.", faculty=faculty)
+        other = Program.objects.create(code="EE", name="Electrical Eng.", faculty=faculty)
+        cls.affairs = CustomUser.objects.create_user("affairs", role=CustomUser.Role.STUDENT_AFFAIRS)
+        cls.courses = {
+            year: Curriculum.objects.create(program=cls.program, code=f"CENG{year}01", name="Course", year=year)
+            for year in (1, 2, 4)
+        }
+        Curriculum.objects.create(program=other, code="EE101", name="Circuits", year=1)
+        cls.first, cls.third, cls.final = (
+            CustomUser.objects.create_user(
+                f"s{grade}", role=CustomUser.Role.STUDENT, student_program=cls.program, student_grade=grade,
+            )
+            for grade in (1, 3, 4)
+        )
+        cls.outsider = CustomUser.objects.create_user(
+            "ee1", role=CustomUser.Role.STUDENT, student_program=other, student_grade=1,
+        )
+
+    def _state(self):
+        students = CustomUser.objects.filter(role=CustomUser.Role.STUDENT).order_by("username")
+        return {
+            student.username: (student.student_grade, sorted(student.enrolled_curricula.values_list("code", flat=True)))
+            for student in students
+        }
+
+    def test_promotes_and_rebuilds_enrollments(self):
+        self.assertEqual(self._state()["s1"], (1, ["CENG101"]))
+
+        report = promote_students([self.program.id])
+
+        self.assertEqual((report.promoted, report.held), (2, 1))
+        self.assertEqual((report.enrollments_added, report.enrollments_removed), (2, 1))
+        self.assertEqual(
+            [(row["student_grade"], row["count"]) for row in report.before], [(1, 1), (3, 1), (4, 1)],
+        )
+        self.assertEqual(self._state(), {
+            "ee1": (1, ["EE101"]),
+            "s1": (2, ["CENG201"]),
+            "s3": (4, ["CENG401"]),
+            "s4": (4, ["CENG401"]),
+        })
+
+    def test_dry_run_reports_and_rolls_back(self):
+        before = self._state()
+
+        report = promote_students([self.program.id], dry_run=True)
+
+        self.assertTrue(report.dry_run)
+        self.assertEqual((report.promoted, report.held, report.enrollments_added), (2, 1, 2))
+        self.assertEqual(self._state(), before)
+
+    def test_view_redirects_after_promotion(self):
+        self.client.force_login(self.affairs)
+        url = reverse("accounts:student_promote")
+
+        response = self.client.post(url, {"program": self.program.id, "dry_run": "on"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["report"].promoted, 2)
+        self.assertEqual(CustomUser.objects.get(username="s1").student_grade, 1)
+
+        response = self.client.post(url, {"program": self.program.id}, follow=True)
+        self.assertRedirects(response, url)
+        self.assertIsNone(response.context["report"])
+        self.assertContains(response, "2 students promoted, 1 kept in the final grade")
+        self.assertEqual(CustomUser.objects.get(username="s1").student_grade, 2)
+
+
+# Hash'leme hızı testin konusu değil
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class StudentImportTests(TestCase):
+    HEADER = "username,email,first_name,last_name,password,program,grade\n"
+
+    @classmethod
+    def setUpTestData(cls):
+        faculty = Faculty.objects.create(code="ENG", name="Engineering")
+        cls.program = Program.objects.create(code="CENG", name="Computer Eng.", faculty=faculty)
+        cls.course = Curriculum.objects.create(program=cls.program, code="CENG101", name="Intro", year=1)
+        CustomUser.objects.create_user("taken", role=CustomUser.Role.STUDENT)
+
+    def _csv(self, *rows):
+        return io.StringIO(self.HEADER + "".join(f"{row}\n" for row in rows))
+
+    def test_creates_students_in_chunks_and_enrolls_once(self):
+        lines = self._csv(*(f"s{i},S{i}@Uni.edu,Ada,Lovelace,pw{i},CENG,1" for i in range(5)))
+
+        with mock.patch("accounts.importers.rebuild_enrollments", wraps=rebuild_enrollments) as rebuild:
+            report = import_students(lines, chunk_size=2)
+
+        self.assertEqual((report.rows, report.created, report.enrollments_added, report.error_count), (5, 5, 5, 0))
+        rebuild.assert_called_once()
+        student = CustomUser.objects.get(username="s3")
+        self.assertEqual((student.student_program, student.student_faculty_id), (self.program, self.program.faculty_id))
+        self.assertEqual(student.email, "S3@uni.edu")
+        self.assertTrue(student.check_password("pw3"))
+        self.assertEqual(self.course.students.count(), 5)
+
+    def test_row_errors_are_reported(self):
+        report = import_students(self._csv(
+            "ok,,,,,CENG,2",
+            ",,,,,CENG,1",
+            "ok,,,,,CENG,1",
+            "nope,,,,,XX,1",
+            "zero,,,,,CENG,0",
+            "taken,,,,,CENG,1",
+        ))
+
+        self.assertEqual(report.created, 1)
+        self.assertEqual([line for line, _ in report.errors], [3, 4, 5, 6, 7])
+        self.assertIn("Duplicate", report.errors[1][1])
+        self.assertFalse(CustomUser.objects.get(username="ok").has_usable_password())
+
+        report = import_students(io.StringIO("username,grade\nx,1\n"))
+        self.assertEqual(report.errors, [(1, "Missing column(s): program.")])
+
+    def test_fields_are_validated_like_the_model(self):
+        report = import_students(self._csv(
+            "bad name,,,,,CENG,1",
+            f"{'u' * 151},,,,,CENG,1",
+            "mail,not-an-email,,,,CENG,1",
+            f"long,,{'x' * 151},,,CENG,1",
+            "fine,Fine@Uni.edu,,,,CENG,1",
+        ))
+
+        self.assertEqual(report.created, 1)
+        self.assertEqual([line for line, _ in report.errors], [2, 3, 4, 5])
+        self.assertIn("Invalid username 'bad name'", report.errors[0][1])
+        self.assertIn("at most 150 characters", report.errors[1][1])
+        self.assertIn("Invalid email 'not-an-email'", report.errors[2][1])
+        self.assertIn("Invalid first_name", report.errors[3][1])
+        self.assertFalse(CustomUser.objects.filter(username__in=["bad name", "mail"]).exists())
+
+    @mock.patch("accounts.importers.MAX_REPORTED_ERRORS", 3)
+    def test_error_list_is_capped(self):
+        report = import_students(self._csv(*(f"u{i},,,,,XX,1" for i in range(5))))
+
+        self.assertEqual((report.error_count, len(report.errors), report.errors_truncated), (5, 3, True))
+
+    def test_pool_is_reused_across_chunks(self):
+        with ThreadPoolExecutor(max_workers=2) as pool, mock.patch.object(pool, "map", wraps=pool.map) as pool_map:
+            report = import_students(self._csv(*(f"p{i},,,,pw,CENG,1" for i in range(6))), pool=pool, chunk_size=3)
+
+        self.assertEqual(report.created, 6)
+        self.assertEqual(pool_map.call_count, 2)
+        self.assertTrue(CustomUser.objects.get(username="p5").check_password("pw"))
+
+    def test_unreadable_file_is_a_form_error(self):
+        affairs = CustomUser.objects.create_user("affairs", role=CustomUser.Role.STUDENT_AFFAIRS)
+        self.client.force_login(affairs)
+        url = reverse("accounts:student_import")
+
+        for content in (
+            self.HEADER.encode() + "ş1,,,,,CENG,1\n".encode("cp1254"),
+            (self.HEADER + "v1,,,,,CENG,1\n" + "x" * 200_000 + ",,,,,CENG,1\n").encode(),
+        ):
+            response = self.client.post(url, {"file": SimpleUploadedFile("students.csv", content)})
+
+            self.assertEqual(response.status_code, 200)
+            self.assertIsNone(response.context["report"])
+            self.assertIn("Could not read the file", response.context["form"].errors["file"][0])
+        self.assertFalse(CustomUser.objects.filter(username="v1").exists())
+
+    def test_command_hashes_inline_with_one_worker(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, encoding="utf-8") as fh:
+            fh.write(self.HEADER + "cmd1,,,,pw,CENG,1\nbad,,,,,XX,1\n")
+        self.addCleanup(os.remove, fh.name)
+        stdout, stderr = io.StringIO(), io.StringIO()
+
+        with mock.patch("accounts.management.commands.import_students.ProcessPoolExecutor") as executor:
+            call_command("import_students", fh.name, "--workers", "1", stdout=stdout, stderr=stderr)
+
+        executor.assert_not_called()
+        self.assertIn("2 rows read: 1 students created", stdout.getvalue())
+        self.assertIn("line 3: Unknown program 'XX'.", stderr.getvalue())
@@ -0,0 +1,50 @@
+class TrackedFieldsMixin:
+    """
+    Model'in DB'den yüklendiği andaki alan değerlerini saklar; save öncesi
+    hangi alanların gerçekten değiştiğini sorabilmek için.
+
+    ``tracked_fields`` attname listesidir (örn. ``"student_program_id"``).
+    Yeni (henüz kaydedilmemiş) instance'larda tüm alanlar değişmiş sayılır.
+    """
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_tracked_fields()
+        return instance
+
+    def _snapshot_tracked_fields(self):
+        self._tracked_snapshot = {
+            name: self.__dict__[name]
+            for name in self.tracked_fields
+            if name in self.__dict__
+        }
+
+    def changed_tracked_fields(self):
+        snapshot = getattr(self, "_tracked_snapshot", None)
+        if snapshot is None or self._state.adding:
+            return set(self.tracked_fields)
+
+        changed = set()
+        for name in self.tracked_fields:
+            # deferred ve hiç dokunulmamış alan → değişmemiş
+            if name not in self.__dict__:
+                continue
+            if name not in snapshot or snapshot[name] != self.__dict__[name]:
+                changed.add(name)
+        return changed
+
+    def has_tracked_changes(self, *names):
+        changed = self.changed_tracked_fields()
+        if not names:
+            return bool(changed)
+        return bool(changed.intersection(names))
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._snapshot_tracked_fields()
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._snapshot_tracked_fields()
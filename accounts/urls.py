@@ -15,11 +15,26 @@ urlpatterns = [
         auth_views.LogoutView.as_view(),
         name="logout",
     ),
+    path(
+        "users/",
+        views.user_list,
+        name="user_list",
+    ),
     path(
         "users/create/",
         views.user_create,
         name="user_create",
     ),
+    path(
+        "users/import/",
+        views.student_import,
+        name="student_import",
+    ),
+    path(
+        "users/promote/",
+        views.student_promote,
+        name="student_promote",
+    ),
     path(
         "users/<int:pk>/edit/",
         views.user_edit,
@@ -30,6 +45,11 @@ urlpatterns = [
         views.user_delete,
         name="user_delete",
     ),
+    path(
+        "performance/",
+        views.performance_summary,
+        name="performance_summary",
+    ),
     path(
         "redirect/",
         views.role_redirect,
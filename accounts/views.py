@@ -1,12 +1,25 @@
+import csv
+import io
+
+from django.conf import settings
+from django.contrib import messages
+from django.db import transaction
 from django.shortcuts import render, redirect, get_object_or_404
 from accounts.decorators import role_required
 from .models import CustomUser
 from curriculum.models import Curriculum
-from .forms import UserCreateForm
+from .forms import UserCreateForm, UserFilterForm, StudentImportForm, StudentPromotionForm
+from .dashboard import get_student_dashboard
+from .importers import import_students
+from .promotion import promote_students
 from django.contrib.auth.decorators import login_required
 from django.urls import reverse
 from django.core.exceptions import PermissionDenied
-from assessments.models import Assessment, StudentAssessmentResult, AssessmentLearningOutcome
+from django.db.models import OuterRef, Prefetch, Subquery
+from assessments.models import Assessment, CourseGrade, StudentAssessmentResult, AssessmentLearningOutcome
+from outcomes.models import LearningOutcomeAttainment, LearningOutcomeProgramOutcome
+from config import profiling
+from config.pagination import keyset_page
 
 @role_required(CustomUser.Role.STUDENT_AFFAIRS)
 def user_create(request):
@@ -25,22 +38,114 @@ def user_create(request):
     else:
         form = UserCreateForm()
 
-    users = (
-        CustomUser.objects
-        .exclude(role=CustomUser.Role.ADMIN)
-        .order_by("username")
-        .select_related(
-            "student_faculty",
-            "student_program",
-            "faculty_member_faculty",
+    context = {
+        "form": form,
+    }
+    return render(request, "accounts/user_create.html", context)
+
+
+USER_LIST_PAGE_SIZE = 50
+
+
+@role_required(CustomUser.Role.STUDENT_AFFAIRS)
+def user_list(request):
+    """
+    Student Affairs kullanıcı listesi: username'e göre keyset sayfalama,
+    username / ad / email prefix araması ve rol / program / sınıf filtreleri
+    SQL'de; sadece tabloda gösterilen kolonlar yüklenir.
+    """
+    filter_form = UserFilterForm(request.GET)
+    users = filter_form.filter(
+        CustomUser.objects.exclude(role=CustomUser.Role.ADMIN)
+        .select_related("student_faculty", "student_program", "faculty_member_faculty")
+        .only(
+            "id", "username", "email", "role", "is_superuser", "student_grade",
+            "student_faculty__code", "student_program__code", "faculty_member_faculty__code",
         )
     )
+    page = keyset_page(
+        users,
+        ("username", "id"),
+        after=request.GET.get("after"),
+        before=request.GET.get("before"),
+        page_size=USER_LIST_PAGE_SIZE,
+    )
+
+    # Sayfa linkleri mevcut filtreleri korur
+    params = request.GET.copy()
+    params.pop("after", None)
+    params.pop("before", None)
+
+    context = {
+        "filter_form": filter_form,
+        "page": page,
+        "filter_query": params.urlencode(),
+    }
+    return render(request, "accounts/user_list.html", context)
+
+
+@role_required(CustomUser.Role.STUDENT_AFFAIRS)
+def student_import(request):
+    """
+    Student Affairs yeni dönem öğrencilerini CSV ile toplu oluşturabilsin.
+    Enrollment'lar import sonunda tek seferde hesaplanır.
+    """
+    report = None
+    if request.method == "POST":
+        form = StudentImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            lines = io.TextIOWrapper(
+                form.cleaned_data["file"].file,
+                encoding="utf-8-sig",
+                newline="",
+            )
+            # İstek içinde process pool açılmaz; büyük dosyalar için import_students komutu
+            try:
+                # Dosya yarıda bozuksa yazılan chunk'lar da geri alınır
+                with transaction.atomic():
+                    report = import_students(lines)
+            except (UnicodeDecodeError, csv.Error) as exc:
+                form.add_error("file", f"Could not read the file as UTF-8 CSV: {exc}")
+    else:
+        form = StudentImportForm()
 
     context = {
         "form": form,
-        "users": users,
+        "report": report,
     }
-    return render(request, "accounts/user_create.html", context)
+    return render(request, "accounts/student_import.html", context)
+
+
+@role_required(CustomUser.Role.STUDENT_AFFAIRS)
+def student_promote(request):
+    """
+    Student Affairs yıl başında bir fakülte / programdaki tüm öğrencileri
+    tek seferde bir üst sınıfa geçirebilsin (önce dry-run raporu ile).
+    """
+    report = None
+    if request.method == "POST":
+        form = StudentPromotionForm(request.POST)
+        if form.is_valid():
+            report = promote_students(
+                form.program_ids(),
+                dry_run=form.cleaned_data["dry_run"],
+            )
+            if not report.dry_run:
+                # Sayfa yenilenince sınıflar ikinci kez artmasın (POST/redirect/GET)
+                messages.success(
+                    request,
+                    f"{report.promoted} students promoted, {report.held} kept in the final grade; "
+                    f"enrollments +{report.enrollments_added} / -{report.enrollments_removed}.",
+                )
+                return redirect("accounts:student_promote")
+    else:
+        form = StudentPromotionForm()
+
+    context = {
+        "form": form,
+        "report": report,
+    }
+    return render(request, "accounts/student_promote.html", context)
 
 
 @role_required(CustomUser.Role.STUDENT_AFFAIRS)
@@ -57,7 +162,7 @@ def user_edit(request, pk):
         form = UserCreateForm(request.POST, instance=user_obj)
         if form.is_valid():
             form.save()
-            return redirect("accounts:user_create")
+            return redirect("accounts:user_list")
     else:
         form = UserCreateForm(instance=user_obj)
 
@@ -80,7 +185,7 @@ def user_delete(request, pk):
 
     if request.method == "POST":
         user_obj.delete()
-        return redirect("accounts:user_create")
+        return redirect("accounts:user_list")
 
     context = {
         "user_obj": user_obj,
@@ -114,30 +219,36 @@ def role_redirect(request):
     # Fallback: login sayfasına veya ana sayfaya dön
     return redirect("accounts:login")
 
+@role_required(CustomUser.Role.STUDENT_AFFAIRS)
+def performance_summary(request):
+    """
+    Profil middleware'inin (``LOMS_PROFILING``) URL adı başına topladığı
+    son isteklerin özeti: p50 / p95 süre ve sorgu sayıları.
+    """
+    if request.method == "POST":
+        profiling.reset()
+        return redirect("accounts:performance_summary")
+
+    context = {
+        "enabled": settings.PROFILING_ENABLED,
+        "rows": profiling.summary(),
+        "slow_ms": settings.PROFILING_SLOW_REQUEST_MS,
+    }
+    return render(request, "accounts/performance_summary.html", context)
+
 @role_required(CustomUser.Role.STUDENT)
 def student_dashboard(request):
     user: CustomUser = request.user
 
-    # Öğrencinin programı ve sınıfı (grade)
-    student_program = user.student_program      
-    student_grade = user.student_grade          
-
-    curricula = Curriculum.objects.none()
-    if student_program and student_grade:
-        curricula = (
-            Curriculum.objects
-            .filter(
-                program=student_program,        
-                year=student_grade,             
-            )
-            .order_by("semester", "code")
-        )
+    # Kayıtlı dersler + toplam + LO özeti öğrenci başına tek cache girdisinde
+    dashboard = get_student_dashboard(user)
 
     context = {
         "student": user,
-        "program": student_program,
-        "grade": student_grade,
-        "curricula": curricula,
+        # Cache dışında: program kaydı değişince panel girdileri silinmez
+        "program": user.student_program,
+        "grade": user.student_grade,
+        "courses": dashboard["courses"],
     }
     return render(request, "accounts/student_dashboard.html", context)
 
@@ -152,39 +263,48 @@ def student_course_detail(request, curriculum_id):
     """
     user: CustomUser = request.user
 
-    student_program = getattr(user, "student_program", None)
+    student_program_id = getattr(user, "student_program_id", None)
     student_grade = getattr(user, "student_grade", None)
 
     # Öğrencinin program + grade'ine ait olmayan derse girmesin
+    # Ders toplamı materialized tablodan, aynı sorguda
     curriculum = get_object_or_404(
-        Curriculum.objects.select_related("program", "lecturer"),
+        Curriculum.objects.select_related("program", "lecturer").annotate(
+            course_total=Subquery(
+                CourseGrade.objects.filter(curriculum=OuterRef("pk"), student=user).values("total")[:1]
+            ),
+        ),
         id=curriculum_id,
-        program=student_program,
+        program_id=student_program_id,
         year=student_grade,
     )
 
-    # İlgili dersin tüm assessment'ları
+    # İlgili dersin tüm assessment'ları:
+    # - sonuçlardan sadece bu öğrencininki (sınıfın tamamı değil)
+    # - assessment → LO → PO ağacı tek prefetch zinciriyle
     assessments = (
         Assessment.objects.filter(curriculum=curriculum)
         .prefetch_related(
-            "lo_mappings__learning_outcome__lo_po_mappings__program_outcome",
-            "results",
+            Prefetch(
+                "results",
+                queryset=StudentAssessmentResult.objects.filter(student=user),
+                to_attr="my_results",
+            ),
+            Prefetch(
+                "lo_mappings",
+                queryset=AssessmentLearningOutcome.objects.select_related("learning_outcome"),
+            ),
+            Prefetch(
+                "lo_mappings__learning_outcome__lo_po_mappings",
+                queryset=LearningOutcomeProgramOutcome.objects.select_related("program_outcome"),
+            ),
         )
         .order_by("date", "name")
     )
 
-    # Bu öğrenciye ait notlar
-    results_by_assessment = {
-        r.assessment_id: r
-        for r in StudentAssessmentResult.objects.filter(
-            assessment__curriculum=curriculum,
-            student=user,
-        )
-    }
-
     rows = []
     for a in assessments:
-        result = results_by_assessment.get(a.id)
+        result = a.my_results[0] if a.my_results else None
 
         # yaklaşık katkı hesabı (score / max_score * weight_in_course)
         contribution = None
@@ -236,9 +356,18 @@ def student_course_detail(request, curriculum_id):
             }
         )
 
+    # LO başarı yüzdeleri: materialized tablodan tek sorgu
+    lo_attainments = (
+        LearningOutcomeAttainment.objects
+        .filter(student=user, learning_outcome__curriculum=curriculum)
+        .select_related("learning_outcome")
+        .order_by("learning_outcome__order", "learning_outcome__code")
+    )
+
     context = {
         "student": user,
         "curriculum": curriculum,
         "rows": rows,
+        "lo_attainments": lo_attainments,
     }
     return render(request, "accounts/student_course_detail.html", context)
@@ -0,0 +1,155 @@
+"""
+Toplu not yazma (``POST /api/v1/results/bulk/``).
+
+Tüm kontroller küme bazlı yapılır: assessment'lar, dersin kayıtlı
+öğrencileri ve mevcut notlar birkaç sorguda yüklenir, kayıtlar bellekte
+doğrulanır; geçerli olanlar tek ``save_results`` çağrısıyla chunk'lar
+halinde toplu upsert edilir. Attainment yenilemesi isteği bekletmez: notlarla
+aynı transaction'da kuyruğa yazılır (``refresh_attainment --queued``).
+"""
+from django.db import transaction
+
+from assessments.models import Assessment, StudentAssessmentResult
+from assessments.services import clean_score, save_results
+from curriculum.models import Curriculum
+from outcomes.attainment import batched_refresh
+
+MAX_BULK_RECORDS = 20000
+
+
+class BulkResultReport:
+    def __init__(self, size):
+        self.statuses = [None] * size
+        self.counts = {"created": 0, "updated": 0, "unchanged": 0, "error": 0}
+
+    def set(self, index, status, **extra):
+        self.statuses[index] = {"index": index, "status": status, **extra}
+        self.counts[status] += 1
+
+    def error(self, index, message):
+        self.set(index, "error", error=message)
+
+    def as_dict(self):
+        return {
+            "received": len(self.statuses),
+            **self.counts,
+            "results": self.statuses,
+        }
+
+
+def _as_int(value):
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def bulk_upsert_results(records, scope, chunk_size=1000):
+    """
+    ``records``: [{"assessment": id, "student": id | "username": str, "raw_score": x}, ...]
+
+    Kayıt başına durum döner (created / updated / unchanged / error);
+    hatalı kayıtlar diğerlerinin yazılmasını engellemez.
+    """
+    report = BulkResultReport(len(records))
+
+    rows = []
+    for index, record in enumerate(records):
+        if not isinstance(record, dict):
+            report.error(index, "Record must be an object.")
+            continue
+        assessment_id = _as_int(record.get("assessment"))
+        student_id = _as_int(record.get("student"))
+        username = record.get("username")
+        if assessment_id is None:
+            report.error(index, "'assessment' must be an integer id.")
+            continue
+        if student_id is None and not isinstance(username, str):
+            report.error(index, "Give 'student' (id) or 'username'.")
+            continue
+        if record.get("raw_score") is None:
+            report.error(index, "'raw_score' is required.")
+            continue
+        rows.append((index, assessment_id, student_id, username, record["raw_score"]))
+
+    # 1 sorgu: assessment → (curriculum, max_score)
+    assessments = {
+        assessment_id: (curriculum_id, max_score)
+        for assessment_id, curriculum_id, max_score in Assessment.objects.filter(
+            id__in={row[1] for row in rows},
+        ).values_list("id", "curriculum_id", "max_score")
+    }
+    curriculum_ids = {
+        curriculum_id for curriculum_id, _ in assessments.values()
+        if scope.can_manage_curriculum(curriculum_id)
+    }
+
+    # 1 sorgu: izin verilen derslerin kayıtlı öğrencileri (id ve username ile)
+    enrolled = set()
+    by_username = {}
+    for curriculum_id, student_id, username in Curriculum.students.through.objects.filter(
+        curriculum_id__in=curriculum_ids,
+    ).values_list("curriculum_id", "customuser_id", "customuser__username"):
+        enrolled.add((curriculum_id, student_id))
+        by_username[(curriculum_id, username)] = student_id
+
+    # 1 sorgu: bu assessment'ların mevcut notları
+    allowed_assessment_ids = [
+        assessment_id for assessment_id, (curriculum_id, _) in assessments.items()
+        if curriculum_id in curriculum_ids
+    ]
+    existing = {
+        (result.assessment_id, result.student_id): result
+        for result in StudentAssessmentResult.objects.filter(
+            assessment_id__in=allowed_assessment_ids,
+        ).only("id", "assessment_id", "student_id", "raw_score")
+    }
+
+    scores = {}
+    index_by_key = {}
+    for index, assessment_id, student_id, username, raw_score in rows:
+        if assessment_id not in assessments:
+            report.error(index, f"Assessment {assessment_id} does not exist.")
+            continue
+        curriculum_id, max_score = assessments[assessment_id]
+        if curriculum_id not in curriculum_ids:
+            report.error(index, f"You are not allowed to enter grades for assessment {assessment_id}.")
+            continue
+
+        if student_id is None:
+            student_id = by_username.get((curriculum_id, username))
+        if student_id is None or (curriculum_id, student_id) not in enrolled:
+            report.error(index, f"Student {username or student_id} is not enrolled in this curriculum.")
+            continue
+
+        key = (assessment_id, student_id)
+        if key in index_by_key:
+            report.error(index, f"Duplicate of record {index_by_key[key]}.")
+            continue
+
+        try:
+            score = clean_score(raw_score, max_score)
+        except ValueError as exc:
+            report.error(index, str(exc))
+            continue
+
+        index_by_key[key] = index
+        scores[key] = score
+
+    for key, score in scores.items():
+        result = existing.get(key)
+        if result is None:
+            status = "created"
+        elif result.raw_score != score:
+            status = "updated"
+        else:
+            status = "unchanged"
+        report.set(index_by_key[key], status, assessment=key[0], student=key[1])
+
+    # Tek transaction içinde chunk'lı toplu upsert; attainment kuyruğa, ders başına bir satır
+    with transaction.atomic(), batched_refresh(queued=True):
+        save_results(scores, existing, batch_size=chunk_size)
+
+    return report
@@ -0,0 +1,13 @@
+import django_filters
+
+from assessments.models import StudentAssessmentResult
+
+
+class StudentAssessmentResultFilter(django_filters.FilterSet):
+    curriculum = django_filters.NumberFilter(field_name="assessment__curriculum_id")
+    # Gece çalışan raporlama işi sadece değişenleri çeksin
+    updated_since = django_filters.IsoDateTimeFilter(field_name="updated_at", lookup_expr="gte")
+
+    class Meta:
+        model = StudentAssessmentResult
+        fields = ["assessment", "student", "curriculum", "updated_since"]
@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.db import models
+
+
+class IdempotencyKey(models.Model):
+    """
+    Toplu yazma isteklerinin ``Idempotency-Key`` kaydı. Aynı anahtarla gelen
+    tekrar istekler yeniden işlenmez; saklanan cevap aynen döner.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="idempotency_keys",
+    )
+    key = models.CharField(max_length=255)
+    # İstek gövdesinin hash'i: aynı anahtar farklı gövdeyle kullanılamaz
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "key"], name="api_idempotency_user_key_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.user} - {self.key}"
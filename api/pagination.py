@@ -0,0 +1,12 @@
+from rest_framework.pagination import CursorPagination
+
+
+class IdCursorPagination(CursorPagination):
+    """
+    ``id``'ye göre cursor pagination: her sayfa ``WHERE id > x LIMIT n`` olduğu
+    için derin sayfalar da PK index'inden O(1) okunur (OFFSET yok).
+    """
+    ordering = "id"
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
@@ -0,0 +1,48 @@
+"""
+API'de her rolün görebildiği kayıtlar (HTML view'larla aynı kurallar).
+
+Fonksiyonlar ``Q`` döner; ``None`` → hiçbir kayıt görünmez. ``path``,
+filtrelenen modelden Program / Curriculum ilişkisine giden lookup önekidir
+(ör. ``"curriculum__"``).
+"""
+from django.db.models import Q
+
+from curriculum.models import Curriculum
+
+
+def program_q(user, scope, path=""):
+    if user.is_admin or user.is_student_affairs:
+        return Q()
+    if user.is_faculty_member:
+        return Q(**{f"{path}pk__in": scope.program_ids})
+    if user.is_lecturer:
+        program_ids = Curriculum.objects.filter(id__in=scope.curriculum_ids).values("program_id")
+        return Q(**{f"{path}pk__in": program_ids})
+    if user.is_student and user.student_program_id:
+        return Q(**{f"{path}pk": user.student_program_id})
+    return None
+
+
+def curriculum_q(user, scope, path=""):
+    if user.is_admin or user.is_student_affairs:
+        return Q()
+    if user.is_faculty_member:
+        return Q(**{f"{path}program_id__in": scope.program_ids})
+    if user.is_lecturer:
+        return Q(**{f"{path}pk__in": scope.curriculum_ids})
+    if user.is_student:
+        return Q(**{f"{path}pk__in": user.enrolled_curricula.values("id")})
+    return None
+
+
+def result_q(user, scope):
+    """Notlar: Student Affairs göremez, öğrenci sadece kendi notlarını görür."""
+    if user.is_admin:
+        return Q()
+    if user.is_faculty_member:
+        return Q(assessment__curriculum__program_id__in=scope.program_ids)
+    if user.is_lecturer:
+        return Q(assessment__curriculum_id__in=scope.curriculum_ids)
+    if user.is_student:
+        return Q(student_id=user.pk)
+    return None
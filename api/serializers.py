@@ -0,0 +1,95 @@
+from rest_framework import serializers
+
+from assessments.models import Assessment, AssessmentLearningOutcome, StudentAssessmentResult
+from curriculum.models import Curriculum
+from organizations.models import Program
+from outcomes.models import LearningOutcome, LearningOutcomeProgramOutcome, ProgramOutcome
+
+
+def requested_fields(request):
+    """``?fields=id,code`` → {"id", "code"}; parametre yoksa None (tüm alanlar)."""
+    if request is None:
+        return None
+    raw = request.query_params.get("fields")
+    if not raw:
+        return None
+    return {name.strip() for name in raw.split(",") if name.strip()}
+
+
+class SparseFieldsMixin:
+    """İstenmeyen alanları serializer'dan çıkarır (bilinmeyen alan adları yok sayılır)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = requested_fields(self.context.get("request"))
+        if fields:
+            for name in set(self.fields) - fields:
+                self.fields.pop(name)
+
+
+class ProgramSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    faculty_code = serializers.CharField(source="faculty.code", read_only=True)
+
+    class Meta:
+        model = Program
+        fields = ["id", "code", "name", "faculty", "faculty_code", "description", "updated_at"]
+
+
+class ProgramOutcomeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = ProgramOutcome
+        fields = ["id", "program", "code", "short_title", "description", "order", "active", "updated_at"]
+
+
+class CurriculumSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    program_code = serializers.CharField(source="program.code", read_only=True)
+
+    class Meta:
+        model = Curriculum
+        fields = [
+            "id", "program", "program_code", "code", "name", "year", "semester",
+            "ects", "credit", "lecturer", "updated_at",
+        ]
+
+
+class LearningOutcomeProgramOutcomeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = LearningOutcomeProgramOutcome
+        fields = ["program_outcome", "weight"]
+
+
+class LearningOutcomeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    program_outcomes = LearningOutcomeProgramOutcomeSerializer(source="lo_po_mappings", many=True, read_only=True)
+
+    class Meta:
+        model = LearningOutcome
+        fields = [
+            "id", "curriculum", "code", "short_title", "description", "order", "active",
+            "program_outcomes", "updated_at",
+        ]
+
+
+class AssessmentLearningOutcomeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AssessmentLearningOutcome
+        fields = ["learning_outcome", "weight_in_assessment"]
+
+
+class AssessmentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    learning_outcomes = AssessmentLearningOutcomeSerializer(source="lo_mappings", many=True, read_only=True)
+
+    class Meta:
+        model = Assessment
+        fields = [
+            "id", "curriculum", "name", "type", "weight_in_course", "max_score", "date",
+            "learning_outcomes", "updated_at",
+        ]
+
+
+class StudentAssessmentResultSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    # View'da annotate edilir → öğrenci nesnesi yüklenmez
+    student_username = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = StudentAssessmentResult
+        fields = ["id", "assessment", "student", "student_username", "raw_score", "created_at", "updated_at"]
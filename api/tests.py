@@ -0,0 +1,173 @@
+import io
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from accounts.models import CustomUser
+from assessments.models import Assessment, AssessmentLearningOutcome, CourseGrade, StudentAssessmentResult
+from config.testing import QueryBudgetMixin
+from curriculum.models import Curriculum
+from organizations.models import Faculty, Program
+from outcomes.models import LearningOutcome, LearningOutcomeAttainment, PendingAttainmentRefresh
+
+
+class ReadOnlyApiTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        faculty = Faculty.objects.create(code="ENG", name="Engineering")
+        program = Program.objects.create(code="CENG", name="Computer Eng.", faculty=faculty)
+        cls.lecturer = CustomUser.objects.create_user("lecturer", role=CustomUser.Role.LECTURER)
+        other = CustomUser.objects.create_user("other", role=CustomUser.Role.LECTURER)
+        cls.mine = Curriculum.objects.create(program=program, code="CENG101", name="Intro", year=1, lecturer=cls.lecturer)
+        cls.theirs = Curriculum.objects.create(program=program, code="CENG102", name="Other", year=1, lecturer=other)
+        cls.students = [
+            CustomUser.objects.create_user(
+                f"student{i}", role=CustomUser.Role.STUDENT, student_program=program, student_grade=1,
+            )
+            for i in range(5)
+        ]
+        for curriculum in (cls.mine, cls.theirs):
+            assessment = Assessment.objects.create(curriculum=curriculum, name="Midterm", weight_in_course=100)
+            StudentAssessmentResult.objects.bulk_create([
+                StudentAssessmentResult(assessment=assessment, student=student, raw_score=50)
+                for student in cls.students
+            ])
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.lecturer)
+
+    def test_results_are_scoped_to_lecturer_curricula(self):
+        response = self.client.get(reverse("api:result-list"))
+
+        self.assertEqual(response.status_code, 200)
+        assessment_ids = {row["assessment"] for row in response.json()["results"]}
+        self.assertEqual(assessment_ids, set(self.mine.assessments.values_list("id", flat=True)))
+
+    def test_cursor_pagination_walks_all_rows(self):
+        url = reverse("api:result-list") + "?page_size=2"
+        seen = []
+        while url:
+            payload = self.client.get(url).json()
+            seen.extend(row["id"] for row in payload["results"])
+            url = payload["next"]
+
+        self.assertEqual(len(seen), len(self.students))
+        self.assertEqual(seen, sorted(seen))
+
+    def test_sparse_fields(self):
+        response = self.client.get(reverse("api:curriculum-list") + "?fields=id,code")
+
+        self.assertEqual(response.json()["results"], [{"id": self.mine.id, "code": "CENG101"}])
+
+    def test_unchanged_list_returns_304(self):
+        url = reverse("api:result-list")
+        etag = self.client.get(url)["ETag"]
+
+        # oturum + kullanıcı + yetki kapsamı + sayfa (kapsam genelinde aggregate yok)
+        with self.assertMaxQueries(4):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        StudentAssessmentResult.objects.filter(assessment__curriculum=self.mine).first().save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_page_etag_follows_deletes_and_next_page(self):
+        url = reverse("api:result-list") + "?page_size=2"
+        etag = self.client.get(url)["ETag"]
+        results = StudentAssessmentResult.objects.filter(assessment__curriculum=self.mine).order_by("id")
+
+        # Sayfa dışındaki silme: aynı sayfa, hâlâ sonraki sayfa var → 304
+        results.last().delete()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # Sayfadaki satırın silinmesi updated_at'i büyütmese de ETag'i değiştirir
+        results.first().delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        # Son sayfa: sonraki sayfa linki kaybolunca ETag değişir
+        results.filter(id__gt=response.json()["results"][-1]["id"]).delete()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 200)
+
+
+class ResultBulkUpsertTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        faculty = Faculty.objects.create(code="ENG", name="Engineering")
+        program = Program.objects.create(code="CENG", name="Computer Eng.", faculty=faculty)
+        cls.lecturer = CustomUser.objects.create_user("lecturer", role=CustomUser.Role.LECTURER)
+        other = CustomUser.objects.create_user("other", role=CustomUser.Role.LECTURER)
+        mine = Curriculum.objects.create(program=program, code="CENG101", name="Intro", year=1, lecturer=cls.lecturer)
+        theirs = Curriculum.objects.create(program=program, code="CENG102", name="Other", year=1, lecturer=other)
+        cls.student = CustomUser.objects.create_user(
+            "student", role=CustomUser.Role.STUDENT, student_program=program, student_grade=1,
+        )
+        cls.midterm = Assessment.objects.create(curriculum=mine, name="Midterm", weight_in_course=100, max_score=50)
+        cls.foreign = Assessment.objects.create(curriculum=theirs, name="Midterm", weight_in_course=100)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.lecturer)
+
+    def _post(self, records, key="batch-1"):
+        return self.client.post(
+            reverse("api:result-bulk"), records, content_type="application/json", HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    def test_per_record_status(self):
+        response = self._post([
+            {"assessment": self.midterm.id, "student": self.student.id, "raw_score": 40},
+            {"assessment": self.midterm.id, "username": "student", "raw_score": 45},
+            {"assessment": self.midterm.id, "username": "nobody", "raw_score": 10},
+            {"assessment": self.foreign.id, "student": self.student.id, "raw_score": 10},
+            {"assessment": self.midterm.id, "student": self.student.id, "raw_score": 80},
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        statuses = [row["status"] for row in response.json()["results"]]
+        self.assertEqual(statuses, ["created", "error", "error", "error", "error"])
+        self.assertEqual(StudentAssessmentResult.objects.get().raw_score, 40)
+
+    def test_idempotent_replay(self):
+        records = [{"assessment": self.midterm.id, "student": self.student.id, "raw_score": 40}]
+        first = self._post(records)
+        StudentAssessmentResult.objects.update(raw_score=10)
+
+        replay = self._post(records)
+        self.assertEqual(replay.json(), first.json())
+        self.assertEqual(replay["Idempotent-Replayed"], "true")
+        self.assertEqual(StudentAssessmentResult.objects.get().raw_score, 10)
+
+        records[0]["raw_score"] = 20
+        self.assertEqual(self._post(records).status_code, 422)
+
+    def test_ndjson_body(self):
+        body = f'{{"assessment": {self.midterm.id}, "student": {self.student.id}, "raw_score": "12.5"}}\n'
+        response = self.client.post(
+            reverse("api:result-bulk"), body, content_type="application/x-ndjson", HTTP_IDEMPOTENCY_KEY="nd",
+        )
+
+        self.assertEqual(response.json()["created"], 1)
+
+    def test_attainment_refresh_is_queued_not_run(self):
+        lo = LearningOutcome.objects.create(curriculum=self.midterm.curriculum, code="LO1", short_title="LO")
+        AssessmentLearningOutcome.objects.create(assessment=self.midterm, learning_outcome=lo, weight_in_assessment=100)
+        records = [{"assessment": self.midterm.id, "student": self.student.id, "raw_score": 40}]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._post(records)
+
+        # Ders toplamı istek içinde, attainment kuyrukta
+        self.assertEqual(CourseGrade.objects.get(student=self.student).total, 80)
+        self.assertFalse(LearningOutcomeAttainment.objects.exists())
+        queued = PendingAttainmentRefresh.objects.get()
+        self.assertEqual((queued.curriculum_id, queued.student_ids), (self.midterm.curriculum_id, [self.student.id]))
+
+        stdout = io.StringIO()
+        call_command("refresh_attainment", "--queued", stdout=stdout)
+        self.assertIn("1 queued refreshes processed", stdout.getvalue())
+        self.assertEqual(LearningOutcomeAttainment.objects.get(student=self.student).attainment, 80)
+        self.assertFalse(PendingAttainmentRefresh.objects.exists())
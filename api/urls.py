@@ -0,0 +1,20 @@
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+
+from . import views
+
+router = DefaultRouter()
+router.register("programs", views.ProgramViewSet, basename="program")
+router.register("program-outcomes", views.ProgramOutcomeViewSet, basename="program-outcome")
+router.register("curricula", views.CurriculumViewSet, basename="curriculum")
+router.register("learning-outcomes", views.LearningOutcomeViewSet, basename="learning-outcome")
+router.register("assessments", views.AssessmentViewSet, basename="assessment")
+router.register("results", views.StudentAssessmentResultViewSet, basename="result")
+
+app_name = "api"
+
+urlpatterns = [
+    # Router'daki results/<pk>/ ile çakışmasın diye önce
+    path("v1/results/bulk/", views.ResultBulkUpsertView.as_view(), name="result-bulk"),
+    path("v1/", include(router.urls)),
+]
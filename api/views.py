@@ -0,0 +1,268 @@
+import hashlib
+import json
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework import permissions, status, viewsets
+from rest_framework.parsers import JSONParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from accounts.permissions import get_request_scope
+from assessments.models import Assessment, StudentAssessmentResult
+from curriculum.models import Curriculum
+from organizations.models import Program
+from outcomes.models import LearningOutcome, ProgramOutcome
+from . import scoping
+from .bulk import MAX_BULK_RECORDS, bulk_upsert_results
+from .filters import StudentAssessmentResultFilter
+from .models import IdempotencyKey
+from .parsers import NDJSONParser
+from .serializers import (
+    AssessmentSerializer,
+    CurriculumSerializer,
+    LearningOutcomeSerializer,
+    ProgramOutcomeSerializer,
+    ProgramSerializer,
+    StudentAssessmentResultSerializer,
+    requested_fields,
+)
+
+
+class ScopedReadOnlyViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Ortak davranış:
+
+    - ``scope_q`` ile rol bazlı filtre (bkz. ``api.scoping``)
+    - Dönen satırların ``(id, updated_at)``'i ve sayfa linkleri üzerinden
+      ETag / Last-Modified; değişiklik yoksa 304 (gövde hiç serialize edilmez)
+    """
+
+    def scope_q(self, user, scope):
+        """Alt sınıf kapsamı tanımlamazsa hiçbir kayıt dönmez."""
+        return None
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        q = self.scope_q(self.request.user, get_request_scope(self.request._request))
+        if q is None:
+            return queryset.none()
+        return queryset.filter(q)
+
+    def wants(self, field):
+        fields = requested_fields(self.request)
+        return fields is None or field in fields
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        # Validator zaten okunan sayfadan çıkar: kapsamın tamamında aggregate yok.
+        # Sayfaya giren / sayfadan silinen satır id listesini, sonraki sayfanın
+        # varlığı da linkleri değiştirir.
+        page = self.paginate_queryset(queryset)
+        rows = page if page is not None else list(queryset)
+        last_modified = max((row.updated_at for row in rows), default=None)
+        state = [(row.pk, row.updated_at.isoformat()) for row in rows]
+        if page is not None:
+            state += [self.paginator.get_next_link(), self.paginator.get_previous_link()]
+        not_modified = self._conditional(request, last_modified, state)
+        if not_modified is not None:
+            return not_modified
+
+        serializer = self.get_serializer(rows, many=True)
+        response = self.get_paginated_response(serializer.data) if page is not None else Response(serializer.data)
+        return self._with_validators(request, response, last_modified, state)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        state = [(instance.pk, instance.updated_at.isoformat())]
+        not_modified = self._conditional(request, instance.updated_at, state)
+        if not_modified is not None:
+            return not_modified
+        serializer = self.get_serializer(instance)
+        return self._with_validators(request, Response(serializer.data), instance.updated_at, state)
+
+    def _validators(self, request, last_modified, state):
+        # Gövde kullanıcıya (scope) ve query string'e (cursor, fields, filtreler) bağlı
+        key = f"{request.user.pk}:{request.get_full_path()}:{json.dumps(state)}"
+        etag = quote_etag(hashlib.md5(key.encode()).hexdigest())
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        return etag, timestamp
+
+    def _conditional(self, request, last_modified, state):
+        etag, timestamp = self._validators(request, last_modified, state)
+        response = get_conditional_response(request._request, etag=etag, last_modified=timestamp)
+        if response is not None:
+            return self._set_headers(response, etag, timestamp)
+        return None
+
+    def _with_validators(self, request, response, last_modified, state):
+        etag, timestamp = self._validators(request, last_modified, state)
+        return self._set_headers(response, etag, timestamp)
+
+    def _set_headers(self, response, etag, timestamp):
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+        patch_vary_headers(response, ("Cookie", "Authorization"))
+        return response
+
+
+class ProgramViewSet(ScopedReadOnlyViewSet):
+    queryset = Program.objects.select_related("faculty")
+    serializer_class = ProgramSerializer
+    filterset_fields = ["faculty", "code"]
+
+    def scope_q(self, user, scope):
+        return scoping.program_q(user, scope)
+
+
+class ProgramOutcomeViewSet(ScopedReadOnlyViewSet):
+    queryset = ProgramOutcome.objects.all()
+    serializer_class = ProgramOutcomeSerializer
+    filterset_fields = ["program", "active"]
+
+    def scope_q(self, user, scope):
+        return scoping.program_q(user, scope, "program__")
+
+
+class CurriculumViewSet(ScopedReadOnlyViewSet):
+    queryset = Curriculum.objects.select_related("program")
+    serializer_class = CurriculumSerializer
+    filterset_fields = ["program", "year", "semester", "lecturer"]
+
+    def scope_q(self, user, scope):
+        return scoping.curriculum_q(user, scope)
+
+
+class LearningOutcomeViewSet(ScopedReadOnlyViewSet):
+    queryset = LearningOutcome.objects.all()
+    serializer_class = LearningOutcomeSerializer
+    filterset_fields = ["curriculum", "active"]
+
+    def scope_q(self, user, scope):
+        return scoping.curriculum_q(user, scope, "curriculum__")
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.wants("program_outcomes"):
+            queryset = queryset.prefetch_related("lo_po_mappings")
+        return queryset
+
+
+class AssessmentViewSet(ScopedReadOnlyViewSet):
+    queryset = Assessment.objects.all()
+    serializer_class = AssessmentSerializer
+    filterset_fields = ["curriculum", "type"]
+
+    def scope_q(self, user, scope):
+        return scoping.curriculum_q(user, scope, "curriculum__")
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.wants("learning_outcomes"):
+            queryset = queryset.prefetch_related("lo_mappings")
+        return queryset
+
+
+class StudentAssessmentResultViewSet(ScopedReadOnlyViewSet):
+    queryset = StudentAssessmentResult.objects.all()
+    serializer_class = StudentAssessmentResultSerializer
+    filterset_class = StudentAssessmentResultFilter
+
+    def scope_q(self, user, scope):
+        return scoping.result_q(user, scope)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.wants("student_username"):
+            queryset = queryset.annotate(student_username=F("student__username"))
+        return queryset
+
+
+IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
+
+
+class CanEnterGrades(permissions.BasePermission):
+    message = "Only lecturers can enter grades."
+
+    def has_permission(self, request, view):
+        return request.user.is_admin or request.user.is_lecturer
+
+
+class ResultBulkUpsertView(APIView):
+    """
+    ``POST /api/v1/results/bulk/`` — JSON liste (ya da ``{"results": [...]}``)
+    veya NDJSON gövde; ``Idempotency-Key`` header'ı zorunlu.
+
+    Aynı anahtar + aynı gövde → ilk cevap tekrar döner (``Idempotent-Replayed``);
+    aynı anahtar + farklı gövde → 422.
+    """
+    parser_classes = [JSONParser, NDJSONParser]
+    permission_classes = [permissions.IsAuthenticated, CanEnterGrades]
+
+    def post(self, request):
+        key = request.headers.get("Idempotency-Key", "").strip()
+        if not key or len(key) > 255:
+            return Response(
+                {"detail": "An Idempotency-Key header (max 255 characters) is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        records = request.data
+        if isinstance(records, dict):
+            records = records.get("results")
+        if not isinstance(records, list):
+            return Response({"detail": "Expected a list of records."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(records) > MAX_BULK_RECORDS:
+            return Response(
+                {"detail": f"At most {MAX_BULK_RECORDS} records per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        fingerprint = hashlib.sha256(
+            json.dumps(records, sort_keys=True, separators=(",", ":"), default=str).encode()
+        ).hexdigest()
+
+        # Süresi dolan anahtarlar temizlenir; aynı anahtar yeniden kullanılabilir
+        IdempotencyKey.objects.filter(
+            user=request.user, created_at__lt=timezone.now() - IDEMPOTENCY_KEY_TTL,
+        ).delete()
+        replay = self._replay(request.user, key, fingerprint)
+        if replay is not None:
+            return replay
+
+        scope = get_request_scope(request._request)
+        try:
+            with transaction.atomic():
+                idempotency = IdempotencyKey.objects.create(user=request.user, key=key, fingerprint=fingerprint)
+                payload = bulk_upsert_results(records, scope).as_dict()
+                idempotency.status_code = status.HTTP_200_OK
+                idempotency.response = payload
+                idempotency.save(update_fields=["status_code", "response"])
+        except IntegrityError:
+            # Aynı anahtarla eşzamanlı gelen istek önce commit etti
+            replay = self._replay(request.user, key, fingerprint)
+            if replay is None:
+                raise
+            return replay
+
+        return Response(payload, status=status.HTTP_200_OK)
+
+    def _replay(self, user, key, fingerprint):
+        idempotency = IdempotencyKey.objects.filter(user=user, key=key).first()
+        if idempotency is None:
+            return None
+        if idempotency.fingerprint != fingerprint:
+            return Response(
+                {"detail": "This Idempotency-Key was already used with a different request body."},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+        return Response(
+            idempotency.response,
+            status=idempotency.status_code,
+            headers={"Idempotent-Replayed": "true"},
+        )
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Assessment, AssessmentLearningOutcome, StudentAssessmentResult
+from .models import Assessment, AssessmentLearningOutcome, CourseGrade, StudentAssessmentResult
 
 
 @admin.register(Assessment)
@@ -18,3 +18,10 @@ class StudentAssessmentResultAdmin(admin.ModelAdmin):
     list_display = ("assessment", "student", "raw_score", "created_at")
     list_filter = ("assessment__curriculum",)
     search_fields = ("student__username", "student__first_name", "student__last_name")
+
+
+@admin.register(CourseGrade)
+class CourseGradeAdmin(admin.ModelAdmin):
+    list_display = ("student", "curriculum", "total", "computed_at")
+    list_filter = ("curriculum__program",)
+    search_fields = ("student__username",)
@@ -0,0 +1,8 @@
+from django import forms
+
+
+class GradeImportForm(forms.Form):
+    file = forms.FileField(
+        label="CSV file",
+        help_text="Columns: username, raw_score (header row required).",
+    )
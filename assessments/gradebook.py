@@ -0,0 +1,129 @@
+"""
+Ders bazlı not çizelgesi (öğrenci × assessment).
+
+Assessment'lar, öğrenciler, notlar ve (materialized) ders toplamları düz
+sorgularla yüklenir; matris bellekte kurulur. Kaydetme tarafı sadece değişen
+hücreleri ``save_results`` ile toplu yazar.
+
+Büyük çizelgelerde hücre başına bir form alanı Django'nun
+``DATA_UPLOAD_MAX_NUMBER_FIELDS`` sınırını aşar; şablondaki script dolu
+hücreleri tek bir ``grid`` alanında JSON olarak gönderir (JS yoksa hücreler
+tek tek gelir, küçük derslerde sınırın altında kalır).
+"""
+import json
+
+from .models import CourseGrade, StudentAssessmentResult
+from .services import clean_score
+
+
+def cell_name(student_id, assessment_id):
+    return f"g_{student_id}_{assessment_id}"
+
+
+def build_gradebook(curriculum, assessments, posted=None):
+    """
+    Şablon için satırlar: her öğrenci için hücreler ve ders toplamı.
+
+    ``posted``: hatalı POST'ta gönderilen {hücre adı: değer}; bu hücrelerde
+    DB'deki not yerine girilen değer gösterilir.
+    """
+    posted = posted or {}
+    students = curriculum.students.order_by("last_name", "first_name", "username").values_list(
+        "id", "username", "first_name", "last_name",
+    )
+    scores = {}
+    for assessment_id, student_id, raw_score in StudentAssessmentResult.objects.filter(
+        assessment__curriculum=curriculum,
+    ).values_list("assessment_id", "student_id", "raw_score"):
+        scores.setdefault(student_id, {})[assessment_id] = raw_score
+    totals = dict(CourseGrade.objects.filter(curriculum=curriculum).values_list("student_id", "total"))
+
+    rows = []
+    for student_id, username, first_name, last_name in students:
+        student_scores = scores.get(student_id, {})
+        cells = []
+        for assessment in assessments:
+            name = cell_name(student_id, assessment.id)
+            cells.append({
+                "name": name,
+                "max_score": assessment.max_score,
+                "value": posted.get(name, student_scores.get(assessment.id)),
+            })
+        rows.append({
+            "username": username,
+            "full_name": f"{first_name} {last_name}".strip() or username,
+            "cells": cells,
+            "total": totals.get(student_id),
+        })
+    return rows
+
+
+GRID_FIELD = "grid"
+
+
+def posted_cells(post):
+    """
+    POST verisinden {hücre adı: değer}: ``grid`` JSON alanı varsa ondan,
+    yoksa hücre alanlarının kendisinden. (hücreler, hata | None) döner.
+    """
+    raw = post.get(GRID_FIELD)
+    if not raw:
+        return post, None
+    try:
+        cells = json.loads(raw)
+    except ValueError:
+        cells = None
+    if not isinstance(cells, dict):
+        return {}, "The gradebook could not be read; nothing was saved."
+    return {str(name): str(value) for name, value in cells.items()}, None
+
+
+def parse_gradebook(data, curriculum, assessments):
+    """
+    POST verisinden dolu hücreleri okur ve doğrular.
+
+    ({(assessment_id, student_id): Decimal}, [hata mesajları]) döner.
+    Boş hücreler atlanır (mevcut not silinmez, tek tek not ekranıyla aynı).
+    """
+    student_ids = curriculum.students.values_list("id", "username")
+    scores = {}
+    errors = []
+    for student_id, username in student_ids:
+        for assessment in assessments:
+            raw_value = data.get(cell_name(student_id, assessment.id), "").strip()
+            if raw_value == "":
+                continue
+            try:
+                scores[(assessment.id, student_id)] = clean_score(raw_value, assessment.max_score)
+            except ValueError as exc:
+                errors.append(f"{username} / {assessment.name}: {exc}")
+    return scores, errors
+
+
+def changed_cells(curriculum, scores):
+    """
+    Gönderilen notları dersin mevcut notlarıyla karşılaştırır.
+
+    ``save_results`` için (değişen/yeni notlar, ilgili mevcut kayıtlar) döner.
+    Karşılaştırma düz tuple'larla yapılır; model nesnesi sadece değişen
+    hücreler için kurulur (7500 satırı instance'a çevirmek POST'un en pahalı
+    kısmıydı).
+    """
+    current = {
+        (assessment_id, student_id): (pk, raw_score)
+        for pk, assessment_id, student_id, raw_score in StudentAssessmentResult.objects.filter(
+            assessment__curriculum=curriculum,
+        ).values_list("id", "assessment_id", "student_id", "raw_score")
+    }
+    changed = {}
+    existing = {}
+    for key, score in scores.items():
+        row = current.get(key)
+        if row is None:
+            changed[key] = score
+        elif row[1] != score:
+            changed[key] = score
+            existing[key] = StudentAssessmentResult(
+                id=row[0], assessment_id=key[0], student_id=key[1], raw_score=row[1],
+            )
+    return changed, existing
@@ -0,0 +1,101 @@
+"""
+Materialized ders toplamı (``CourseGrade``).
+
+Toplam tek bir aggregate sorguyla hesaplanır:
+Σ raw_score / max_score × weight_in_course (notu girilmiş assessment'lar).
+Hesap ucuz olduğu için (aggregate + delete + upsert) attainment'ın
+aksine commit'i beklemeden, yazan transaction'ın içinde çalışır.
+"""
+from decimal import Decimal
+from functools import partial
+
+from django.db import transaction
+from django.db.models import Exists, F, FloatField, OuterRef, Q, Sum
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from accounts.dashboard import invalidate_curriculum_dashboards
+from .models import CourseGrade, StudentAssessmentResult
+
+# Bundan fazla öğrenci id'si gelirse dersin tamamı yenilenir
+MAX_STUDENT_ID_LIST = 500
+
+
+def _scope_q(pending, prefix=""):
+    q = Q()
+    for curriculum_id, student_ids in pending.items():
+        condition = Q(**{f"{prefix}curriculum_id": curriculum_id})
+        if student_ids is not None and len(student_ids) <= MAX_STUDENT_ID_LIST:
+            condition &= Q(student_id__in=list(student_ids))
+        q |= condition
+    return q
+
+
+def _graded_results(**filters):
+    return StudentAssessmentResult.objects.filter(
+        raw_score__isnull=False, assessment__max_score__gt=0, **filters,
+    )
+
+
+def refresh_course_grades(pending):
+    """
+    ``pending``: {curriculum_id: student_ids | None}. İlgili öğrencilerin
+    (None → dersin tamamı) ``CourseGrade`` satırlarını yeniden kurar.
+    Hiç notu kalmayan öğrencinin satırı silinir.
+    """
+    if not pending:
+        return
+
+    totals = (
+        _graded_results()
+        .filter(_scope_q(pending, "assessment__"))
+        .values("student_id", course_id=F("assessment__curriculum_id"))
+        .annotate(total=Sum(
+            Cast("raw_score", FloatField())
+            / F("assessment__max_score")
+            * F("assessment__weight_in_course")
+        ))
+        .order_by()
+    )
+
+    now = timezone.now()
+    rows = [
+        CourseGrade(
+            student_id=row["student_id"],
+            curriculum_id=row["course_id"],
+            total=Decimal(str(round(row["total"], 2))),
+            computed_at=now,
+        )
+        for row in totals
+    ]
+
+    # Çağıranın transaction'ı varsa ek savepoint açılmaz. Satırlar silinip
+    # yeniden yazılmaz: eşzamanlı iki refresh aynı satırı eklemeye çalışınca
+    # unique constraint patlamasın diye upsert; sadece notu kalmayanlar silinir.
+    with transaction.atomic(savepoint=False):
+        CourseGrade.objects.filter(_scope_q(pending)).exclude(
+            Exists(_graded_results(
+                student_id=OuterRef("student_id"),
+                assessment__curriculum_id=OuterRef("curriculum_id"),
+            ))
+        ).delete()
+        CourseGrade.objects.bulk_create(
+            rows,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["student", "curriculum"],
+            update_fields=["total", "computed_at"],
+        )
+    transaction.on_commit(partial(invalidate_curriculum_dashboards, dict(pending)))
+
+
+def refresh_curriculum_grades(curriculum_id, student_ids=None):
+    refresh_course_grades({curriculum_id: student_ids})
+
+
+def course_totals(student, curriculum_ids):
+    """Öğrencinin verilen derslerdeki toplamları {curriculum_id: Decimal}."""
+    return dict(
+        CourseGrade.objects.filter(student=student, curriculum_id__in=curriculum_ids)
+        .values_list("curriculum_id", "total")
+    )
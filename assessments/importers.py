@@ -0,0 +1,127 @@
+import csv
+
+from outcomes.attainment import batched_refresh
+from .models import StudentAssessmentResult
+from .services import clean_score, save_results
+
+# Öğrenci numarası diye ayrı bir alan yok; öğrenci username ile eşleşir
+USERNAME_COLUMNS = ("username", "student")
+SCORE_COLUMNS = ("raw_score", "score")
+MAX_REPORTED_ERRORS = 200
+
+
+class GradeImportReport:
+    """
+    Import sonucu: yazılan / atlanan satır sayıları ve satır bazlı hatalar.
+    Bellek sabit kalsın diye en fazla ``MAX_REPORTED_ERRORS`` hata saklanır,
+    toplam hata sayısı ``error_count``'ta tutulur.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.skipped = 0
+        self.error_count = 0
+        self.errors = []
+
+    def add_error(self, line_no, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line_no, message))
+
+    @property
+    def errors_truncated(self):
+        return self.error_count > len(self.errors)
+
+
+def _pick_column(fieldnames, candidates):
+    normalized = {name.strip().lower(): name for name in fieldnames if name}
+    for candidate in candidates:
+        if candidate in normalized:
+            return normalized[candidate]
+    return None
+
+
+def import_grades(assessment, lines, chunk_size=1000):
+    """
+    ``lines`` (dosya ya da satır iterator'ü) üzerinden CSV'yi satır satır okuyup
+    ``assessment`` için notları yazar.
+
+    - Başlık satırı zorunlu: ``username`` ve ``raw_score`` (veya ``score``).
+    - Öğrenciler dersin kayıtlı öğrencileri içinden tek sorguda çözülür.
+    - Notlar ``chunk_size``'lık parçalar halinde toplu upsert edilir.
+    - Hatalı satırlar rapora eklenir, import devam eder.
+    """
+    report = GradeImportReport()
+
+    reader = csv.DictReader(lines)
+    fieldnames = reader.fieldnames or []
+    username_col = _pick_column(fieldnames, USERNAME_COLUMNS)
+    score_col = _pick_column(fieldnames, SCORE_COLUMNS)
+    if username_col is None or score_col is None:
+        report.add_error(1, "Header must contain 'username' and 'raw_score' columns.")
+        return report
+
+    # Tek sorguda dersin öğrencileri: username → id
+    student_ids = dict(
+        assessment.curriculum.students.values_list("username", "id")
+    )
+
+    # Chunk'lar ayrı ayrı yazılır ama attainment en sonda bir kez hesaplanır
+    with batched_refresh():
+        _import_rows(assessment, reader, username_col, score_col, student_ids, chunk_size, report)
+
+    return report
+
+
+def _import_rows(assessment, reader, username_col, score_col, student_ids, chunk_size, report):
+    chunk = {}
+    for row in reader:
+        report.rows += 1
+        line_no = reader.line_num
+        username = (row.get(username_col) or "").strip()
+        raw_value = (row.get(score_col) or "").strip()
+
+        if not username:
+            report.add_error(line_no, "Missing username.")
+            continue
+
+        student_id = student_ids.get(username)
+        if student_id is None:
+            report.add_error(line_no, f"'{username}' is not enrolled in {assessment.curriculum.code}.")
+            continue
+
+        # Boş puan → kayda dokunma (form ile aynı davranış)
+        if raw_value == "":
+            report.skipped += 1
+            continue
+
+        try:
+            score = clean_score(raw_value, assessment.max_score)
+        except ValueError as exc:
+            report.add_error(line_no, str(exc))
+            continue
+
+        chunk[(assessment.id, student_id)] = score
+        if len(chunk) >= chunk_size:
+            _flush(assessment, chunk, report)
+            chunk = {}
+
+    if chunk:
+        _flush(assessment, chunk, report)
+
+
+def _flush(assessment, chunk, report):
+    existing = {
+        (r.assessment_id, r.student_id): r
+        for r in StudentAssessmentResult.objects.filter(
+            assessment=assessment,
+            student_id__in=[student_id for _, student_id in chunk],
+        )
+    }
+    created, updated = save_results(chunk, existing)
+    report.created += created
+    report.updated += updated
+    report.unchanged += len(chunk) - created - updated
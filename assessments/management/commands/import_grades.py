@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from assessments.importers import import_grades
+from assessments.models import Assessment
+
+
+class Command(BaseCommand):
+    help = "Import grades for an assessment from a CSV file (username, raw_score)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("assessment_id", type=int)
+        parser.add_argument("csv_path")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of results written per bulk upsert.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            assessment = Assessment.objects.select_related("curriculum").get(
+                pk=options["assessment_id"],
+            )
+        except Assessment.DoesNotExist:
+            raise CommandError(f"Assessment {options['assessment_id']} does not exist.")
+
+        try:
+            with open(options["csv_path"], encoding="utf-8-sig", newline="") as fh:
+                report = import_grades(assessment, fh, chunk_size=options["chunk_size"])
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        for line_no, message in report.errors:
+            self.stderr.write(f"line {line_no}: {message}")
+        if report.errors_truncated:
+            self.stderr.write(f"... {report.error_count - len(report.errors)} more errors")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{report.rows} rows read: {report.created} created, {report.updated} updated, "
+            f"{report.unchanged} unchanged, {report.skipped} skipped, {report.error_count} errors."
+        ))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from assessments.grades import refresh_course_grades
+from curriculum.models import Curriculum
+
+
+class Command(BaseCommand):
+    help = "Rebuild the materialized course totals (all curricula or the given programs)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--program",
+            action="append",
+            default=[],
+            help="Program code (repeatable). Default: every program.",
+        )
+
+    def handle(self, *args, **options):
+        curricula = Curriculum.objects.order_by("id")
+        if options["program"]:
+            curricula = curricula.filter(program__code__in=options["program"])
+
+        curriculum_ids = list(curricula.values_list("id", flat=True))
+        # Sorgu boyutu sınırlı kalsın diye parça parça
+        for start in range(0, len(curriculum_ids), 100):
+            refresh_course_grades(dict.fromkeys(curriculum_ids[start:start + 100]))
+
+        self.stdout.write(self.style.SUCCESS(f"Course totals refreshed for {len(curriculum_ids)} curricula."))
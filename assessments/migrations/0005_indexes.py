@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0004_cleanup_legacy_assesments_tables'),
+        ('curriculum', '0001_initial'),
+        ('outcomes', '0002_attainment'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='assessment',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='assessmentlearningoutcome',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='studentassessmentresult',
+            unique_together=set(),
+        ),
+        migrations.AlterField(
+            model_name='studentassessmentresult',
+            name='assessment',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='results', to='assessments.assessment'),
+        ),
+        migrations.AlterField(
+            model_name='studentassessmentresult',
+            name='student',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='assessment_results', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='studentassessmentresult',
+            index=models.Index(fields=['student', 'assessment'], name='result_student_assessment_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='assessment',
+            constraint=models.UniqueConstraint(fields=('curriculum', 'name'), name='assessment_curriculum_name_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='assessmentlearningoutcome',
+            constraint=models.UniqueConstraint(fields=('assessment', 'learning_outcome'), name='assessment_lo_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='studentassessmentresult',
+            constraint=models.UniqueConstraint(fields=('assessment', 'student'), name='result_assessment_student_uniq'),
+        ),
+    ]
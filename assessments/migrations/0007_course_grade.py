@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:14
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0006_updated_at'),
+        ('curriculum', '0003_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseGrade',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total', models.DecimalField(decimal_places=2, help_text='Course total in percent (0-100).', max_digits=5)),
+                ('computed_at', models.DateTimeField()),
+                ('curriculum', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='course_grades', to='curriculum.curriculum')),
+                ('student', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='course_grades', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Course Grade',
+                'verbose_name_plural': 'Course Grades',
+                'indexes': [models.Index(fields=['curriculum', '-total'], name='course_grade_ranking_idx')],
+                'constraints': [models.UniqueConstraint(fields=('student', 'curriculum'), name='course_grade_student_curriculum_uniq')],
+            },
+        ),
+    ]
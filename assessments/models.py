@@ -1,11 +1,15 @@
 from django.db import models
 from django.conf import settings
 
+from accounts.tracking import TrackedFieldsMixin
 from curriculum.models import Curriculum
 from outcomes.models import LearningOutcome
 
 
-class Assessment(models.Model):
+class Assessment(TrackedFieldsMixin, models.Model):
+    # Değişince türetilmiş (attainment) verinin yeniden hesaplanması gereken alanlar
+    tracked_fields = ("max_score", "weight_in_course")
+
     class AssessmentType(models.TextChoices):
         QUIZ = "QUIZ", "Quiz"
         MIDTERM = "MIDTERM", "Midterm"
@@ -36,13 +40,16 @@ class Assessment(models.Model):
         null=True,
         blank=True,
     )
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.curriculum.code} - {self.name}"
 
     class Meta:
         ordering = ["curriculum", "type", "name"]
-        unique_together = ("curriculum", "name")
+        constraints = [
+            models.UniqueConstraint(fields=["curriculum", "name"], name="assessment_curriculum_name_uniq"),
+        ]
         verbose_name = "Assessment"
         verbose_name_plural = "Assessments"
 
@@ -68,7 +75,12 @@ class AssessmentLearningOutcome(models.Model):
     )
 
     class Meta:
-        unique_together = ("assessment", "learning_outcome")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["assessment", "learning_outcome"],
+                name="assessment_lo_uniq",
+            ),
+        ]
         verbose_name = "Assessment → LO Mapping"
         verbose_name_plural = "Assessment → LO Mappings"
 
@@ -84,11 +96,15 @@ class StudentAssessmentResult(models.Model):
         "assessments.Assessment",
         on_delete=models.CASCADE,
         related_name="results",
+        # (assessment, student) unique index'i yeterli
+        db_index=False,
     )
     student = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name="assessment_results",
+        # (student, assessment) index'i yeterli
+        db_index=False,
     )
 
     raw_score = models.DecimalField(
@@ -103,7 +119,14 @@ class StudentAssessmentResult(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        unique_together = ("assessment", "student")
+        constraints = [
+            # assessment_id ile yapılan aramaları da karşılar
+            models.UniqueConstraint(fields=["assessment", "student"], name="result_assessment_student_uniq"),
+        ]
+        indexes = [
+            # Öğrencinin kendi notları (ders detayı, panel, attainment)
+            models.Index(fields=["student", "assessment"], name="result_student_assessment_idx"),
+        ]
         verbose_name = "Student Assessment Result"
         verbose_name_plural = "Student Assessment Results"
 
@@ -119,3 +142,45 @@ class StudentAssessmentResult(models.Model):
         if self.raw_score is None or not self.assessment or not self.assessment.max_score:
             return None
         return (self.raw_score / self.assessment.max_score) * 100
+
+
+class CourseGrade(models.Model):
+    """
+    Öğrencinin bir dersteki toplam notu (materialized):
+    Σ raw_score / max_score × weight_in_course, notu girilmiş assessment'lar
+    üzerinden. ``assessments.grades`` tarafından güncel tutulur; elle düzenlenmez.
+    """
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="course_grades",
+        # (student, curriculum) unique index'i yeterli
+        db_index=False,
+    )
+    curriculum = models.ForeignKey(
+        Curriculum,
+        on_delete=models.CASCADE,
+        related_name="course_grades",
+        # (curriculum, total) index'i yeterli
+        db_index=False,
+    )
+    total = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        help_text="Course total in percent (0-100).",
+    )
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["student", "curriculum"], name="course_grade_student_curriculum_uniq"),
+        ]
+        indexes = [
+            # Ders sıralaması / ortalaması
+            models.Index(fields=["curriculum", "-total"], name="course_grade_ranking_idx"),
+        ]
+        verbose_name = "Course Grade"
+        verbose_name_plural = "Course Grades"
+
+    def __str__(self):
+        return f"{self.student} - {self.curriculum} ({self.total})"
@@ -0,0 +1,88 @@
+"""
+Lecturer paneli için not girişi ilerlemesi.
+
+Verilen derslerin tamamı için, ders sayısından bağımsız dört gruplu sorgu:
+kayıtlı öğrenci sayıları, assessment'lar, assessment başına notlanmış kayıtlı
+öğrenci sayısı + sınıf ortalaması ve LO mapping ağırlık toplamı. Sonuç
+bellekte ders → assessment satırlarına dağıtılır.
+"""
+from django.db.models import Avg, Count, F, FloatField, Sum
+from django.db.models.functions import Cast
+
+from curriculum.models import Curriculum
+from .models import Assessment, AssessmentLearningOutcome, StudentAssessmentResult
+
+# Assessment'ın LO ağırlıkları bu toplama ulaşınca mapping tamam sayılır
+FULL_LO_WEIGHT = 100
+
+
+def enrolled_graded_results():
+    """
+    Sadece derse kayıtlı öğrencilerin girilmiş notları (ders değiştirenlerin
+    eski notları sayılmaz). Not ilerlemesi ve ders listesi aynı tanımı kullanır.
+    """
+    return StudentAssessmentResult.objects.filter(
+        raw_score__isnull=False,
+        student__enrolled_curricula=F("assessment__curriculum"),
+    )
+
+
+def grading_progress(curricula):
+    """
+    ``curricula``: Curriculum listesi. Her derse ``student_count``,
+    ``progress_rows`` (assessment başına dict) ve ``ungraded_count`` eklenir;
+    aynı liste döner.
+    """
+    by_id = {curriculum.id: curriculum for curriculum in curricula}
+    if not by_id:
+        return curricula
+
+    student_counts = dict(
+        Curriculum.students.through.objects.filter(curriculum_id__in=by_id)
+        .values("curriculum_id")
+        .annotate(n=Count("*"))
+        .values_list("curriculum_id", "n")
+        .order_by()
+    )
+
+    graded = {
+        assessment_id: (count, average)
+        for assessment_id, count, average in (
+            enrolled_graded_results().filter(assessment__curriculum_id__in=by_id)
+            .values("assessment_id")
+            .annotate(n=Count("*"), average=Avg(Cast("raw_score", FloatField())))
+            .values_list("assessment_id", "n", "average")
+            .order_by()
+        )
+    }
+
+    lo_weights = dict(
+        AssessmentLearningOutcome.objects.filter(assessment__curriculum_id__in=by_id)
+        .values("assessment_id")
+        .annotate(total=Sum("weight_in_assessment"))
+        .values_list("assessment_id", "total")
+        .order_by()
+    )
+
+    for curriculum in curricula:
+        curriculum.student_count = student_counts.get(curriculum.id, 0)
+        curriculum.progress_rows = []
+        curriculum.ungraded_count = 0
+
+    for assessment in Assessment.objects.filter(curriculum_id__in=by_id).order_by("curriculum_id", "id"):
+        curriculum = by_id[assessment.curriculum_id]
+        graded_count, average = graded.get(assessment.id, (0, None))
+        lo_weight = lo_weights.get(assessment.id) or 0
+        remaining = max(curriculum.student_count - graded_count, 0)
+        curriculum.ungraded_count += remaining
+        curriculum.progress_rows.append({
+            "assessment": assessment,
+            "graded": graded_count,
+            "remaining": remaining,
+            "average": average,
+            "average_percent": average / float(assessment.max_score) * 100 if average is not None and assessment.max_score else None,
+            "lo_weight": lo_weight,
+            "lo_complete": lo_weight == FULL_LO_WEIGHT,
+        })
+
+    return curricula
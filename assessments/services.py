@@ -0,0 +1,145 @@
+import sqlite3
+from decimal import Decimal, InvalidOperation
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from outcomes.attainment import request_refresh
+from .grades import refresh_course_grades
+from .models import Assessment, StudentAssessmentResult
+
+SCORE_QUANTUM = Decimal("0.01")
+
+
+def clean_score(raw_value, max_score):
+    """
+    Girilen puanı Decimal'e çevirir ve 0 ile ``max_score`` arasında olduğunu
+    doğrular. Geçersizse açıklamalı ``ValueError`` fırlatır.
+    """
+    try:
+        score = Decimal(str(raw_value).strip())
+    except (InvalidOperation, ValueError):
+        raise ValueError(f"'{raw_value}' is not a valid number.")
+    if not score.is_finite():
+        raise ValueError(f"'{raw_value}' is not a valid number.")
+    if score < 0 or score > max_score:
+        raise ValueError(f"Score {score} is outside 0-{max_score}.")
+    return score.quantize(SCORE_QUANTUM)
+
+
+def save_results(scores, existing, batch_size=1000):
+    """
+    Not girişlerini toplu olarak kaydeder.
+
+    - ``scores``: {(assessment_id, student_id): Decimal}
+    - ``existing``: aynı anahtarlarla zaten yüklenmiş StudentAssessmentResult'lar
+
+    Değişmeyen notlara hiç dokunulmaz; yeni kayıtlar tek bir ``bulk_create``,
+    değişenler tek bir ``bulk_update`` ile tek transaction içinde yazılır.
+    (created, updated) sayılarını döner.
+    """
+    now = timezone.now()
+    to_create = []
+    to_update = []
+
+    for (assessment_id, student_id), score in scores.items():
+        result = existing.get((assessment_id, student_id))
+        if result is None:
+            to_create.append(
+                StudentAssessmentResult(
+                    assessment_id=assessment_id,
+                    student_id=student_id,
+                    raw_score=score,
+                )
+            )
+        elif result.raw_score != score:
+            result.raw_score = score
+            # bulk_update auto_now alanlarını kendisi güncellemez
+            result.updated_at = now
+            to_update.append(result)
+
+    with transaction.atomic():
+        if to_create:
+            StudentAssessmentResult.objects.bulk_create(to_create, batch_size=batch_size)
+        if to_update:
+            _update_scores(to_update, now, batch_size)
+
+        # bulk işlemler signal göndermez → türetilmiş veriyi burada tetikle
+        _request_refresh(to_create + to_update)
+
+    return len(to_create), len(to_update)
+
+
+def _supports_update_from():
+    if connection.vendor == "postgresql":
+        return True
+    return connection.vendor == "sqlite" and sqlite3.sqlite_version_info >= (3, 33)
+
+
+def _update_scores(results, now, batch_size):
+    """
+    Değişen notları ``UPDATE ... FROM (VALUES ...)`` ile yazar.
+
+    ``bulk_update``'in ürettiği CASE WHEN ifadesi binlerce satırda hem SQL'de
+    hem Python tarafında (ifade derleme) pahalı; destekleyen backend'lerde
+    satır başına iki parametreli tek bir join'li UPDATE kullanılır.
+    """
+    if not _supports_update_from():
+        StudentAssessmentResult.objects.bulk_update(results, ["raw_score", "updated_at"], batch_size=batch_size)
+        return
+
+    qn = connection.ops.quote_name
+    meta = StudentAssessmentResult._meta
+    table = qn(meta.db_table)
+    pk = qn(meta.pk.column)
+    score_field = meta.get_field("raw_score")
+    score = qn(score_field.column)
+    updated_at = qn(meta.get_field("updated_at").column)
+    now = connection.ops.adapt_datetimefield_value(now)
+
+    max_params = connection.features.max_query_params
+    if max_params:
+        batch_size = min(batch_size, (max_params - 1) // 2)
+
+    with connection.cursor() as cursor:
+        for start in range(0, len(results), batch_size):
+            batch = results[start:start + batch_size]
+            params = [now]
+            for result in batch:
+                params.extend((
+                    result.pk,
+                    connection.ops.adapt_decimalfield_value(
+                        result.raw_score, score_field.max_digits, score_field.decimal_places,
+                    ),
+                ))
+            # VALUES sütunları iki backend'de de column1, column2 adını alır
+            cursor.execute(
+                f"UPDATE {table} SET {score} = v.column2, {updated_at} = %s "
+                f"FROM (VALUES {', '.join(['(%s, %s)'] * len(batch))}) AS v "
+                f"WHERE {table}.{pk} = v.column1",
+                params,
+            )
+
+
+def _request_refresh(results):
+    if not results:
+        return
+
+    students_by_assessment = {}
+    for result in results:
+        students_by_assessment.setdefault(result.assessment_id, set()).add(result.student_id)
+
+    curriculum_by_assessment = dict(
+        Assessment.objects.filter(id__in=students_by_assessment)
+        .values_list("id", "curriculum_id")
+    )
+    students_by_curriculum = {}
+    for assessment_id, student_ids in students_by_assessment.items():
+        curriculum_id = curriculum_by_assessment.get(assessment_id)
+        if curriculum_id is not None:
+            students_by_curriculum.setdefault(curriculum_id, set()).update(student_ids)
+
+    # Ders toplamı aynı transaction'da, attainment commit sonrası
+    refresh_course_grades(students_by_curriculum)
+    for curriculum_id, student_ids in students_by_curriculum.items():
+        request_refresh(curriculum_id, student_ids)
@@ -0,0 +1,56 @@
+"""
+``CourseGrade`` tablosunu tekil kayıt değişikliklerinde güncel tutan signal'ler.
+
+Toplu yazma yolları (``save_results``) signal göndermez; onlar
+``assessments.grades.refresh_course_grades``'i doğrudan çağırır.
+"""
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .grades import refresh_curriculum_grades
+from .models import Assessment, StudentAssessmentResult
+
+
+def _curriculum_id(assessment_id):
+    return (
+        Assessment.objects.filter(pk=assessment_id)
+        .values_list("curriculum_id", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=StudentAssessmentResult)
+def refresh_grade_on_result_change(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    curriculum_id = _curriculum_id(instance.assessment_id)
+    if curriculum_id is not None:
+        refresh_curriculum_grades(curriculum_id, [instance.student_id])
+
+
+@receiver(post_delete, sender=StudentAssessmentResult)
+def refresh_grade_on_result_delete(sender, instance, origin=None, **kwargs):
+    # Assessment / öğrenci / ders silinirken gelen cascade'lerde her satır için
+    # çalışmasın: o durumları Assessment receiver'ı ya da CourseGrade cascade'i karşılar
+    if isinstance(origin, QuerySet):
+        origin = origin.model
+    if origin is not StudentAssessmentResult and not isinstance(origin, StudentAssessmentResult):
+        return
+    curriculum_id = _curriculum_id(instance.assessment_id)
+    if curriculum_id is not None:
+        refresh_curriculum_grades(curriculum_id, [instance.student_id])
+
+
+@receiver(post_save, sender=Assessment)
+def refresh_grades_on_assessment_change(sender, instance, created=False, raw=False, **kwargs):
+    """max_score / weight_in_course değişince dersin tüm toplamları değişir."""
+    if raw or created:
+        return
+    if instance.has_tracked_changes("max_score", "weight_in_course"):
+        refresh_curriculum_grades(instance.curriculum_id)
+
+
+@receiver(post_delete, sender=Assessment)
+def refresh_grades_on_assessment_delete(sender, instance, **kwargs):
+    refresh_curriculum_grades(instance.curriculum_id)
@@ -1,3 +1,360 @@
-from django.test import TestCase
+import io
+import json
+import os
+import tempfile
+from decimal import Decimal
+from functools import partial
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import CustomUser
+from config.testing import QueryBudgetMixin
+from curriculum.models import Curriculum
+from organizations.models import Faculty, Program
+from outcomes.attainment import refresh_curricula_attainment
+from .grades import refresh_curriculum_grades
+from .importers import import_grades
+from .services import save_results
+from .models import Assessment, CourseGrade, StudentAssessmentResult
+
+
+class AssessmentGradeManageQueryBudgetTests(QueryBudgetMixin, TestCase):
+    # + ders toplamı (aggregate, delete, upsert) aynı transaction'da
+    # + yetki kapsamı (request başına tek sorgu, request'ler arası cache'lenmez)
+    QUERY_BUDGET = 26
+
+    @classmethod
+    def setUpTestData(cls):
+        faculty = Faculty.objects.create(code="ENG", name="Engineering")
+        cls.program = Program.objects.create(code="CENG", name="Computer Eng.", faculty=faculty)
+        cls.lecturer = CustomUser.objects.create_user("lecturer", role=CustomUser.Role.LECTURER)
+        cls.curriculum = Curriculum.objects.create(
+            program=cls.program, code="CENG101", name="Intro", year=1, lecturer=cls.lecturer,
+        )
+        cls.midterm = Assessment.objects.create(
+            curriculum=cls.curriculum, name="Midterm", weight_in_course=40, max_score=100,
+        )
+        cls.final = Assessment.objects.create(
+            curriculum=cls.curriculum, name="Final", weight_in_course=60, max_score=100,
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def _enroll(self, count, offset=0):
+        for i in range(offset, offset + count):
+            CustomUser.objects.create_user(
+                f"student{i}",
+                role=CustomUser.Role.STUDENT,
+                student_program=self.program,
+                student_grade=1,
+            )
+
+    def _post_all(self, assessment, score):
+        data = {
+            f"student_{student_id}": score
+            for student_id in self.curriculum.students.values_list("id", flat=True)
+        }
+        self.client.force_login(self.lecturer)
+        # on_commit ile çalışan attainment refresh'i de bütçeye dahil
+        with self.assertMaxQueries(self.QUERY_BUDGET) as queries, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("assessments:assessment_grade_manage", args=[assessment.id]),
+                data,
+            )
+        self.assertEqual(response.status_code, 302)
+        return len(queries.captured_queries)
+
+    def test_save_is_constant_query_regardless_of_class_size(self):
+        self._enroll(5)
+        small = self._post_all(self.midterm, "50")
+        self._enroll(60, offset=5)
+        large = self._post_all(self.final, "60")
+        self.assertEqual(small, large)
+        self.assertEqual(
+            StudentAssessmentResult.objects.filter(assessment=self.final, raw_score=60).count(),
+            65,
+        )
+
+    def test_invalid_scores_are_reported_not_saved(self):
+        self._enroll(4)
+        students = list(self.curriculum.students.order_by("username"))
+        data = {
+            f"student_{students[0].id}": "70",
+            f"student_{students[1].id}": "-5",
+            f"student_{students[2].id}": "150",
+            f"student_{students[3].id}": "NaN",
+        }
+        self.client.force_login(self.lecturer)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("assessments:assessment_grade_manage", args=[self.midterm.id]), data,
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["errors"]), 3)
+        self.assertIn("student1: Score -5 is outside 0-100", response.context["errors"][0])
+        # Girilen değerler formda korunur
+        self.assertEqual([row["score"] for row in response.context["rows"]], ["70", "-5", "150", "NaN"])
+        self.assertEqual(
+            dict(self.midterm.results.values_list("student_id", "raw_score")),
+            {students[0].id: 70},
+        )
+
+
+class CurriculumGradebookTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        faculty = Faculty.objects.create(code="ENG", name="Engineering")
+        program = Program.objects.create(code="CENG", name="Computer Eng.", faculty=faculty)
+        cls.lecturer = CustomUser.objects.create_user("lecturer", role=CustomUser.Role.LECTURER)
+        cls.curriculum = Curriculum.objects.create(
+            program=program, code="CENG101", name="Intro", year=1, lecturer=cls.lecturer,
+        )
+        cls.midterm = Assessment.objects.create(
+            curriculum=cls.curriculum, name="Midterm", weight_in_course=40, max_score=50,
+        )
+        cls.final = Assessment.objects.create(
+            curriculum=cls.curriculum, name="Final", weight_in_course=60, max_score=100,
+        )
+        cls.students = [
+            CustomUser.objects.create_user(
+                f"student{i}", role=CustomUser.Role.STUDENT, student_program=program, student_grade=1,
+            )
+            for i in range(3)
+        ]
+        StudentAssessmentResult.objects.bulk_create([
+            StudentAssessmentResult(assessment=cls.midterm, student=student, raw_score=25)
+            for student in cls.students
+        ])
+        refresh_curriculum_grades(cls.curriculum.id)
+        cls.url = reverse("assessments:curriculum_gradebook", args=[cls.curriculum.id])
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.lecturer)
+
+    def _cell(self, student, assessment):
+        return f"g_{student.id}_{assessment.id}"
+
+    def test_matrix_and_course_total(self):
+        with self.assertMaxQueries(8):
+            response = self.client.get(self.url)
+
+        rows = response.context["rows"]
+        self.assertEqual(len(rows), 3)
+        # 25/50 × 40 → 20; final notu yok
+        self.assertEqual(rows[0]["total"], 20)
+        self.assertContains(response, f'name="{self._cell(self.students[0], self.final)}" value=""')
+
+    def test_save_writes_only_changed_cells(self):
+        untouched = StudentAssessmentResult.objects.get(assessment=self.midterm, student=self.students[1])
+        data = {self._cell(student, self.midterm): "25.00" for student in self.students}
+        data[self._cell(self.students[0], self.midterm)] = "30"
+        data[self._cell(self.students[0], self.final)] = "90"
+        data[self._cell(self.students[2], self.final)] = '"><b>abc'
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, data)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["errors"]), 1)
+        # Hatalı hücre girilen (escape edilmiş) değerle geri gelir
+        self.assertContains(response, f'name="{self._cell(self.students[2], self.final)}" value="&quot;&gt;&lt;b&gt;abc"')
+        self.assertContains(response, f'name="{self._cell(self.students[0], self.final)}" value="90"')
+        scores = dict(
+            StudentAssessmentResult.objects.filter(student=self.students[0]).values_list("assessment_id", "raw_score")
+        )
+        self.assertEqual(scores, {self.midterm.id: 30, self.final.id: 90})
+        # 30/50 × 40 + 90/100 × 60
+        self.assertEqual(CourseGrade.objects.get(student=self.students[0]).total, 78)
+        untouched_after = StudentAssessmentResult.objects.get(pk=untouched.pk)
+        self.assertEqual(untouched_after.updated_at, untouched.updated_at)
+        self.assertFalse(
+            StudentAssessmentResult.objects.filter(assessment=self.final, student=self.students[2]).exists()
+        )
+
+
+    @override_settings(DATA_UPLOAD_MAX_NUMBER_FIELDS=4)
+    def test_grid_json_stays_under_the_field_limit(self):
+        cells = {self._cell(student, assessment): "40" for student in self.students for assessment in (self.midterm, self.final)}
+
+        # Hücre başına alan: site geneli sınır aşılır
+        self.assertEqual(self.client.post(self.url, cells).status_code, 400)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, {"grid": json.dumps(cells)})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(StudentAssessmentResult.objects.filter(raw_score=40).count(), 6)
+
+        response = self.client.post(self.url, {"grid": "[1, 2"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("could not be read", response.context["errors"][0])
+
+
+class CourseGradeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        faculty = Faculty.objects.create(code="ENG", name="Engineering")
+        program = Program.objects.create(code="CENG", name="Computer Eng.", faculty=faculty)
+        cls.curriculum = Curriculum.objects.create(program=program, code="CENG101", name="Intro", year=1)
+        cls.student = CustomUser.objects.create_user(
+            "student", role=CustomUser.Role.STUDENT, student_program=program, student_grade=1,
+        )
+        cls.midterm = Assessment.objects.create(
+            curriculum=cls.curriculum, name="Midterm", weight_in_course=40, max_score=50,
+        )
+
+    def _total(self):
+        return CourseGrade.objects.filter(student=self.student, curriculum=self.curriculum).values_list(
+            "total", flat=True,
+        ).first()
+
+    def test_follows_result_and_assessment_changes(self):
+        result = StudentAssessmentResult.objects.create(assessment=self.midterm, student=self.student, raw_score=25)
+        self.assertEqual(self._total(), 20)
+
+        self.midterm.weight_in_course = 50
+        self.midterm.save()
+        self.assertEqual(self._total(), 25)
+
+        self.midterm.max_score = 100
+        self.midterm.save()
+        self.assertEqual(self._total(), Decimal("12.5"))
+
+        result.delete()
+        self.assertIsNone(self._total())
+
+    def test_assessment_delete_recomputes_once(self):
+        final = Assessment.objects.create(curriculum=self.curriculum, name="Final", weight_in_course=60)
+        StudentAssessmentResult.objects.create(assessment=self.midterm, student=self.student, raw_score=50)
+        StudentAssessmentResult.objects.create(assessment=final, student=self.student, raw_score=50)
+        self.assertEqual(self._total(), 70)
+
+        final.delete()
+        self.assertEqual(self._total(), 40)
+
+    def test_refresh_updates_rows_in_place(self):
+        result = StudentAssessmentResult.objects.create(assessment=self.midterm, student=self.student, raw_score=25)
+        grade = CourseGrade.objects.get(student=self.student)
+        # Eşzamanlı başka bir refresh'in yazdığı satır: çakışmada güncellenir, silinip yeniden eklenmez
+        CourseGrade.objects.filter(pk=grade.pk).update(total=99)
+
+        refresh_curriculum_grades(self.curriculum.id, [self.student.id])
+        self.assertEqual(CourseGrade.objects.get(student=self.student).pk, grade.pk)
+        self.assertEqual(self._total(), 20)
+
+        result.raw_score = None
+        result.save()
+        self.assertIsNone(self._total())
+
+
+class GradeImportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        faculty = Faculty.objects.create(code="ENG", name="Engineering")
+        program = Program.objects.create(code="CENG", name="Computer Eng.", faculty=faculty)
+        cls.curriculum = Curriculum.objects.create(program=program, code="CENG101", name="Intro", year=1)
+        cls.students = [
+            CustomUser.objects.create_user(
+                f"s{i}", role=CustomUser.Role.STUDENT, student_program=program, student_grade=1,
+            )
+            for i in range(5)
+        ]
+        CustomUser.objects.create_user("senior", role=CustomUser.Role.STUDENT, student_program=program, student_grade=2)
+        cls.midterm = Assessment.objects.create(
+            curriculum=cls.curriculum, name="Midterm", weight_in_course=40, max_score=50,
+        )
+
+    def _import(self, text, **kwargs):
+        return import_grades(self.midterm, io.StringIO(text), **kwargs)
+
+    def _scores(self):
+        return dict(self.midterm.results.values_list("student__username", "raw_score"))
+
+    def test_unreadable_file_is_a_form_error(self):
+        lecturer = CustomUser.objects.create_user("lecturer", role=CustomUser.Role.LECTURER)
+        Curriculum.objects.filter(pk=self.curriculum.pk).update(lecturer=lecturer)
+        self.client.force_login(lecturer)
+        url = reverse("assessments:assessment_grade_import", args=[self.midterm.pk])
+
+        for content in (
+            "username,raw_score\ns0,10\nş,1\n".encode("cp1254"),
+            ("username,raw_score\ns0,10\n" + "x" * 200_000 + ",1\n").encode(),
+        ):
+            response = self.client.post(url, {"file": SimpleUploadedFile("grades.csv", content)})
+
+            self.assertEqual(response.status_code, 200)
+            self.assertIsNone(response.context["report"])
+            self.assertIn("Could not read the file", response.context["form"].errors["file"][0])
+        self.assertEqual(self._scores(), {})
+
+    def test_flushes_in_chunks_and_refreshes_once(self):
+        StudentAssessmentResult.objects.create(assessment=self.midterm, student=self.students[0], raw_score=10)
+        text = "Username,Score\n" + "".join(f"s{i},{10 + i}\n" for i in range(5))
+
+        with mock.patch("assessments.importers.save_results", wraps=save_results) as save, \
+                self.captureOnCommitCallbacks(execute=False) as callbacks:
+            report = self._import(text, chunk_size=2)
+
+        self.assertEqual(save.call_count, 3)
+        self.assertEqual((report.rows, report.created, report.updated, report.unchanged), (5, 4, 0, 1))
+        self.assertEqual(self._scores()["s4"], Decimal("14"))
+        attainment = [
+            callback for callback in callbacks
+            if isinstance(callback, partial) and callback.func is refresh_curricula_attainment
+        ]
+        self.assertEqual(len(attainment), 1)
+
+    def test_bad_rows_are_reported_and_skipped(self):
+        report = self._import(
+            "student,raw_score\n"
+            "s0,40\n"
+            ",10\n"
+            "senior,10\n"
+            "s1,abc\n"
+            "s2,51\n"
+            "s3,-1\n"
+            "s4,\n"
+        )
+
+        self.assertEqual((report.created, report.skipped, report.error_count), (1, 1, 5))
+        self.assertEqual([line for line, _ in report.errors], [3, 4, 5, 6, 7])
+        self.assertIn("not enrolled in CENG101", report.errors[1][1])
+        self.assertIn("not a valid number", report.errors[2][1])
+        self.assertIn("outside 0-50", report.errors[3][1])
+        self.assertEqual(self._scores(), {"s0": Decimal("40")})
+
+    def test_header_must_name_the_student_and_score(self):
+        report = self._import("student_number,raw_score\ns0,10\n")
+
+        self.assertEqual(report.error_count, 1)
+        self.assertIn("Header must contain", report.errors[0][1])
+        self.assertFalse(self.midterm.results.exists())
+
+    @mock.patch("assessments.importers.MAX_REPORTED_ERRORS", 2)
+    def test_error_list_is_capped(self):
+        report = self._import("username,raw_score\n" + "nobody,1\n" * 4)
+
+        self.assertEqual((report.error_count, len(report.errors), report.errors_truncated), (4, 2, True))
+
+    def test_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, encoding="utf-8") as fh:
+            fh.write("username,raw_score\ns0,25\ns1,60\nnobody,1\n")
+        self.addCleanup(os.remove, fh.name)
+        stdout, stderr = io.StringIO(), io.StringIO()
+
+        call_command("import_grades", self.midterm.id, fh.name, "--chunk-size", "1", stdout=stdout, stderr=stderr)
+
+        self.assertIn("3 rows read: 1 created, 0 updated, 0 unchanged, 0 skipped, 2 errors.", stdout.getvalue())
+        self.assertIn("line 3: Score 60 is outside 0-50", stderr.getvalue())
+        self.assertEqual(CourseGrade.objects.get(student=self.students[0]).total, 20)
+        with self.assertRaises(CommandError):
+            call_command("import_grades", 0, fh.name, stdout=stdout)
@@ -29,5 +29,15 @@ urlpatterns = [
 		views.assessment_grade_manage,
 		name="assessment_grade_manage",
 	),
+	path(
+		"<int:pk>/grades/import/",
+		views.assessment_grade_import,
+		name="assessment_grade_import",
+	),
+	path(
+		"curriculum/<int:curriculum_id>/gradebook/",
+		views.curriculum_gradebook,
+		name="curriculum_gradebook",
+	),
 
 ]
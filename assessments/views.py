@@ -1,37 +1,25 @@
-from decimal import Decimal, InvalidOperation
+import csv
+import io
 
 from django.shortcuts import render, redirect, get_object_or_404
-from django.core.exceptions import PermissionDenied
 from django.forms import modelform_factory
+from django.db import transaction
 
 from accounts.decorators import role_required
+from accounts.permissions import require_curriculum_access
 from accounts.models import CustomUser
 from curriculum.models import Curriculum
+from outcomes.mapping import clean_weight, save_mapping, validate_totals
 from outcomes.models import LearningOutcome
 from .models import (
     Assessment,
     AssessmentLearningOutcome,
     StudentAssessmentResult,
 )
-
-
-def _check_curriculum_permission_for_lecturer(user: CustomUser, curriculum: Curriculum):
-    """
-    Lecturer sadece kendisine atanmış curriculum'lar için assessment yönetebilsin.
-    Admin her şeye girebilir.
-    """
-    if user.is_admin:
-        return
-
-    # Ana lecturer FK kontrolü
-    if getattr(curriculum, "lecturer_id", None) == user.id:
-        return
-
-    # Eğer M2M 'lecturers' alanı varsa, onu da kontrol et
-    if hasattr(curriculum, "lecturers") and curriculum.lecturers.filter(id=user.id).exists():
-        return
-
-    raise PermissionDenied("You are not allowed to manage assessments for this curriculum.")
+from .forms import GradeImportForm
+from . import gradebook
+from .importers import import_grades
+from .services import clean_score, save_results
 
 
 @role_required(CustomUser.Role.LECTURER)
@@ -43,7 +31,7 @@ def assessment_manage(request, curriculum_id):
         Curriculum.objects.select_related("program"),
         id=curriculum_id,
     )
-    _check_curriculum_permission_for_lecturer(request.user, curriculum)
+    require_curriculum_access(request, curriculum)
 
     assessments = curriculum.assessments.all().order_by("date", "name")
 
@@ -77,7 +65,7 @@ def assessment_edit(request, pk):
         pk=pk,
     )
     curriculum = assessment.curriculum
-    _check_curriculum_permission_for_lecturer(request.user, curriculum)
+    require_curriculum_access(request, curriculum)
 
     AssessmentForm = modelform_factory(
         Assessment,
@@ -107,7 +95,7 @@ def assessment_delete(request, pk):
         pk=pk,
     )
     curriculum = assessment.curriculum
-    _check_curriculum_permission_for_lecturer(request.user, curriculum)
+    require_curriculum_access(request, curriculum)
 
     if request.method == "POST":
         assessment.delete()
@@ -132,64 +120,46 @@ def assessment_lo_mapping(request, pk):
         pk=pk,
     )
     curriculum = assessment.curriculum
-    _check_curriculum_permission_for_lecturer(request.user, curriculum)
+    require_curriculum_access(request, curriculum)
 
     los = LearningOutcome.objects.filter(
         curriculum=curriculum
     ).order_by("code")
 
     existing = {
-        m.learning_outcome_id: m
+        (assessment.id, m.learning_outcome_id): m
         for m in assessment.lo_mappings.all()
     }
 
+    errors = []
+    posted = {}
     if request.method == "POST":
+        # Tüm satırlar önce doğrulanır; hata varsa hiçbir şey yazılmaz
+        weights = {}
         for lo in los:
-            field_name = f"lo_{lo.id}"
-            raw_value = request.POST.get(field_name, "").strip()
-
-            # Boş ise → mapping sil
-            if raw_value == "":
-                mapping = existing.get(lo.id)
-                if mapping:
-                    mapping.delete()
-                continue
-
+            posted[lo.id] = request.POST.get(f"lo_{lo.id}", "").strip()
             try:
-                weight = int(raw_value)
-            except ValueError:
-                continue  # invalid input'u ignore
-
-            if weight <= 0:
-                mapping = existing.get(lo.id)
-                if mapping:
-                    mapping.delete()
-                continue
-
-            if weight > 100:
-                weight = 100
-
-            mapping = existing.get(lo.id)
-            if mapping:
-                mapping.weight_in_assessment = weight
-                mapping.save()
-            else:
-                AssessmentLearningOutcome.objects.create(
-                    assessment=assessment,
-                    learning_outcome=lo,
-                    weight_in_assessment=weight,
-                )
-
-        return redirect("assessments:assessment_manage", curriculum_id=curriculum.id)
+                weights[(assessment.id, lo.id)] = clean_weight(posted[lo.id])
+            except ValueError as exc:
+                errors.append(f"{lo.code}: {exc}")
+        if not errors:
+            errors = validate_totals(weights, 100, {assessment.id: assessment.name})
+
+        if not errors:
+            save_mapping(
+                AssessmentLearningOutcome, "assessment", "learning_outcome", "weight_in_assessment",
+                weights, existing, curriculum.id,
+            )
+            return redirect("assessments:assessment_manage", curriculum_id=curriculum.id)
 
-    # GET: template için satır listesi
+    # template için satır listesi (hatalı POST'ta girilen değerler korunur)
     rows = []
     for lo in los:
-        mapping = existing.get(lo.id)
+        mapping = existing.get((assessment.id, lo.id))
         rows.append(
             {
                 "lo": lo,
-                "weight": mapping.weight_in_assessment if mapping else "",
+                "weight": posted.get(lo.id, mapping.weight_in_assessment if mapping else ""),
             }
         )
 
@@ -197,6 +167,7 @@ def assessment_lo_mapping(request, pk):
         "curriculum": curriculum,
         "assessment": assessment,
         "rows": rows,
+        "errors": errors,
     }
     return render(request, "assessments/assessment_lo_mapping.html", context)
 
@@ -212,7 +183,7 @@ def assessment_grade_manage(request, pk):
         pk=pk,
     )
     curriculum = assessment.curriculum
-    _check_curriculum_permission_for_lecturer(request.user, curriculum)
+    require_curriculum_access(request, curriculum)
 
     # Bu dersin öğrencileri
     students = curriculum.students.all().order_by("last_name", "first_name", "username")
@@ -224,7 +195,10 @@ def assessment_grade_manage(request, pk):
     )
     results_by_student = {r.student_id: r for r in existing_results}
 
+    errors = []
+    posted = {}
     if request.method == "POST":
+        scores = {}
         for student in students:
             field_name = f"student_{student.id}"
             raw_value = request.POST.get(field_name, "").strip()
@@ -237,24 +211,26 @@ def assessment_grade_manage(request, pk):
                 #     existing.delete()
                 continue
 
+            posted[student.id] = raw_value
             try:
-                score_val = Decimal(raw_value)
-            except (InvalidOperation, ValueError):
-                # Geçersiz giriş → ignore
-                continue
-
-            # update_or_create: aynı öğrenci+assessment için tek kayıt
-            StudentAssessmentResult.objects.update_or_create(
-                student=student,
-                assessment=assessment,
-                defaults={
-                    "raw_score": score_val,      # 🟩 asıl not
-                },
-            )
+                scores[(assessment.id, student.id)] = clean_score(raw_value, assessment.max_score)
+            except ValueError as exc:
+                # Geçersiz giriş raporlanır; geçerli olanlar yine kaydedilir
+                errors.append(f"{student.username}: {exc}")
+
+        # Tek transaction: yeni kayıtlar bulk_create, değişenler bulk_update
+        save_results(
+            scores,
+            {
+                (assessment.id, student_id): result
+                for student_id, result in results_by_student.items()
+            },
+        )
 
-        return redirect("assessments:assessment_grade_manage", pk=assessment.id)
+        if not errors:
+            return redirect("assessments:assessment_grade_manage", pk=assessment.id)
 
-    # GET: tablo için satırları hazırla
+    # Tablo satırları (hatalı POST'ta girilen değerler korunur)
     rows = []
     for student in students:
         result = results_by_student.get(student.id)
@@ -270,7 +246,7 @@ def assessment_grade_manage(request, pk):
             {
                 "student": student,
                 "result": result,
-                "score": score_value,
+                "score": posted.get(student.id, score_value),
             }
         )
 
@@ -278,5 +254,84 @@ def assessment_grade_manage(request, pk):
         "curriculum": curriculum,
         "assessment": assessment,
         "rows": rows,
+        "errors": errors,
     }
     return render(request, "assessments/assessment_grade_manage.html", context)
+
+
+@role_required(CustomUser.Role.LECTURER)
+def assessment_grade_import(request, pk):
+    """
+    Tek bir assessment için CSV (username, raw_score) dosyasından toplu not
+    yükleme. Dosya satır satır okunur; hatalı satırlar raporlanır.
+    """
+    assessment = get_object_or_404(
+        Assessment.objects.select_related("curriculum", "curriculum__program"),
+        pk=pk,
+    )
+    curriculum = assessment.curriculum
+    require_curriculum_access(request, curriculum)
+
+    report = None
+    if request.method == "POST":
+        form = GradeImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            lines = io.TextIOWrapper(
+                form.cleaned_data["file"].file,
+                encoding="utf-8-sig",
+                newline="",
+            )
+            try:
+                # Dosya yarıda bozuksa yazılan chunk'lar da geri alınır
+                with transaction.atomic():
+                    report = import_grades(assessment, lines)
+            except (UnicodeDecodeError, csv.Error) as exc:
+                form.add_error("file", f"Could not read the file as UTF-8 CSV: {exc}")
+    else:
+        form = GradeImportForm()
+
+    context = {
+        "curriculum": curriculum,
+        "assessment": assessment,
+        "form": form,
+        "report": report,
+    }
+    return render(request, "assessments/assessment_grade_import.html", context)
+
+
+@role_required(CustomUser.Role.LECTURER)
+def curriculum_gradebook(request, curriculum_id):
+    """
+    Dersin tüm assessment'ları için öğrenci × assessment not çizelgesi.
+
+    Notlar tek sorguda yüklenir; kaydederken sadece değişen hücreler tek bir
+    ``save_results`` çağrısıyla yazılır. Geçersiz hücreler raporlanır, geçerli
+    olanlar yine kaydedilir.
+    """
+    curriculum = get_object_or_404(
+        Curriculum.objects.select_related("program"),
+        id=curriculum_id,
+    )
+    require_curriculum_access(request, curriculum)
+
+    assessments = list(curriculum.assessments.all())
+
+    errors = []
+    cells = None
+    if request.method == "POST":
+        cells, error = gradebook.posted_cells(request.POST)
+        scores, errors = gradebook.parse_gradebook(cells, curriculum, assessments)
+        if error:
+            errors.insert(0, error)
+        save_results(*gradebook.changed_cells(curriculum, scores))
+        if not errors:
+            return redirect("assessments:curriculum_gradebook", curriculum_id=curriculum.id)
+
+    context = {
+        "curriculum": curriculum,
+        "assessments": assessments,
+        # Hatalı POST'ta girilen değerler korunur
+        "rows": gradebook.build_gradebook(curriculum, assessments, cells),
+        "errors": errors,
+    }
+    return render(request, "assessments/curriculum_gradebook.html", context)
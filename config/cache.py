@@ -0,0 +1,92 @@
+"""
+Versiyonlu cache anahtarları.
+
+Her varlık (program, curriculum, student) için cache'te bir versiyon sayacı
+tutulur; varlık (ya da parçası sayılan kayıtlar) değişince sayaç commit
+sonrası artırılır (bkz. ``accounts.signals``). Cache'lenen şey anahtarına
+ilgili versiyonları katar, böylece eski girdiler silinmez, sadece bir daha
+okunmaz ve TTL / LRU ile düşer — invalidation için anahtar taraması gerekmez.
+
+Şablon tarafı: view versiyonları context'e koyar, şablon
+``{% cache FRAGMENT_CACHE_TTL <ad> <versiyonlar...> %}`` ile kullanır.
+
+Sayaçlar sadece bütün worker'ların paylaştığı bir cache'te anlamlı
+(``settings.CACHE_IS_SHARED``); locmem'de ``FRAGMENT_CACHE_TTL`` 0'dır ve
+fragment'lar her istekte yeniden render edilir.
+"""
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+PROGRAM = "program"
+CURRICULUM = "curriculum"
+STUDENT = "student"
+# Faculty → Program ağacı gibi tek parça yapılar (id'siz)
+ORGANIZATIONS = "organizations"
+
+VERSION_KEY = "version:{}:{}"
+VERSION_TIMEOUT = None  # sayaçlar süresiz; düşerse yeni başlangıç değeri alınır
+
+
+def version_key(scope, pk=None):
+    return VERSION_KEY.format(scope, "" if pk is None else pk)
+
+
+def _initial_version():
+    # Sayaç cache'ten düşmüşse 1'den başlamak eski bir girdiyle çakışabilir
+    return time.time_ns()
+
+
+def get_versions(*entities):
+    """``(scope, pk)`` çiftleri için versiyonlar, aynı sırada; tek cache okuması."""
+    keys = [version_key(scope, pk) for scope, pk in entities]
+    found = cache.get_many(keys)
+    versions = []
+    for key in keys:
+        if key not in found:
+            cache.add(key, _initial_version(), VERSION_TIMEOUT)
+            found[key] = cache.get(key)
+        versions.append(found[key])
+    return versions
+
+
+def get_version(scope, pk=None):
+    return get_versions((scope, pk))[0]
+
+
+def versioned_key(prefix, *entities):
+    """``prefix`` + verilen varlıkların güncel versiyonları."""
+    parts = [f"{scope}{'' if pk is None else pk}.{version}"
+             for (scope, pk), version in zip(entities, get_versions(*entities))]
+    return ":".join([prefix, *parts])
+
+
+def _bump(keys):
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Hiç okunmamış / düşmüş sayaç: okuyan zaten yeni değerle başlar
+            pass
+
+
+def bump_versions(*entities):
+    """
+    Sayaçları commit sonrası artırır. Transaction içinde hemen artırmak, yeni
+    versiyonla eski verinin cache'lenmesine yol açabilirdi.
+    """
+    keys = {version_key(scope, pk) for scope, pk in entities}
+    if keys:
+        transaction.on_commit(partial(_bump, keys))
+
+
+def bump_version(scope, pk=None):
+    bump_versions((scope, pk))
+
+
+def fragment_cache(request):
+    """Context processor: ``{% cache %}`` fragment'ları için TTL."""
+    return {"FRAGMENT_CACHE_TTL": settings.FRAGMENT_CACHE_TTL}
@@ -0,0 +1,101 @@
+"""
+HTML listeleri için keyset (cursor) sayfalama.
+
+OFFSET'li sayfalama derin sayfalarda atlanan satırları da okur; burada
+sayfa, bir önceki sayfanın son satırının sıralama değerlerinden devam eder
+(``WHERE (a, b) > (x, y) ORDER BY a, b LIMIT n``) ve sıralama indeksiyle
+her sayfa aynı maliyettedir. Cursor, sıralama alanlarının değerlerini
+taşıyan opak (base64 JSON) bir string'dir.
+"""
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = 50
+
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values, default=str).encode()).decode()
+
+
+def decode_cursor(token, model_fields):
+    """
+    Cursor değerlerini sıralama alanlarının tipine çevirir (``Field.clean``).
+    Geçersiz, kurcalanmış ya da yanlış tipli cursor → None (ilk sayfa).
+    """
+    if not token:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token.encode()))
+        if not isinstance(values, list) or len(values) != len(model_fields):
+            return None
+        # None ile karşılaştırma yapılamaz; iç içe liste / dict de geçersiz
+        if any(value is None or isinstance(value, (list, dict)) for value in values):
+            return None
+        return [field.clean(value, None) for field, value in zip(model_fields, values)]
+    except (binascii.Error, UnicodeError, ValueError, TypeError, ValidationError):
+        return None
+
+
+def _after_q(fields, values, reverse=False):
+    """Sözlük sıralamasında ``values``'tan sonra gelen satırlar (a > x OR a = x AND b > y ...)."""
+    lookup = "lt" if reverse else "gt"
+    condition = Q()
+    for index, name in enumerate(fields):
+        step = Q(**{f"{name}__{lookup}": values[index]})
+        for previous, value in zip(fields[:index], values[:index]):
+            step &= Q(**{previous: value})
+        condition |= step
+    return condition
+
+
+@dataclass
+class KeysetPage:
+    items: list
+    next_cursor: str = None
+    previous_cursor: str = None
+
+    @property
+    def has_other_pages(self):
+        return bool(self.next_cursor or self.previous_cursor)
+
+
+def keyset_page(queryset, fields, after=None, before=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    ``fields``: artan sıralama alanları (model attribute'ları), sonuncusu
+    tekil olmalı (örn. ``("username", "id")``).
+    ``after`` / ``before``: bir önceki ``KeysetPage``'in cursor'ları.
+    Satırlar ``page_size + 1`` limitle okunur; fazladan satır sonraki sayfanın varlığını gösterir.
+    """
+    fields = tuple(fields)
+    model_fields = [queryset.model._meta.get_field(name) for name in fields]
+    after_values = decode_cursor(after, model_fields)
+    before_values = None if after_values else decode_cursor(before, model_fields)
+
+    if before_values is not None:
+        rows = list(
+            queryset.filter(_after_q(fields, before_values, reverse=True))
+            .order_by(*(f"-{name}" for name in fields))[:page_size + 1]
+        )
+        has_more_before = len(rows) > page_size
+        items = rows[:page_size][::-1]
+        has_previous, has_next = has_more_before, True
+    else:
+        if after_values is not None:
+            queryset = queryset.filter(_after_q(fields, after_values))
+        rows = list(queryset.order_by(*fields)[:page_size + 1])
+        items = rows[:page_size]
+        has_previous, has_next = after_values is not None, len(rows) > page_size
+
+    def cursor(item):
+        return encode_cursor([getattr(item, name) for name in fields])
+
+    return KeysetPage(
+        items=items,
+        next_cursor=cursor(items[-1]) if items and has_next else None,
+        previous_cursor=cursor(items[0]) if items and has_previous else None,
+    )
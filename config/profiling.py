@@ -0,0 +1,199 @@
+"""
+İstek bazlı profil middleware'i (``LOMS_PROFILING=1`` ile açılır).
+
+Her istek için:
+- toplam süre, SQL sorgu sayısı ve SQL süresi (``connection.execute_wrapper``)
+- şablon render süresi (şablonun tetiklediği lazy sorgular dahil)
+- aynı SQL kalıbının (parametreler hariç) tekrar tekrar çalışması → olası N+1
+
+ölçülür; ``loms.profiling`` logger'ına tek satır JSON yazılır ve cevaba
+``Server-Timing`` header'ı eklenir. URL adı başına son istekler cache'te
+tutulur; özet Student Affairs ekranında gösterilir (bkz. ``summary``).
+"""
+import json
+import logging
+import math
+import re
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.template.backends.django import Template as DjangoBackendTemplate
+from django.utils.functional import SimpleLazyObject, empty
+
+logger = logging.getLogger("loms.profiling")
+
+SAMPLES_KEY = "profiling:samples:{}"
+INDEX_KEY = "profiling:url_names"
+SAMPLE_TTL = 7 * 24 * 3600
+
+_current = ContextVar("loms_profile", default=None)
+
+# Literal'leri ayıklayıp aynı sorgu kalıbını bulmak için
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def normalize_sql(sql):
+    """``WHERE id = 5`` ile ``WHERE id = 7`` aynı kalıba düşer."""
+    return _IN_LISTS.sub("(?)", _LITERALS.sub("?", sql))
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile (``values`` sıralı olmalı)."""
+    if not values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(values)))
+    return values[rank - 1]
+
+
+class RequestProfile:
+    def __init__(self):
+        self.queries = 0
+        self.sql_ms = 0.0
+        self.template_ms = 0.0
+        self.patterns = {}
+
+    def record_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_ms += (time.perf_counter() - started) * 1000
+            self.queries += 1
+            pattern = normalize_sql(sql)
+            self.patterns[pattern] = self.patterns.get(pattern, 0) + 1
+
+    def repeated_queries(self, threshold):
+        return sorted(
+            ({"sql": sql[:300], "count": count} for sql, count in self.patterns.items() if count >= threshold),
+            key=lambda item: -item["count"],
+        )
+
+
+def _timed_render(render):
+    @wraps(render)
+    def wrapper(self, *args, **kwargs):
+        profile = _current.get()
+        if profile is None:
+            return render(self, *args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return render(self, *args, **kwargs)
+        finally:
+            profile.template_ms += (time.perf_counter() - started) * 1000
+    wrapper._loms_profiled = True
+    return wrapper
+
+
+def _instrument_templates():
+    # Backend seviyesindeki render sadece en üst şablon için çağrılır
+    # ({% include %} / {% extends %} içeride kalır) → süre iki kez sayılmaz
+    if not getattr(DjangoBackendTemplate.render, "_loms_profiled", False):
+        DjangoBackendTemplate.render = _timed_render(DjangoBackendTemplate.render)
+
+
+def _user_id(request):
+    # Henüz yüklenmemiş lazy user için log uğruna sorgu atılmaz
+    user = getattr(request, "user", None)
+    if isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+        return None
+    return getattr(user, "pk", None)
+
+
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.slow_ms = _setting("PROFILING_SLOW_REQUEST_MS", 500)
+        self.repeat_threshold = _setting("PROFILING_REPEATED_QUERY_THRESHOLD", 5)
+        self.sample_size = _setting("PROFILING_SAMPLE_SIZE", 200)
+        _instrument_templates()
+
+    def __call__(self, request):
+        profile = RequestProfile()
+        token = _current.set(profile)
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(profile.record_query):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total_ms = (time.perf_counter() - started) * 1000
+
+        match = getattr(request, "resolver_match", None)
+        url_name = (match.view_name if match else None) or "<unresolved>"
+        repeated = profile.repeated_queries(self.repeat_threshold)
+
+        response["Server-Timing"] = ", ".join([
+            f"app;dur={total_ms:.1f}",
+            f'db;dur={profile.sql_ms:.1f};desc="{profile.queries} queries"',
+            f"tpl;dur={profile.template_ms:.1f}",
+        ])
+
+        entry = {
+            "event": "request",
+            "method": request.method,
+            "path": request.path,
+            "url_name": url_name,
+            "status": response.status_code,
+            "ms": round(total_ms, 2),
+            "sql_ms": round(profile.sql_ms, 2),
+            "template_ms": round(profile.template_ms, 2),
+            "queries": profile.queries,
+            "user_id": _user_id(request),
+        }
+        if repeated:
+            entry["repeated_queries"] = repeated
+        level = logging.WARNING if total_ms >= self.slow_ms or repeated else logging.INFO
+        logger.log(level, json.dumps(entry, default=str))
+
+        if match is not None:
+            self._store_sample(url_name, total_ms, profile.queries)
+        return response
+
+    def _store_sample(self, url_name, total_ms, queries):
+        # Kayan pencere; eşzamanlı isteklerde birkaç örnek kaybolabilir (kabul)
+        key = SAMPLES_KEY.format(url_name)
+        samples = cache.get(key) or []
+        samples.append((round(total_ms, 2), queries))
+        cache.set(key, samples[-self.sample_size:], SAMPLE_TTL)
+
+        names = cache.get(INDEX_KEY) or []
+        if url_name not in names:
+            cache.set(INDEX_KEY, names + [url_name], SAMPLE_TTL)
+
+
+def summary():
+    """URL adı başına p50 / p95 süre ve sorgu sayısı; en yavaş p95 önce."""
+    names = cache.get(INDEX_KEY) or []
+    samples_by_name = cache.get_many([SAMPLES_KEY.format(name) for name in names])
+    rows = []
+    for name in names:
+        samples = samples_by_name.get(SAMPLES_KEY.format(name))
+        if not samples:
+            continue
+        timings = sorted(ms for ms, _ in samples)
+        queries = sorted(count for _, count in samples)
+        rows.append({
+            "url_name": name,
+            "requests": len(samples),
+            "p50_ms": percentile(timings, 50),
+            "p95_ms": percentile(timings, 95),
+            "max_ms": timings[-1],
+            "p50_queries": percentile(queries, 50),
+            "max_queries": queries[-1],
+        })
+    rows.sort(key=lambda row: -row["p95_ms"])
+    return rows
+
+
+def reset():
+    names = cache.get(INDEX_KEY) or []
+    cache.delete_many([SAMPLES_KEY.format(name) for name in names] + [INDEX_KEY])
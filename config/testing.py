@@ -0,0 +1,37 @@
+"""
+Test yardımcıları: sıcak view'lar için sorgu bütçesi (query budget).
+
+Örnek:
+    with assert_max_queries(8):
+        self.client.get(url)
+
+Bütçe aşılırsa çalışan tüm SQL'ler hata mesajında listelenir; böylece
+N+1 ya da fazla prefetch gibi gerilemeler CI'da yakalanır.
+"""
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+
+@contextmanager
+def assert_max_queries(limit, using=DEFAULT_DB_ALIAS):
+    with CaptureQueriesContext(connections[using]) as context:
+        yield context
+
+    executed = len(context.captured_queries)
+    if executed > limit:
+        queries = "\n".join(
+            f"{i}. {query['sql']}"
+            for i, query in enumerate(context.captured_queries, start=1)
+        )
+        raise AssertionError(
+            f"{executed} queries executed, budget is {limit}:\n{queries}"
+        )
+
+
+class QueryBudgetMixin:
+    """TestCase mixin'i: ``with self.assertMaxQueries(n): ...``"""
+
+    def assertMaxQueries(self, limit, using=DEFAULT_DB_ALIAS):
+        return assert_max_queries(limit, using=using)
@@ -9,6 +9,7 @@ urlpatterns = [
 	path("curriculum/", include("curriculum.urls", namespace="curriculum")),
 	path("outcomes/", include("outcomes.urls", namespace="outcomes")),
 	path("assessments/", include("assessments.urls")),
+	path("api/", include("api.urls")),
 
     path("", RedirectView.as_view(url="/accounts/login/", permanent=False)),
 ]
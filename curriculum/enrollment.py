@@ -0,0 +1,185 @@
+"""
+Öğrenci ↔ curriculum kayıt (enrollment) senkronizasyonu.
+
+Kural: STUDENT rolündeki kullanıcı, ``student_program`` + ``student_grade``
+ile eşleşen (``program`` + ``year``) tüm derslere kayıtlıdır.
+
+``students.set()`` yerine mevcut kayıtlarla hedef küme karşılaştırılır ve
+sadece eksik satırlar eklenir / fazlalar silinir (through tablosu üzerinden,
+toplu olarak).
+"""
+from functools import partial
+
+from django.db import connection, transaction
+from django.db.models import F, Q
+
+from accounts.dashboard import invalidate_student_dashboards
+from accounts.models import CustomUser
+from .models import Curriculum
+
+USER_ENROLLMENT_FIELDS = ("role", "student_program_id", "student_grade")
+CURRICULUM_ENROLLMENT_FIELDS = ("program_id", "year")
+
+
+def _apply_delta(rows_to_add, removal_qs):
+    """Through tablosuna eksikleri toplu ekler, fazlaları tek DELETE ile siler."""
+    through = Curriculum.students.through
+    with transaction.atomic():
+        if rows_to_add:
+            through.objects.bulk_create(
+                [
+                    through(curriculum_id=curriculum_id, customuser_id=user_id)
+                    for curriculum_id, user_id in rows_to_add
+                ],
+                ignore_conflicts=True,
+            )
+        removal_qs.delete()
+
+
+def sync_student_enrollments(user):
+    """Tek bir kullanıcının kayıtlı olduğu dersleri program + grade'e göre günceller."""
+    through = Curriculum.students.through
+
+    target = set()
+    if (
+        user.role == CustomUser.Role.STUDENT
+        and user.student_program_id
+        and user.student_grade
+    ):
+        target = set(
+            Curriculum.objects.filter(
+                program_id=user.student_program_id,
+                year=user.student_grade,
+            ).values_list("id", flat=True)
+        )
+
+    current = set(
+        through.objects.filter(customuser_id=user.id)
+        .values_list("curriculum_id", flat=True)
+    )
+
+    to_remove = current - target
+    _apply_delta(
+        [(curriculum_id, user.id) for curriculum_id in target - current],
+        through.objects.filter(customuser_id=user.id, curriculum_id__in=to_remove)
+        if to_remove else through.objects.none(),
+    )
+    if target != current:
+        transaction.on_commit(partial(invalidate_student_dashboards, [user.id]))
+
+
+def sync_curriculum_enrollments(curriculum):
+    """Bir dersin öğrenci listesini program + year'a göre günceller."""
+    through = Curriculum.students.through
+
+    target = set()
+    if curriculum.program_id and curriculum.year:
+        target = set(
+            CustomUser.objects.filter(
+                role=CustomUser.Role.STUDENT,
+                student_program_id=curriculum.program_id,
+                student_grade=curriculum.year,
+            ).values_list("id", flat=True)
+        )
+
+    current = set(
+        through.objects.filter(curriculum_id=curriculum.id)
+        .values_list("customuser_id", flat=True)
+    )
+
+    to_remove = current - target
+    _apply_delta(
+        [(curriculum.id, user_id) for user_id in target - current],
+        through.objects.filter(curriculum_id=curriculum.id, customuser_id__in=to_remove)
+        if to_remove else through.objects.none(),
+    )
+    if target != current:
+        transaction.on_commit(partial(invalidate_student_dashboards, target ^ current))
+
+
+def rebuild_enrollments(program_ids, years=None):
+    """
+    Verilen programlardaki (ve ``years`` verilirse sadece o yıllardaki) tüm
+    derslerin öğrenci listelerini set-based olarak yeniden kurar:
+
+    - kuralla artık eşleşmeyen through satırları tek DELETE ile silinir,
+    - eksik satırlar tek INSERT ... SELECT ile eklenir.
+
+    Toplu öğrenci import'u ve sınıf atlatma gibi satır satır save()'in
+    pahalı olduğu işlemler için. (added, removed) döner.
+    """
+    program_ids = list(program_ids)
+    if not program_ids:
+        return 0, 0
+    years = list(years) if years is not None else None
+
+    through = Curriculum.students.through
+
+    scope = Q(curriculum__program_id__in=program_ids)
+    if years is not None:
+        scope &= Q(curriculum__year__in=years)
+
+    stale = through.objects.filter(scope).filter(
+        ~Q(customuser__role=CustomUser.Role.STUDENT)
+        | Q(customuser__student_program_id__isnull=True)
+        | Q(customuser__student_grade__isnull=True)
+        | Q(curriculum__year__isnull=True)
+        | ~Q(customuser__student_program_id=F("curriculum__program_id"))
+        | ~Q(customuser__student_grade=F("curriculum__year"))
+    )
+
+    with transaction.atomic():
+        # Öğrenci panelleri (accounts.dashboard) için etkilenen öğrenciler
+        affected = set(stale.values_list("customuser_id", flat=True))
+        removed, _ = stale.delete()
+        added = _insert_missing_enrollments(program_ids, years)
+        if added:
+            students = CustomUser.objects.filter(role=CustomUser.Role.STUDENT, student_program_id__in=program_ids)
+            if years is not None:
+                students = students.filter(student_grade__in=years)
+            affected.update(students.values_list("id", flat=True))
+        transaction.on_commit(partial(invalidate_student_dashboards, affected))
+
+    return added, removed
+
+
+def _insert_missing_enrollments(program_ids, years):
+    qn = connection.ops.quote_name
+    through = Curriculum.students.through
+    user_meta = CustomUser._meta
+    curriculum_meta = Curriculum._meta
+
+    t_table = qn(through._meta.db_table)
+    t_curriculum = qn(through._meta.get_field("curriculum").column)
+    t_user = qn(through._meta.get_field("customuser").column)
+    c_table = qn(curriculum_meta.db_table)
+    c_program = qn(curriculum_meta.get_field("program").column)
+    c_year = qn(curriculum_meta.get_field("year").column)
+    u_table = qn(user_meta.db_table)
+    u_role = qn(user_meta.get_field("role").column)
+    u_program = qn(user_meta.get_field("student_program").column)
+    u_grade = qn(user_meta.get_field("student_grade").column)
+
+    params = [CustomUser.Role.STUDENT.value, *program_ids]
+    year_clause = ""
+    if years is not None:
+        if not years:
+            return 0
+        year_clause = f" AND c.{c_year} IN ({', '.join(['%s'] * len(years))})"
+        params.extend(years)
+
+    sql = (
+        f"INSERT INTO {t_table} ({t_curriculum}, {t_user}) "
+        f"SELECT c.id, u.id FROM {c_table} c "
+        f"INNER JOIN {u_table} u "
+        f"ON u.{u_program} = c.{c_program} AND u.{u_grade} = c.{c_year} "
+        f"WHERE u.{u_role} = %s "
+        f"AND c.{c_program} IN ({', '.join(['%s'] * len(program_ids))})"
+        f"{year_clause} "
+        f"AND NOT EXISTS ("
+        f"SELECT 1 FROM {t_table} x "
+        f"WHERE x.{t_curriculum} = c.id AND x.{t_user} = u.id)"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
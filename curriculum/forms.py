@@ -1,6 +1,8 @@
 from django import forms
+from django.db.models import Exists, OuterRef, Q
 from .models import Curriculum
 from accounts.models import CustomUser
+from organizations.models import Program
 
 
 class CurriculumForm(forms.ModelForm):
@@ -26,3 +28,44 @@ class CurriculumForm(forms.ModelForm):
             role=CustomUser.Role.LECTURER
         )
         self.fields["lecturer"].required = False
+
+
+class CurriculumFilterForm(forms.Form):
+    program = forms.ModelChoiceField(queryset=Program.objects.order_by("code"), required=False)
+    year = forms.TypedChoiceField(
+        choices=[("", "All years")] + Curriculum.Year.choices,
+        coerce=int,
+        empty_value=None,
+        required=False,
+    )
+    semester = forms.ChoiceField(
+        choices=[("", "All semesters")] + Curriculum.Semester.choices,
+        required=False,
+    )
+    lecturer = forms.ModelChoiceField(
+        queryset=CustomUser.objects.filter(role=CustomUser.Role.LECTURER).order_by("username").only("id", "username"),
+        required=False,
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["lecturer"].label_from_instance = lambda user: user.username
+
+    def filter(self, queryset):
+        """Geçerli filtreleri SQL'e çevirir; form geçersizse queryset olduğu gibi döner."""
+        if not self.is_valid():
+            return queryset
+        data = self.cleaned_data
+        if data["program"]:
+            queryset = queryset.filter(program=data["program"])
+        if data["year"]:
+            queryset = queryset.filter(year=data["year"])
+        if data["semester"]:
+            queryset = queryset.filter(semester=data["semester"])
+        if data["lecturer"]:
+            # Ana lecturer ya da lecturer_curricula ataması; M2M join'i satır çoğaltmasın diye EXISTS
+            assigned = CustomUser.lecturer_curricula.through.objects.filter(
+                curriculum_id=OuterRef("pk"), customuser_id=data["lecturer"].pk,
+            )
+            queryset = queryset.filter(Q(lecturer=data["lecturer"]) | Q(Exists(assigned)))
+        return queryset
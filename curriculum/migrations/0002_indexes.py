@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('curriculum', '0001_initial'),
+        ('organizations', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='curriculum',
+            unique_together=set(),
+        ),
+        migrations.AddIndex(
+            model_name='curriculum',
+            index=models.Index(fields=['program', 'year'], name='curriculum_program_year_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='curriculum',
+            constraint=models.UniqueConstraint(fields=('program', 'code'), name='curriculum_program_code_uniq'),
+        ),
+    ]
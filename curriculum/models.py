@@ -1,9 +1,13 @@
 from django.db import models
 from django.conf import settings
+from accounts.tracking import TrackedFieldsMixin
 from organizations.models import Program
 
 
-class Curriculum(models.Model):
+class Curriculum(TrackedFieldsMixin, models.Model):
+    # Enrollment'ı etkileyen alanlar; sadece bunlar değişince senkronize edilir
+    tracked_fields = ("program_id", "year")
+
     class Year(models.IntegerChoices):
         YEAR_1 = 1, "1st Year"
         YEAR_2 = 2, "2nd Year"
@@ -74,8 +78,16 @@ class Curriculum(models.Model):
         help_text="Bu derse kayıtlı öğrenciler (otomatik atanır).",
     )
 
+    updated_at = models.DateTimeField(auto_now=True)
+
     class Meta:
-        unique_together = ("program", "code")
+        constraints = [
+            models.UniqueConstraint(fields=["program", "code"], name="curriculum_program_code_uniq"),
+        ]
+        indexes = [
+            # Enrollment kuralı ve öğrenci paneli: program + sınıf
+            models.Index(fields=["program", "year"], name="curriculum_program_year_idx"),
+        ]
         ordering = ["program", "year", "semester", "code"]
 
     def __str__(self):
@@ -87,16 +99,13 @@ class Curriculum(models.Model):
         - o programda okuyan
         - o grade'de olan
         tüm öğrencileri otomatik olarak bu derse ekler.
+        Sadece yeni derste ya da program / year değiştiğinde çalışır;
+        açıklama, ECTS vb. değişiklikler enrollment'a dokunmaz.
         """
+        enrollment_changed = self.has_tracked_changes("program_id", "year")
         super().save(*args, **kwargs)
 
-        # year ve program tanımlıysa → auto-enroll
-        if self.year and self.program_id:
-            from accounts.models import CustomUser  # local import, circular'ı önler
+        if enrollment_changed:
+            from .enrollment import sync_curriculum_enrollments  # local import, circular'ı önler
 
-            qs = CustomUser.objects.filter(
-                role=CustomUser.Role.STUDENT,
-                student_grade=self.year,
-                student_program=self.program,
-            )
-            self.students.set(qs)
+            sync_curriculum_enrollments(self)
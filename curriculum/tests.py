@@ -1,3 +1,129 @@
+from decimal import Decimal
+
 from django.test import TestCase
+from django.urls import reverse
+
+from accounts.models import CustomUser
+from assessments.models import Assessment, AssessmentLearningOutcome, StudentAssessmentResult
+from organizations.models import Faculty, Program
+from outcomes.models import LearningOutcome
+from .models import Curriculum
+
+
+class CurriculumListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        faculty = Faculty.objects.create(code="ENG", name="Engineering")
+        cls.program = Program.objects.create(code="CENG", name="Computer Eng.", faculty=faculty)
+        cls.affairs = CustomUser.objects.create_user("affairs", role=CustomUser.Role.STUDENT_AFFAIRS)
+        cls.lecturer = CustomUser.objects.create_user("lecturer", role=CustomUser.Role.LECTURER)
+        students = [
+            CustomUser.objects.create_user(
+                f"s{i}", role=CustomUser.Role.STUDENT, student_program=cls.program, student_grade=1,
+            )
+            for i in range(2)
+        ]
+        cls.curriculum = Curriculum.objects.create(program=cls.program, code="CENG101", name="Intro", year=1)
+        for i in range(2):
+            LearningOutcome.objects.create(curriculum=cls.curriculum, code=f"LO{i}", short_title="LO")
+        for i in range(3):
+            assessment = Assessment.objects.create(
+                curriculum=cls.curriculum, name=f"A{i}", weight_in_course=30, max_score=100,
+            )
+            for student in students:
+                StudentAssessmentResult.objects.create(
+                    assessment=assessment, student=student, raw_score=None if i == 2 else Decimal("60"),
+                )
+
+    def setUp(self):
+        self.client.force_login(self.affairs)
+
+    def _get(self, **params):
+        return self.client.get(reverse("curriculum:curriculum_list"), params)
+
+    def test_counts_do_not_multiply_each_other(self):
+        row = self._get(program=self.program.id).context["page"][0]
+        self.assertEqual(
+            (row.student_count, row.assessment_count, row.learning_outcome_count, row.graded_result_count),
+            (2, 3, 2, 4),
+        )
+
+    def test_graded_count_skips_students_no_longer_enrolled(self):
+        # Sınıfı değişen öğrencinin eski notu lecturer paneliyle aynı şekilde sayılmaz
+        moved = CustomUser.objects.get(username="s0")
+        moved.student_grade = 2
+        moved.save()
+
+        row = self._get(program=self.program.id).context["page"][0]
+        self.assertEqual((row.student_count, row.graded_result_count), (1, 2))
+
+    def test_query_count_does_not_grow_with_curricula(self):
+        # session + user + filtre formunun iki listesi + count + sayfa
+        with self.assertNumQueries(6):
+            self._get()
+        for i in range(5):
+            Curriculum.objects.create(program=self.program, code=f"CENG2{i}", name="More", year=2, lecturer=self.lecturer)
+        with self.assertNumQueries(6):
+            self._get()
+
+    def test_filters_run_in_sql(self):
+        Curriculum.objects.create(program=self.program, code="CENG201", name="Data", year=2, semester="SPRING")
+        self.lecturer.lecturer_curricula.add(self.curriculum)
+
+        self.assertEqual([c.code for c in self._get(year=2).context["page"]], ["CENG201"])
+        self.assertEqual([c.code for c in self._get(semester="FALL").context["page"]], ["CENG101"])
+        # lecturer_curricula ataması da sayılır, satır çoğalmaz
+        self.assertEqual([c.code for c in self._get(lecturer=self.lecturer.id).context["page"]], ["CENG101"])
+
+
+class LecturerDashboardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        faculty = Faculty.objects.create(code="ENG", name="Engineering")
+        cls.program = Program.objects.create(code="CENG", name="Computer Eng.", faculty=faculty)
+        cls.lecturer = CustomUser.objects.create_user("lecturer", role=CustomUser.Role.LECTURER)
+        students = [
+            CustomUser.objects.create_user(
+                f"s{i}", role=CustomUser.Role.STUDENT, student_program=cls.program, student_grade=1,
+            )
+            for i in range(3)
+        ]
+        outsider = CustomUser.objects.create_user(
+            "outsider", role=CustomUser.Role.STUDENT, student_program=cls.program, student_grade=2,
+        )
+        cls.curriculum = Curriculum.objects.create(
+            program=cls.program, code="CENG101", name="Intro", year=1, lecturer=cls.lecturer,
+        )
+        lo = LearningOutcome.objects.create(curriculum=cls.curriculum, code="LO1", short_title="LO")
+        cls.midterm = Assessment.objects.create(
+            curriculum=cls.curriculum, name="Midterm", weight_in_course=40, max_score=50,
+        )
+        AssessmentLearningOutcome.objects.create(assessment=cls.midterm, learning_outcome=lo, weight_in_assessment=60)
+        for student, score in zip(students[:2] + [outsider], ("40", "30", "10")):
+            StudentAssessmentResult.objects.create(assessment=cls.midterm, student=student, raw_score=Decimal(score))
+        StudentAssessmentResult.objects.create(assessment=cls.midterm, student=students[2], raw_score=None)
+
+    def setUp(self):
+        self.client.force_login(self.lecturer)
+
+    def _get(self):
+        return self.client.get(reverse("curriculum:lecturer_dashboard")).context["curricula"]
+
+    def test_progress_counts_only_enrolled_graded_students(self):
+        curriculum = self._get()[0]
+        row = curriculum.progress_rows[0]
+        self.assertEqual((curriculum.student_count, row["graded"], row["remaining"]), (3, 2, 1))
+        self.assertAlmostEqual(row["average"], 35.0)
+        self.assertAlmostEqual(row["average_percent"], 70.0)
+        self.assertEqual((row["lo_weight"], row["lo_complete"]), (60, False))
 
-# Create your tests here.
+    def test_query_count_does_not_grow_with_courses(self):
+        # session + user + dersler + 4 aggregate
+        with self.assertNumQueries(7):
+            self._get()
+        for i in range(4):
+            curriculum = Curriculum.objects.create(program=self.program, code=f"CENG2{i}", name="More", year=1)
+            self.lecturer.lecturer_curricula.add(curriculum)
+            Assessment.objects.create(curriculum=curriculum, name="Final", weight_in_course=60, max_score=100)
+        with self.assertNumQueries(7):
+            self.assertEqual(len(self._get()), 5)
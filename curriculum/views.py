@@ -1,25 +1,66 @@
+from django.core.paginator import Paginator
 from django.shortcuts import render, redirect, get_object_or_404
-from django.db.models import Q
+from django.db.models import Count, Exists, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from accounts.decorators import role_required
 from accounts.models import CustomUser
+from assessments.models import Assessment
+from assessments.progress import enrolled_graded_results, grading_progress
 from organizations.models import Program
+from outcomes.models import LearningOutcome
 from .models import Curriculum
-from .forms import CurriculumForm
+from .forms import CurriculumFilterForm, CurriculumForm
+
+
+CURRICULUM_LIST_PAGE_SIZE = 50
+
+
+def _count(queryset, outer_field="curriculum"):
+    """
+    Ders başına satır sayısı, korelasyonlu alt sorgu olarak. Aynı sorguda
+    birden fazla ``Count`` join'i satırları çarpardı (öğrenci × assessment × LO).
+    """
+    counts = (
+        queryset.filter(**{outer_field: OuterRef("pk")})
+        .order_by()
+        .values(outer_field)
+        .annotate(n=Count("*"))
+        .values("n")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def annotate_counts(queryset):
+    return queryset.annotate(
+        student_count=_count(Curriculum.students.through.objects.all()),
+        assessment_count=_count(Assessment.objects.all()),
+        learning_outcome_count=_count(LearningOutcome.objects.all()),
+        graded_result_count=_count(enrolled_graded_results(), "assessment__curriculum"),
+    )
 
 
 @role_required(CustomUser.Role.STUDENT_AFFAIRS)
 def curriculum_list(request):
-    program_id = request.GET.get("program")
-    if program_id:
-        program = get_object_or_404(Program, id=program_id)
-        curricula = Curriculum.objects.filter(program=program).select_related("program")
-    else:
-        program = None
-        curricula = Curriculum.objects.select_related("program").all()
+    """
+    Student Affairs ders listesi: program / yıl / dönem / lecturer filtreleri
+    SQL'de, sayfa başına tek sorgu (sayılar alt sorgularla) + toplam sayısı.
+    """
+    filter_form = CurriculumFilterForm(request.GET)
+    curricula = annotate_counts(
+        filter_form.filter(Curriculum.objects.select_related("program", "lecturer"))
+        .order_by("program__code", "year", "semester", "code", "id")
+    )
+    page = Paginator(curricula, CURRICULUM_LIST_PAGE_SIZE).get_page(request.GET.get("page"))
+
+    # Sayfa linkleri mevcut filtreleri korur
+    params = request.GET.copy()
+    params.pop("page", None)
 
     context = {
-        "curricula": curricula,
-        "selected_program": program,
+        "filter_form": filter_form,
+        "page": page,
+        "filter_query": params.urlencode(),
+        "selected_program": filter_form.cleaned_data.get("program") if filter_form.is_valid() else None,
     }
     return render(request, "curriculum/curriculum_list.html", context)
 
@@ -83,18 +124,20 @@ def curriculum_delete(request, pk):
 @role_required(CustomUser.Role.LECTURER)
 def lecturer_dashboard(request):
     """
-    Lecturer kendi sorumlu olduğu Curriculum'ları görsün.
+    Lecturer kendi sorumlu olduğu Curriculum'ları ve her birinde assessment
+    bazında not girişi ilerlemesini görsün (bkz. ``assessments.progress``).
     """
     user = request.user
-    curricula = (
-        Curriculum.objects.filter(
-            Q(lecturer=user) | Q(id__in=user.lecturer_curricula.values("id"))
-        )
+    # lecturer_curricula ataması EXISTS ile; OR + join + distinct gerekmez
+    assigned = CustomUser.lecturer_curricula.through.objects.filter(
+        curriculum_id=OuterRef("pk"), customuser_id=user.pk,
+    )
+    curricula = list(
+        Curriculum.objects.filter(Q(lecturer=user) | Q(Exists(assigned)))
         .select_related("program")
-        .distinct()
     )
 
     context = {
-        "curricula": curricula,
+        "curricula": grading_progress(curricula),
     }
     return render(request, "curriculum/lecturer_dashboard.html", context)
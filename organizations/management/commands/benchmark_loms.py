@@ -0,0 +1,274 @@
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from assessments.models import Assessment, StudentAssessmentResult
+from config.profiling import percentile
+from curriculum.models import Curriculum
+from organizations.models import Faculty, Program
+
+
+class Scenario:
+    def __init__(self, name, user, url, method="get", data=None):
+        self.name = name
+        self.user = user
+        self.url = url
+        self.method = method
+        self.data = data
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the main LOMS views through the test client against the current "
+        "database and write latency percentiles and query counts to a JSON file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("-n", "--iterations", type=int, default=20, help="Measured requests per scenario.")
+        parser.add_argument("--warmup", type=int, default=2, help="Unmeasured requests per scenario.")
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            default=[],
+            help="Only run the named scenario (repeatable).",
+        )
+        parser.add_argument("--label", default="", help="Free text stored in the report (e.g. commit id).")
+        parser.add_argument(
+            "-o", "--output",
+            default="loms-benchmark.json",
+            help="Report path ('-' for stdout).",
+        )
+        parser.add_argument("--compare", help="Previous report to print p50 / query deltas against.")
+        parser.add_argument(
+            "--explain",
+            action="store_true",
+            help="Store the database query plan of every distinct SELECT a scenario runs.",
+        )
+
+    def handle(self, *args, **options):
+        scenarios = self._build_scenarios()
+        if options["scenario"]:
+            unknown = set(options["scenario"]) - {scenario.name for scenario in scenarios}
+            if unknown:
+                raise CommandError(f"Unknown scenario(s): {', '.join(sorted(unknown))}.")
+            scenarios = [scenario for scenario in scenarios if scenario.name in options["scenario"]]
+        if not scenarios:
+            raise CommandError("Nothing to benchmark; run 'manage.py seed_loms' first.")
+
+        results = {}
+        # Test client 'testserver' host'u ile gelir
+        with override_settings(ALLOWED_HOSTS=["*"]):
+            for scenario in scenarios:
+                results[scenario.name] = self._run(scenario, options["warmup"], options["iterations"])
+                if options["explain"]:
+                    results[scenario.name]["explain"] = self._explain(scenario)
+                self._print_row(scenario.name, results[scenario.name])
+
+        report = {
+            "label": options["label"],
+            "created_at": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "iterations": options["iterations"],
+            "dataset": {
+                "students": CustomUser.objects.filter(role=CustomUser.Role.STUDENT).count(),
+                "curricula": Curriculum.objects.count(),
+                "assessments": Assessment.objects.count(),
+                "results": StudentAssessmentResult.objects.count(),
+            },
+            "scenarios": results,
+        }
+
+        payload = json.dumps(report, indent=2)
+        if options["output"] == "-":
+            self.stdout.write(payload)
+        else:
+            with open(options["output"], "w", encoding="utf-8") as fh:
+                fh.write(payload)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}."))
+
+        if options["compare"]:
+            self._compare(options["compare"], results)
+
+    # --- senaryolar -----------------------------------------------------------
+
+    def _build_scenarios(self):
+        """Her senaryo için veri setindeki en 'ağır' temsili kullanıcı / nesne seçilir."""
+        scenarios = []
+
+        affairs = CustomUser.objects.filter(role=CustomUser.Role.STUDENT_AFFAIRS).order_by("id").first()
+        if affairs:
+            scenarios.append(Scenario("faculty_program_list", affairs, reverse("organizations:faculty_program_list")))
+            scenarios.append(Scenario("curriculum_list", affairs, reverse("curriculum:curriculum_list")))
+
+        faculty = (
+            Faculty.objects.filter(responsible__isnull=False)
+            .annotate(program_count=Count("programs"))
+            .order_by("-program_count", "id")
+            .select_related("responsible")
+            .first()
+        )
+        if faculty:
+            member = faculty.responsible
+            scenarios.append(Scenario(
+                "faculty_member_dashboard", member, reverse("organizations:faculty_member_dashboard"),
+            ))
+            program = (
+                Program.objects.filter(faculty=faculty)
+                .annotate(student_count=Count("students"))
+                .order_by("-student_count", "id")
+                .first()
+            )
+            if program:
+                scenarios.append(Scenario(
+                    "program_outcome_manage", member,
+                    reverse("outcomes:program_outcome_manage", args=[program.id]),
+                ))
+                scenarios.append(Scenario(
+                    "program_attainment_report", member,
+                    reverse("outcomes:program_attainment_report", args=[program.id]),
+                ))
+
+        curriculum = (
+            Curriculum.objects.filter(lecturer__isnull=False)
+            .annotate(student_count=Count("students"))
+            .order_by("-student_count", "id")
+            .select_related("lecturer")
+            .first()
+        )
+        if curriculum:
+            lecturer = curriculum.lecturer
+            scenarios.append(Scenario("lecturer_dashboard", lecturer, reverse("curriculum:lecturer_dashboard")))
+            scenarios.append(Scenario(
+                "assessment_manage", lecturer,
+                reverse("assessments:assessment_manage", args=[curriculum.id]),
+            ))
+            scenarios.append(Scenario(
+                "learning_outcome_manage", lecturer,
+                reverse("outcomes:learning_outcome_manage", args=[curriculum.id]),
+            ))
+            scenarios.append(Scenario(
+                "curriculum_gradebook", lecturer,
+                reverse("assessments:curriculum_gradebook", args=[curriculum.id]),
+            ))
+
+            assessment = curriculum.assessments.order_by("id").first()
+            if assessment:
+                url = reverse("assessments:assessment_grade_manage", args=[assessment.pk])
+                scenarios.append(Scenario("assessment_grade_manage", lecturer, url))
+                # Mevcut notlar aynen geri gönderilir → kaydetme yolu ölçülür, veri değişmez
+                data = {
+                    f"student_{student_id}": "" if score is None else str(score)
+                    for student_id, score in assessment.results.values_list("student_id", "raw_score")
+                }
+                scenarios.append(Scenario("assessment_grade_save", lecturer, url, method="post", data=data))
+
+            student = curriculum.students.order_by("id").first()
+            if student:
+                scenarios.append(Scenario("student_dashboard", student, reverse("accounts:student_dashboard")))
+                scenarios.append(Scenario(
+                    "student_course_detail", student,
+                    reverse("accounts:student_course_detail", args=[curriculum.id]),
+                ))
+
+        return scenarios
+
+    # --- ölçüm ----------------------------------------------------------------
+
+    def _run(self, scenario, warmup, iterations):
+        client = Client()
+        client.force_login(scenario.user)
+        request = getattr(client, scenario.method)
+
+        for _ in range(warmup):
+            request(scenario.url, scenario.data)
+
+        timings = []
+        query_counts = []
+        status_codes = set()
+        for _ in range(iterations):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = request(scenario.url, scenario.data)
+                timings.append((time.perf_counter() - started) * 1000)
+            query_counts.append(len(queries))
+            status_codes.add(response.status_code)
+
+        timings.sort()
+        return {
+            "url": scenario.url,
+            "method": scenario.method.upper(),
+            "user": scenario.user.username,
+            "status": sorted(status_codes),
+            "ms": {
+                "min": round(timings[0], 2),
+                "p50": round(percentile(timings, 50), 2),
+                "p95": round(percentile(timings, 95), 2),
+                "p99": round(percentile(timings, 99), 2),
+                "max": round(timings[-1], 2),
+                "mean": round(statistics.fmean(timings), 2),
+            },
+            "queries": {
+                "min": min(query_counts),
+                "max": max(query_counts),
+                "median": statistics.median(query_counts),
+            },
+        }
+
+    def _explain(self, scenario):
+        """Senaryonun bir isteğindeki SELECT'lerin planı (index kullanımı kontrolü için)."""
+        client = Client()
+        client.force_login(scenario.user)
+        with CaptureQueriesContext(connection) as queries:
+            getattr(client, scenario.method)(scenario.url, scenario.data)
+
+        prefix = "EXPLAIN QUERY PLAN " if connection.vendor == "sqlite" else "EXPLAIN "
+        plans = []
+        seen = set()
+        for query in queries.captured_queries:
+            sql = query["sql"]
+            if not sql.lstrip().upper().startswith("SELECT") or sql in seen:
+                continue
+            seen.add(sql)
+            with connection.cursor() as cursor:
+                cursor.execute(prefix + sql)
+                plan = [" ".join(str(column) for column in row) for row in cursor.fetchall()]
+            plans.append({"sql": sql, "plan": plan})
+        return plans
+
+    def _print_row(self, name, result):
+        ms = result["ms"]
+        line = (
+            f"{name:<28} p50 {ms['p50']:>8.1f} ms  p95 {ms['p95']:>8.1f} ms  "
+            f"queries {result['queries']['max']:>4}  status {result['status']}"
+        )
+        if result["status"] != [200] and result["status"] != [302]:
+            line = self.style.WARNING(line)
+        self.stdout.write(line)
+
+    def _compare(self, path, results):
+        try:
+            with open(path, encoding="utf-8") as fh:
+                baseline = json.load(fh)["scenarios"]
+        except (OSError, ValueError, KeyError) as exc:
+            raise CommandError(f"Cannot read baseline report {path}: {exc}")
+
+        self.stdout.write(f"\nCompared with {path}:")
+        for name, result in results.items():
+            before = baseline.get(name)
+            if before is None:
+                continue
+            old_p50, new_p50 = before["ms"]["p50"], result["ms"]["p50"]
+            change = (new_p50 - old_p50) / old_p50 * 100 if old_p50 else 0.0
+            self.stdout.write(
+                f"{name:<28} p50 {old_p50:>8.1f} → {new_p50:>8.1f} ms ({change:+.0f}%)  "
+                f"queries {before['queries']['max']} → {result['queries']['max']}"
+            )
@@ -0,0 +1,263 @@
+import random
+import time
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from accounts.models import CustomUser
+from assessments.grades import refresh_course_grades
+from assessments.models import Assessment, AssessmentLearningOutcome, StudentAssessmentResult
+from curriculum.enrollment import rebuild_enrollments
+from curriculum.models import Curriculum
+from organizations.models import Faculty, Program
+from outcomes.attainment import refresh_program_attainment
+from outcomes.models import LearningOutcome, LearningOutcomeProgramOutcome, ProgramOutcome
+
+BATCH_SIZE = 2000
+TERMS = (Curriculum.Semester.FALL, Curriculum.Semester.SPRING)
+ASSESSMENT_PLAN = (
+    # (name, type, weight_in_course)
+    ("Midterm", Assessment.AssessmentType.MIDTERM, 30),
+    ("Final", Assessment.AssessmentType.FINAL, 40),
+    ("Project", Assessment.AssessmentType.PROJECT, 20),
+    ("Quiz", Assessment.AssessmentType.QUIZ, 10),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic LOMS dataset (faculties, programs, curricula, outcomes, "
+        "mappings, students and grades) with bulk inserts. Meant for benchmarks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--prefix", default="SEED", help="Code / username prefix of the generated rows.")
+        parser.add_argument("--faculties", type=int, default=3)
+        parser.add_argument("--programs", type=int, default=3, help="Programs per faculty.")
+        parser.add_argument("--courses", type=int, default=3, help="Curricula per program, year and semester.")
+        parser.add_argument("--students", type=int, default=250, help="Students per program and grade.")
+        parser.add_argument("--lecturers", type=int, default=6, help="Lecturers per program.")
+        parser.add_argument("--pos", type=int, default=8, help="Program outcomes per program.")
+        parser.add_argument("--los", type=int, default=4, help="Learning outcomes per curriculum.")
+        parser.add_argument(
+            "--assessments",
+            type=int,
+            default=3,
+            choices=range(1, len(ASSESSMENT_PLAN) + 1),
+            help="Assessments per curriculum.",
+        )
+        parser.add_argument("--password", default="loms", help="Password of every generated user.")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed (same seed → same dataset).")
+        parser.add_argument(
+            "--skip-attainment",
+            action="store_true",
+            help="Do not materialize LO/PO attainment after seeding.",
+        )
+
+    def handle(self, *args, **options):
+        prefix = options["prefix"].upper()
+        if Faculty.objects.filter(code__startswith=f"{prefix}-").exists():
+            raise CommandError(f"Dataset '{prefix}' already exists; use another --prefix.")
+
+        self.rng = random.Random(options["seed"])
+        self.prefix = prefix
+        self.username_prefix = prefix.lower()
+        # Hash bir kez hesaplanır; tüm kullanıcılar aynı şifreyi paylaşır
+        self.password_hash = make_password(options["password"])
+        started = time.perf_counter()
+
+        with transaction.atomic():
+            programs = self._create_organizations(options)
+            curricula = self._create_curricula(programs, options)
+            students = self._create_students(programs, options)
+            added, _ = rebuild_enrollments([program.id for program in programs])
+            los_by_curriculum = self._create_outcomes(programs, curricula, options)
+            assessments = self._create_assessments(curricula, los_by_curriculum, options)
+            results = self._create_results(curricula, assessments, students)
+            refresh_course_grades(dict.fromkeys(curriculum.id for curriculum in curricula))
+
+        if not options["skip_attainment"]:
+            for program in programs:
+                refresh_program_attainment(program.id)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded '{prefix}' in {time.perf_counter() - started:.1f}s: "
+            f"{len(programs)} programs, {len(curricula)} curricula, "
+            f"{sum(len(ids) for ids in students.values())} students, {added} enrollments, "
+            f"{len(assessments)} assessments, {results} results."
+        ))
+        self.stdout.write(
+            f"Users: {self.username_prefix}_sa (Student Affairs), {self.username_prefix}_fm1.. "
+            f"(Faculty Member), {self.username_prefix}_lec1.. (Lecturer), "
+            f"{self.username_prefix}_s000001.. (Student); password '{options['password']}'."
+        )
+
+    def _user(self, username, role, **fields):
+        return CustomUser(
+            username=f"{self.username_prefix}_{username}",
+            password=self.password_hash,
+            role=role,
+            first_name=username.title(),
+            last_name=self.prefix.title(),
+            **fields,
+        )
+
+    def _create_organizations(self, options):
+        CustomUser.objects.bulk_create([self._user("sa", CustomUser.Role.STUDENT_AFFAIRS)])
+
+        members = CustomUser.objects.bulk_create([
+            self._user(f"fm{i}", CustomUser.Role.FACULTY_MEMBER)
+            for i in range(1, options["faculties"] + 1)
+        ])
+        faculties = Faculty.objects.bulk_create([
+            Faculty(code=f"{self.prefix}-F{i}", name=f"{self.prefix} Faculty {i}", responsible=member)
+            for i, member in enumerate(members, start=1)
+        ])
+        for faculty, member in zip(faculties, members):
+            member.faculty_member_faculty = faculty
+        CustomUser.objects.bulk_update(members, ["faculty_member_faculty"])
+
+        return Program.objects.bulk_create([
+            Program(
+                code=f"{self.prefix}-F{f}P{p}",
+                name=f"{self.prefix} Program {f}.{p}",
+                faculty=faculty,
+            )
+            for f, faculty in enumerate(faculties, start=1)
+            for p in range(1, options["programs"] + 1)
+        ])
+
+    def _create_curricula(self, programs, options):
+        lecturer_count = max(1, options["lecturers"])
+        lecturers = CustomUser.objects.bulk_create([
+            self._user(f"lec{n}", CustomUser.Role.LECTURER)
+            for n in range(1, lecturer_count * len(programs) + 1)
+        ], batch_size=BATCH_SIZE)
+
+        curricula = []
+        for index, program in enumerate(programs):
+            program_lecturers = lecturers[index * lecturer_count:(index + 1) * lecturer_count]
+            number = 0
+            for year in Curriculum.Year.values:
+                for semester in TERMS:
+                    for _ in range(options["courses"]):
+                        number += 1
+                        curricula.append(Curriculum(
+                            program=program,
+                            code=f"{program.code}-{year}{number:02d}",
+                            name=f"Course {year}{number:02d}",
+                            year=year,
+                            semester=semester,
+                            ects=Decimal(self.rng.choice((4, 5, 6, 7))),
+                            lecturer=program_lecturers[number % lecturer_count],
+                        ))
+        # bulk_create → save() içindeki enrollment senkronizasyonu atlanır,
+        # enrollment en sonda tek rebuild ile kurulur
+        return Curriculum.objects.bulk_create(curricula, batch_size=BATCH_SIZE)
+
+    def _create_students(self, programs, options):
+        users = []
+        for program in programs:
+            for grade in Curriculum.Year.values:
+                for _ in range(options["students"]):
+                    users.append(self._user(
+                        f"s{len(users) + 1:06d}",
+                        CustomUser.Role.STUDENT,
+                        student_program=program,
+                        student_faculty_id=program.faculty_id,
+                        student_grade=grade,
+                    ))
+        CustomUser.objects.bulk_create(users, batch_size=BATCH_SIZE)
+
+        # (program_id, grade) → [(student_id, yetenek)] — notlar yeteneğe göre dağılır
+        students = {}
+        for user in users:
+            students.setdefault((user.student_program_id, user.student_grade), []).append(
+                (user.id, min(0.98, max(0.2, self.rng.gauss(0.68, 0.14))))
+            )
+        return students
+
+    def _create_outcomes(self, programs, curricula, options):
+        pos = ProgramOutcome.objects.bulk_create([
+            ProgramOutcome(program=program, code=f"PO{i}", short_title=f"Program outcome {i}", order=i)
+            for program in programs
+            for i in range(1, options["pos"] + 1)
+        ], batch_size=BATCH_SIZE)
+        pos_by_program = {}
+        for po in pos:
+            pos_by_program.setdefault(po.program_id, []).append(po)
+
+        los = LearningOutcome.objects.bulk_create([
+            LearningOutcome(curriculum=curriculum, code=f"LO{i}", short_title=f"Learning outcome {i}", order=i)
+            for curriculum in curricula
+            for i in range(1, options["los"] + 1)
+        ], batch_size=BATCH_SIZE)
+
+        program_by_curriculum = {curriculum.id: curriculum.program_id for curriculum in curricula}
+        los_by_curriculum = {}
+        mappings = []
+        for lo in los:
+            los_by_curriculum.setdefault(lo.curriculum_id, []).append(lo)
+            program_pos = pos_by_program.get(program_by_curriculum[lo.curriculum_id], [])
+            for po in self.rng.sample(program_pos, min(len(program_pos), 2)):
+                mappings.append(LearningOutcomeProgramOutcome(
+                    learning_outcome=lo,
+                    program_outcome=po,
+                    weight=self.rng.choice((20, 40, 60, 80, 100)),
+                ))
+        LearningOutcomeProgramOutcome.objects.bulk_create(mappings, batch_size=BATCH_SIZE)
+        return los_by_curriculum
+
+    def _create_assessments(self, curricula, los_by_curriculum, options):
+        plan = ASSESSMENT_PLAN[:options["assessments"]]
+        assessments = Assessment.objects.bulk_create([
+            Assessment(
+                curriculum=curriculum,
+                name=name,
+                type=type_,
+                weight_in_course=weight,
+                max_score=100,
+            )
+            for curriculum in curricula
+            for name, type_, weight in plan
+        ], batch_size=BATCH_SIZE)
+
+        mappings = []
+        for assessment in assessments:
+            los = los_by_curriculum.get(assessment.curriculum_id, [])
+            if not los:
+                continue
+            targeted = self.rng.sample(los, self.rng.randint(1, len(los)))
+            # Ağırlıklar assessment başına %100'e tamamlanır
+            share, rest = divmod(100, len(targeted))
+            for i, lo in enumerate(targeted):
+                mappings.append(AssessmentLearningOutcome(
+                    assessment=assessment,
+                    learning_outcome=lo,
+                    weight_in_assessment=share + (rest if i == 0 else 0),
+                ))
+        AssessmentLearningOutcome.objects.bulk_create(mappings, batch_size=BATCH_SIZE)
+        return assessments
+
+    def _create_results(self, curricula, assessments, students):
+        key_by_curriculum = {curriculum.id: (curriculum.program_id, curriculum.year) for curriculum in curricula}
+        total = 0
+        batch = []
+        for assessment in assessments:
+            for student_id, ability in students.get(key_by_curriculum[assessment.curriculum_id], ()):
+                ratio = min(1.0, max(0.0, self.rng.gauss(ability, 0.1)))
+                batch.append(StudentAssessmentResult(
+                    assessment_id=assessment.id,
+                    student_id=student_id,
+                    raw_score=Decimal(round(ratio * assessment.max_score, 2)).quantize(Decimal("0.01")),
+                ))
+            if len(batch) >= BATCH_SIZE:
+                StudentAssessmentResult.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+                total += len(batch)
+                batch = []
+        if batch:
+            StudentAssessmentResult.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+            total += len(batch)
+        return total
@@ -48,5 +48,8 @@ class Program(models.Model):
         help_text="Programdan sorumlu öğretim elemanı / coordinator",
     )
 
+    # API conditional request'leri (ETag / Last-Modified) için
+    updated_at = models.DateTimeField(auto_now=True)
+
     def __str__(self):
         return f"{self.code} - {self.name}"
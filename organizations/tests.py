@@ -1,3 +1,54 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
 
-# Create your tests here.
+from accounts.models import CustomUser
+from config.cache import ORGANIZATIONS, PROGRAM, get_version, versioned_key
+from .models import Faculty, Program
+
+
+# Testler tek süreç: locmem paylaşılan cache yerine geçer
+@override_settings(FRAGMENT_CACHE_TTL=3600)
+class FacultyProgramTreeCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.affairs = CustomUser.objects.create_user("affairs", role=CustomUser.Role.STUDENT_AFFAIRS)
+        faculty = Faculty.objects.create(code="ENG", name="Engineering")
+        cls.program = Program.objects.create(code="CENG", name="Computer Eng.", faculty=faculty)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.affairs)
+
+    def _get(self):
+        return self.client.get(reverse("organizations:faculty_program_list")).content.decode()
+
+    def test_tree_is_served_from_fragment_until_a_program_changes(self):
+        self.assertIn("Computer Eng.", self._get())
+        # Sıcak yol: session + user + yeni fakülte formunun seçenekleri, ağaç sorguları yok
+        with self.assertNumQueries(3):
+            self._get()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.program.name = "Computer Engineering"
+            self.program.save()
+        self.assertIn("Computer Engineering", self._get())
+
+    @override_settings(FRAGMENT_CACHE_TTL=0)
+    def test_fragment_is_not_cached_without_shared_cache(self):
+        self._get()
+        Program.objects.filter(pk=self.program.pk).update(name="Renamed")  # sayaç artmaz
+        self.assertIn("Renamed", self._get())
+
+    def test_versioned_key_changes_only_for_bumped_entity(self):
+        other = Program.objects.create(code="EE", name="Electrical Eng.", faculty=self.program.faculty)
+        key = versioned_key("po_list", (PROGRAM, self.program.id))
+        other_key = versioned_key("po_list", (PROGRAM, other.id))
+        tree = get_version(ORGANIZATIONS)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.program.save()
+
+        self.assertNotEqual(versioned_key("po_list", (PROGRAM, self.program.id)), key)
+        self.assertEqual(versioned_key("po_list", (PROGRAM, other.id)), other_key)
+        self.assertEqual(get_version(ORGANIZATIONS), tree + 1)
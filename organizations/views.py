@@ -1,6 +1,8 @@
+from django.db.models import Prefetch
 from django.shortcuts import render, redirect, get_object_or_404
 from accounts.decorators import role_required
 from accounts.models import CustomUser
+from config.cache import ORGANIZATIONS, get_version
 from .models import Faculty, Program
 from .forms import FacultyForm, ProgramForm
 
@@ -12,7 +14,11 @@ def faculty_program_list(request):
     - Tüm Faculty + Program'ları listeler
     - Yeni Faculty ekleme formu gösterir
     """
-    faculties = Faculty.objects.prefetch_related("programs").all()
+    # Ağaç şablonda versiyonlu fragment cache'inde; queryset sadece cache
+    # boşken (fragment render edilirken) çalışır
+    faculties = Faculty.objects.select_related("responsible").prefetch_related(
+        Prefetch("programs", queryset=Program.objects.select_related("coordinator")),
+    )
     faculty_form = FacultyForm()
 
     if request.method == "POST":
@@ -24,6 +30,7 @@ def faculty_program_list(request):
     context = {
         "faculties": faculties,
         "faculty_form": faculty_form,
+        "tree_version": get_version(ORGANIZATIONS),
     }
     return render(request, "organizations/faculty_program_list.html", context)
 
@@ -1,5 +1,10 @@
 from django.contrib import admin
-from .models import ProgramOutcome, LearningOutcome
+from .models import (
+    LearningOutcome,
+    LearningOutcomeAttainment,
+    ProgramOutcome,
+    ProgramOutcomeAttainment,
+)
 
 
 @admin.register(ProgramOutcome)
@@ -15,3 +20,17 @@ class LearningOutcomeAdmin(admin.ModelAdmin):
     list_filter = ("curriculum", "active")
     search_fields = ("code", "short_title", "description")
     exclude = ("program_outcomes",)
+
+
+@admin.register(LearningOutcomeAttainment)
+class LearningOutcomeAttainmentAdmin(admin.ModelAdmin):
+    list_display = ("student", "learning_outcome", "attainment", "computed_at")
+    list_filter = ("learning_outcome__curriculum",)
+    search_fields = ("student__username",)
+
+
+@admin.register(ProgramOutcomeAttainment)
+class ProgramOutcomeAttainmentAdmin(admin.ModelAdmin):
+    list_display = ("student", "program_outcome", "attainment", "computed_at")
+    list_filter = ("program_outcome__program",)
+    search_fields = ("student__username",)
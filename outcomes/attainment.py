@@ -0,0 +1,471 @@
+"""
+LO / PO attainment engine.
+
+Bir curriculum (ya da bütün program) için gerekli tüm veriyi birkaç
+``values_list`` sorgusuyla çeker ve öğrenci × LO, öğrenci × PO matrislerini
+NumPy matris çarpımlarıyla hesaplar.
+
+Hesap:
+- P[s, a]   = raw_score / max_score           (öğrenci × assessment, 0-1)
+- M[s, a]   = 1 / 0                            (notu girilmiş mi?)
+- W[a, l]   = weight_in_assessment             (assessment × LO)
+- LO[s, l]  = (P @ W) / (M @ W) * 100          (sadece notu girilmiş
+                                                assessment'lar üzerinden)
+- V[l, p]   = LearningOutcomeProgramOutcome.weight (LO × PO)
+- PO[s, p]  = (LO @ V) / (mask(LO) @ V)        (hesaplanabilen LO'lar üzerinden)
+
+Hesaplanamayan hücreler (hiç not yok / mapping yok) NaN olarak döner.
+"""
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import partial
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from accounts.dashboard import invalidate_student_dashboards
+from assessments.models import (
+    Assessment,
+    AssessmentLearningOutcome,
+    StudentAssessmentResult,
+)
+from curriculum.models import Curriculum
+from .models import (
+    LearningOutcome,
+    LearningOutcomeAttainment,
+    LearningOutcomeProgramOutcome,
+    PendingAttainmentRefresh,
+    ProgramOutcome,
+    ProgramOutcomeAttainment,
+)
+
+# Bundan fazla öğrenci id'si gelirse id listesi yerine dersin tamamı yenilenir
+MAX_STUDENT_ID_LIST = 500
+
+
+@dataclass
+class AttainmentReport:
+    """
+    Matris satır / sütunları id dizileriyle eşleşir:
+    ``lo_matrix[i, j]`` → ``student_ids[i]`` öğrencisinin ``lo_ids[j]`` LO'su.
+    Değerler 0-100 arası yüzde, hesaplanamayanlar NaN.
+    """
+    student_ids: np.ndarray
+    lo_ids: np.ndarray
+    po_ids: np.ndarray
+    lo_matrix: np.ndarray
+    po_matrix: np.ndarray
+
+    def student_row(self, student_id):
+        """
+        Tek bir öğrencinin {lo_id: value}, {po_id: value} sözlükleri.
+        NaN değerler dahil edilmez.
+        """
+        idx = np.searchsorted(self.student_ids, student_id)
+        if idx >= len(self.student_ids) or self.student_ids[idx] != student_id:
+            return {}, {}
+        return (
+            _row_to_dict(self.lo_ids, self.lo_matrix[idx]),
+            _row_to_dict(self.po_ids, self.po_matrix[idx]),
+        )
+
+    def lo_averages(self):
+        """LO bazında sınıf ortalaması {lo_id: value}."""
+        return _column_means(self.lo_ids, self.lo_matrix)
+
+    def po_averages(self):
+        """PO bazında ortalama {po_id: value}."""
+        return _column_means(self.po_ids, self.po_matrix)
+
+
+def _row_to_dict(ids, row):
+    return {
+        int(i): float(v)
+        for i, v in zip(ids, row)
+        if not np.isnan(v)
+    }
+
+
+def _column_means(ids, matrix):
+    result = {}
+    for j, col_id in enumerate(ids):
+        column = matrix[:, j]
+        column = column[~np.isnan(column)]
+        if column.size:
+            result[int(col_id)] = float(column.mean())
+    return result
+
+
+def _id_array(values):
+    return np.unique(np.fromiter(values, dtype=np.int64))
+
+
+def _positions(ids, values):
+    """``values`` içindeki id'lerin ``ids`` (sıralı) dizisindeki indexleri."""
+    return np.searchsorted(ids, np.asarray(values, dtype=np.int64))
+
+
+def compute_attainment(curriculum_ids, program_id=None, student_ids=None):
+    """
+    Verilen curriculum'lar için attainment matrislerini hesaplar.
+
+    - ``program_id`` verilirse PO sütunları o programın PO'larıdır;
+      verilmezse LO'ların map edildiği tüm PO'lar kullanılır.
+    - ``student_ids`` verilirse (liste ya da id queryset'i) hesap sadece o
+      öğrencilerle sınırlanır.
+    """
+    curriculum_ids = list(curriculum_ids)
+
+    enrollment_qs = Curriculum.students.through.objects.filter(
+        curriculum_id__in=curriculum_ids,
+    )
+    results_qs = StudentAssessmentResult.objects.filter(
+        assessment__curriculum_id__in=curriculum_ids,
+        raw_score__isnull=False,
+    )
+    if student_ids is not None:
+        enrollment_qs = enrollment_qs.filter(customuser_id__in=student_ids)
+        results_qs = results_qs.filter(student_id__in=student_ids)
+
+    results = list(results_qs.values_list("student_id", "assessment_id", "raw_score"))
+    assessments = list(
+        Assessment.objects.filter(curriculum_id__in=curriculum_ids)
+        .values_list("id", "max_score")
+    )
+    lo_ids = _id_array(
+        LearningOutcome.objects.filter(curriculum_id__in=curriculum_ids)
+        .values_list("id", flat=True)
+    )
+    alo = list(
+        AssessmentLearningOutcome.objects.filter(
+            assessment__curriculum_id__in=curriculum_ids,
+        ).values_list("assessment_id", "learning_outcome_id", "weight_in_assessment")
+    )
+    lopo = list(
+        LearningOutcomeProgramOutcome.objects.filter(
+            learning_outcome__curriculum_id__in=curriculum_ids,
+        ).values_list("learning_outcome_id", "program_outcome_id", "weight")
+    )
+
+    if program_id is not None:
+        po_ids = _id_array(
+            ProgramOutcome.objects.filter(program_id=program_id)
+            .values_list("id", flat=True)
+        )
+        program_po_ids = set(po_ids.tolist())
+        lopo = [row for row in lopo if row[1] in program_po_ids]
+    else:
+        po_ids = _id_array(row[1] for row in lopo)
+
+    student_id_array = _id_array(
+        [row[0] for row in results]
+        + list(enrollment_qs.values_list("customuser_id", flat=True))
+    )
+    assessment_ids = _id_array(row[0] for row in assessments)
+
+    n_students, n_assessments = len(student_id_array), len(assessment_ids)
+    n_los, n_pos = len(lo_ids), len(po_ids)
+
+    # öğrenci × assessment: yüzde (0-1) ve "not girilmiş" maskesi
+    max_scores = np.zeros(n_assessments)
+    if assessments:
+        max_scores[_positions(assessment_ids, [a[0] for a in assessments])] = [
+            a[1] for a in assessments
+        ]
+
+    scores = np.zeros((n_students, n_assessments))
+    graded = np.zeros((n_students, n_assessments))
+    if results:
+        rows = _positions(student_id_array, [r[0] for r in results])
+        cols = _positions(assessment_ids, [r[1] for r in results])
+        raw = np.array([float(r[2]) for r in results])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(max_scores[cols] > 0, raw / max_scores[cols], np.nan)
+        valid = ~np.isnan(ratio)
+        scores[rows[valid], cols[valid]] = ratio[valid]
+        graded[rows[valid], cols[valid]] = 1.0
+
+    # assessment × LO ağırlıkları
+    assessment_lo = np.zeros((n_assessments, n_los))
+    if alo:
+        assessment_lo[
+            _positions(assessment_ids, [m[0] for m in alo]),
+            _positions(lo_ids, [m[1] for m in alo]),
+        ] = [m[2] for m in alo]
+
+    # LO × PO ağırlıkları
+    lo_po = np.zeros((n_los, n_pos))
+    if lopo:
+        lo_po[
+            _positions(lo_ids, [m[0] for m in lopo]),
+            _positions(po_ids, [m[1] for m in lopo]),
+        ] = [m[2] for m in lopo]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lo_weight = graded @ assessment_lo
+        lo_matrix = np.where(lo_weight > 0, (scores @ assessment_lo) / lo_weight, np.nan) * 100
+
+        lo_known = ~np.isnan(lo_matrix)
+        po_weight = lo_known.astype(float) @ lo_po
+        po_matrix = np.where(
+            po_weight > 0,
+            (np.nan_to_num(lo_matrix) @ lo_po) / po_weight,
+            np.nan,
+        )
+
+    return AttainmentReport(
+        student_ids=student_id_array,
+        lo_ids=lo_ids,
+        po_ids=po_ids,
+        lo_matrix=lo_matrix,
+        po_matrix=po_matrix,
+    )
+
+
+def curriculum_attainment(curriculum, student_ids=None):
+    """Tek bir dersin öğrenci × LO / PO attainment raporu."""
+    return compute_attainment(
+        [curriculum.id],
+        program_id=curriculum.program_id,
+        student_ids=student_ids,
+    )
+
+
+def program_attainment(program, student_ids=None):
+    """Programdaki tüm derslerin birlikte hesaplandığı attainment raporu."""
+    curriculum_ids = Curriculum.objects.filter(program=program).values_list("id", flat=True)
+    return compute_attainment(
+        curriculum_ids,
+        program_id=program.id,
+        student_ids=student_ids,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Materialized attainment tabloları
+# ---------------------------------------------------------------------------
+
+def _build_rows(model, column_field, student_ids, column_ids, matrix, column_scope, computed_at):
+    """
+    Matristeki hesaplanabilen (NaN olmayan) hücrelerden, sadece
+    ``column_scope`` içindeki sütunlar için model instance'ları üretir.
+    """
+    columns = np.isin(column_ids, np.fromiter(column_scope, dtype=np.int64))
+    values = matrix[:, columns]
+    rows, cols = np.nonzero(~np.isnan(values))
+    scoped_ids = column_ids[columns]
+    return [
+        model(
+            student_id=int(student_ids[i]),
+            attainment=Decimal(str(round(float(values[i, j]), 2))),
+            computed_at=computed_at,
+            **{f"{column_field}_id": int(scoped_ids[j])},
+        )
+        for i, j in zip(rows.tolist(), cols.tolist())
+    ]
+
+
+def refresh_attainment(curriculum_id, student_ids=None):
+    """
+    Bir dersteki öğrencilerin (ya da sadece ``student_ids``'in) LO attainment
+    satırlarını ve aynı öğrencilerin program genelindeki PO satırlarını
+    yeniden hesaplar.
+    """
+    refresh_curricula_attainment({curriculum_id: student_ids})
+
+
+def refresh_curricula_attainment(pending):
+    """
+    ``pending``: {curriculum_id: student_ids | None}. Aynı programdaki dersler
+    tek bir hesapla (öğrenci kümelerinin birleşimi üzerinden) yenilenir.
+    """
+    program_by_curriculum = dict(
+        Curriculum.objects.filter(pk__in=list(pending)).values_list("id", "program_id")
+    )
+    by_program = {}
+    for curriculum_id, student_ids in pending.items():
+        program_id = program_by_curriculum.get(curriculum_id)
+        if program_id is not None:
+            by_program.setdefault(program_id, {})[curriculum_id] = student_ids
+
+    for program_id, curricula in by_program.items():
+        _refresh_program_curricula(program_id, curricula)
+
+
+def _refresh_program_curricula(program_id, curricula):
+    curriculum_ids = list(curricula)
+    student_ids = set()
+    whole_curriculum = False
+    for ids in curricula.values():
+        if ids is None:
+            whole_curriculum = True
+        else:
+            student_ids.update(ids)
+
+    if whole_curriculum or len(student_ids) > MAX_STUDENT_ID_LIST:
+        # Derslerin tüm öğrencileri: kayıtlı olanlar + notu olanlar (subquery)
+        from accounts.models import CustomUser  # local import, circular'ı önler
+
+        student_ids = CustomUser.objects.filter(
+            Q(enrolled_curricula__in=curriculum_ids)
+            | Q(assessment_results__assessment__curriculum__in=curriculum_ids)
+        ).values("id")
+    elif not student_ids:
+        return
+    else:
+        student_ids = list(student_ids)
+
+    program_curricula = Curriculum.objects.filter(program_id=program_id).values_list("id", flat=True)
+    report = compute_attainment(program_curricula, program_id=program_id, student_ids=student_ids)
+    curriculum_lo_ids = list(
+        LearningOutcome.objects.filter(curriculum_id__in=curriculum_ids).values_list("id", flat=True)
+    )
+
+    now = timezone.now()
+    lo_rows = _build_rows(
+        LearningOutcomeAttainment, "learning_outcome", report.student_ids,
+        report.lo_ids, report.lo_matrix, curriculum_lo_ids, now,
+    )
+    po_rows = _build_rows(
+        ProgramOutcomeAttainment, "program_outcome", report.student_ids,
+        report.po_ids, report.po_matrix, report.po_ids, now,
+    )
+
+    with transaction.atomic():
+        LearningOutcomeAttainment.objects.filter(
+            student_id__in=student_ids,
+            learning_outcome_id__in=curriculum_lo_ids,
+        ).delete()
+        ProgramOutcomeAttainment.objects.filter(
+            student_id__in=student_ids,
+            program_outcome__program_id=program_id,
+        ).delete()
+        LearningOutcomeAttainment.objects.bulk_create(lo_rows, batch_size=1000)
+        ProgramOutcomeAttainment.objects.bulk_create(po_rows, batch_size=1000)
+    invalidate_student_dashboards(report.student_ids.tolist())
+
+
+def refresh_program_attainment(program_id):
+    """Programdaki tüm öğrencilerin LO ve PO attainment satırlarını yeniden kurar."""
+    report = compute_attainment(
+        Curriculum.objects.filter(program_id=program_id).values_list("id", flat=True),
+        program_id=program_id,
+    )
+
+    now = timezone.now()
+    lo_rows = _build_rows(
+        LearningOutcomeAttainment, "learning_outcome", report.student_ids,
+        report.lo_ids, report.lo_matrix, report.lo_ids, now,
+    )
+    po_rows = _build_rows(
+        ProgramOutcomeAttainment, "program_outcome", report.student_ids,
+        report.po_ids, report.po_matrix, report.po_ids, now,
+    )
+
+    with transaction.atomic():
+        LearningOutcomeAttainment.objects.filter(
+            learning_outcome__curriculum__program_id=program_id,
+        ).delete()
+        ProgramOutcomeAttainment.objects.filter(
+            program_outcome__program_id=program_id,
+        ).delete()
+        LearningOutcomeAttainment.objects.bulk_create(lo_rows, batch_size=1000)
+        ProgramOutcomeAttainment.objects.bulk_create(po_rows, batch_size=1000)
+    invalidate_student_dashboards(report.student_ids.tolist())
+
+
+# ---------------------------------------------------------------------------
+# Refresh planlama: signal'ler ve toplu yazma yolları buradan tetikler
+# ---------------------------------------------------------------------------
+
+_batch = threading.local()
+
+
+@contextmanager
+def batched_refresh(queued=False):
+    """
+    Blok içinde istenen tüm refresh'leri biriktirir ve blok bitince
+    program başına tek seferde çalıştırır (çok satırlı kayıt işlemleri için).
+
+    ``queued=True``: refresh commit sonrası çalışmaz, ``PendingAttainmentRefresh``
+    satırı olarak bloğun transaction'ına yazılır (bkz. ``run_queued_refreshes``).
+    Blok bir transaction içinde açılmalı ki kuyruk notlarla birlikte commit olsun.
+    """
+    depth = getattr(_batch, "depth", 0)
+    if depth == 0:
+        _batch.pending = {}
+    _batch.depth = depth + 1
+    try:
+        yield
+    finally:
+        _batch.depth = depth
+    if depth == 0:
+        pending, _batch.pending = _batch.pending, {}
+        if pending and queued:
+            queue_refresh(pending)
+        elif pending:
+            # Aynı programdaki dersler tek hesapta yenilenir
+            transaction.on_commit(partial(refresh_curricula_attainment, pending))
+
+
+def queue_refresh(pending):
+    """``pending``: {curriculum_id: student_ids | None} → kuyruk satırları."""
+    PendingAttainmentRefresh.objects.bulk_create([
+        PendingAttainmentRefresh(
+            curriculum_id=curriculum_id,
+            student_ids=sorted(student_ids) if student_ids is not None else None,
+        )
+        for curriculum_id, student_ids in pending.items()
+    ])
+
+
+def run_queued_refreshes(limit=1000):
+    """
+    Kuyruktaki en fazla ``limit`` isteği birleştirip tek geçişte yeniler ve
+    siler. Aynı anda çalışan başka bir işçinin kilitlediği satırlar atlanır.
+    İşlenen istek sayısını döner.
+    """
+    with transaction.atomic():
+        requests = list(
+            PendingAttainmentRefresh.objects.select_for_update(skip_locked=True)
+            .order_by("id")[:limit]
+        )
+        if not requests:
+            return 0
+        pending = {}
+        for request in requests:
+            if request.student_ids is None or pending.get(request.curriculum_id, ()) is None:
+                pending[request.curriculum_id] = None
+            else:
+                pending.setdefault(request.curriculum_id, set()).update(request.student_ids)
+        refresh_curricula_attainment(pending)
+        PendingAttainmentRefresh.objects.filter(pk__in=[request.pk for request in requests]).delete()
+    return len(requests)
+
+
+def request_refresh(curriculum_id, student_ids=None):
+    """
+    Bir ders (ve opsiyonel olarak sadece bazı öğrenciler) için attainment
+    yenilemesi ister. ``student_ids`` None → dersin tamamı.
+    Refresh transaction commit olduktan sonra çalışır.
+    """
+    if student_ids is not None:
+        student_ids = set(student_ids)
+
+    if getattr(_batch, "depth", 0):
+        pending = _batch.pending
+        if curriculum_id in pending:
+            current = pending[curriculum_id]
+            if current is None or student_ids is None:
+                pending[curriculum_id] = None
+            else:
+                current.update(student_ids)
+        else:
+            pending[curriculum_id] = student_ids
+        return
+
+    transaction.on_commit(partial(refresh_attainment, curriculum_id, student_ids))
@@ -0,0 +1,68 @@
+"""
+Program bazlı öğrenci × PO attainment CSV export'u.
+
+Satırlar materialized ``ProgramOutcomeAttainment`` tablosundan öğrenci
+sırasıyla ``iterator(chunk_size=...)`` ile okunur (PostgreSQL'de server-side
+cursor) ve her öğrenci için tek bir CSV satırı üretilir; bellekte aynı anda
+sadece bir öğrencinin değerleri tutulur.
+"""
+import csv
+
+from .models import ProgramOutcome, ProgramOutcomeAttainment
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+class _Echo:
+    """csv.writer için: yazılan satırı olduğu gibi geri döner."""
+
+    def write(self, value):
+        return value
+
+
+def iter_program_attainment_csv(program, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    ``username, first_name, last_name, grade, <PO1>, <PO2>, ...`` kolonlu
+    CSV'yi satır satır üreten generator.
+    """
+    writer = csv.writer(_Echo())
+    pos = list(
+        ProgramOutcome.objects.filter(program=program)
+        .order_by("order", "code")
+        .values_list("id", "code")
+    )
+    po_index = {po_id: i for i, (po_id, _) in enumerate(pos)}
+
+    yield writer.writerow(
+        ["username", "first_name", "last_name", "grade"] + [code for _, code in pos]
+    )
+
+    rows = (
+        ProgramOutcomeAttainment.objects
+        .filter(program_outcome__program=program)
+        .order_by("student_id")
+        .values_list(
+            "student_id",
+            "student__username",
+            "student__first_name",
+            "student__last_name",
+            "student__student_grade",
+            "program_outcome_id",
+            "attainment",
+        )
+        .iterator(chunk_size=chunk_size)
+    )
+
+    current_student = None
+    current = None
+    for student_id, username, first_name, last_name, grade, po_id, attainment in rows:
+        if student_id != current_student:
+            if current is not None:
+                yield writer.writerow(current)
+            current_student = student_id
+            current = [username, first_name, last_name, grade if grade is not None else ""]
+            current.extend([""] * len(pos))
+        current[4 + po_index[po_id]] = attainment
+
+    if current is not None:
+        yield writer.writerow(current)
@@ -0,0 +1,36 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from organizations.models import Program
+from outcomes.exports import EXPORT_CHUNK_SIZE, iter_program_attainment_csv
+
+
+class Command(BaseCommand):
+    help = "Export the student x PO attainment matrix of a program as CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument("program_code")
+        parser.add_argument(
+            "-o", "--output",
+            help="Output file (default: stdout).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help="Rows fetched from the database per round trip.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            program = Program.objects.get(code=options["program_code"])
+        except Program.DoesNotExist:
+            raise CommandError(f"Program '{options['program_code']}' does not exist.")
+
+        lines = iter_program_attainment_csv(program, chunk_size=options["chunk_size"])
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as fh:
+                fh.writelines(lines)
+        else:
+            sys.stdout.writelines(lines)
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from organizations.models import Program
+from outcomes.attainment import refresh_program_attainment, run_queued_refreshes
+
+
+class Command(BaseCommand):
+    help = "Rebuild the materialized LO / PO attainment tables (all programs or the given ones)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--program",
+            action="append",
+            default=[],
+            help="Program code (repeatable). Default: every program.",
+        )
+        parser.add_argument(
+            "--queued",
+            action="store_true",
+            help="Only process queued refreshes (e.g. from the bulk results API); run it from cron.",
+        )
+
+    def handle(self, *args, **options):
+        if options["queued"]:
+            processed = 0
+            while True:
+                count = run_queued_refreshes()
+                if not count:
+                    break
+                processed += count
+            self.stdout.write(self.style.SUCCESS(f"{processed} queued refreshes processed."))
+            return
+
+        programs = Program.objects.order_by("code")
+        if options["program"]:
+            programs = programs.filter(code__in=options["program"])
+
+        for program in programs:
+            refresh_program_attainment(program.id)
+            self.stdout.write(f"{program.code}: refreshed")
+
+        self.stdout.write(self.style.SUCCESS("Attainment tables are up to date."))
@@ -0,0 +1,136 @@
+"""
+Ağırlıklı mapping tablolarının (assessment → LO, LO → PO) toplu kaydı.
+
+Formdan gelen ağırlıklar mevcut satırlarla bellekte karşılaştırılır;
+farklar tek transaction içinde bir filtreli ``delete()``, bir ``bulk_update``
+ve bir ``bulk_create`` ile yazılır. Bulk işlemler signal göndermediği için
+üst kayıtların ``updated_at``'i, attainment yenilemesi ve dersin cache
+versiyonu burada, kayıt başına bir kez güncellenir. Filtreli ``delete()``
+signal gönderir; bu yüzden sadece o blokta ``mapping_signals_suppressed``
+ile mapping receiver'ları susturulur.
+"""
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from django.db import transaction
+from django.utils import timezone
+
+from config.cache import CURRICULUM, bump_version
+from .attainment import request_refresh
+
+
+_suppressed = threading.local()
+
+
+@contextmanager
+def mapping_signals_suppressed():
+    """
+    Blok içindeki mapping save / delete signal'leri refresh ve touch
+    yapmaz; çağıran bunları kendisi bir kez yapmalı.
+    """
+    depth = getattr(_suppressed, "depth", 0)
+    _suppressed.depth = depth + 1
+    try:
+        yield
+    finally:
+        _suppressed.depth = depth
+
+
+def mapping_signals_are_suppressed():
+    return getattr(_suppressed, "depth", 0) > 0
+
+
+def clean_weight(raw_value):
+    """
+    Formdaki ağırlık: boş ya da 0 → None (mapping yok), 1-100 arası → int.
+    Geçersizse açıklamalı ``ValueError`` fırlatır.
+    """
+    raw_value = str(raw_value).strip()
+    if raw_value == "":
+        return None
+    try:
+        weight = int(raw_value)
+    except ValueError:
+        raise ValueError(f"'{raw_value}' is not a whole number.")
+    if weight < 0 or weight > 100:
+        raise ValueError(f"Weight {weight} is outside 0-100.")
+    return weight or None
+
+
+def validate_totals(weights, total, labels):
+    """
+    Her üst kayıt (anahtarın ilk elemanı) için girilen ağırlıkların toplamı
+    ``total`` olmalı; hiç mapping'i olmayan üst kayıt serbest. Hata listesi döner.
+    """
+    sums = {}
+    for (parent_id, _), weight in weights.items():
+        if weight is not None:
+            sums[parent_id] = sums.get(parent_id, 0) + weight
+    return [
+        f"{labels[parent_id]}: weights add up to {value}%, expected {total}%."
+        for parent_id, value in sums.items()
+        if value != total
+    ]
+
+
+@dataclass
+class MappingChanges:
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+
+    def __bool__(self):
+        return bool(self.created or self.updated or self.deleted)
+
+
+def save_mapping(model, parent_field, child_field, weight_field, weights, existing, curriculum_id):
+    """
+    - ``weights``: {(parent_id, child_id): int | None} (None → mapping silinir)
+    - ``existing``: aynı anahtarlarla mevcut mapping instance'ları
+
+    Değişmeyen satırlara dokunulmaz. Değişiklik varsa dersin attainment'ı
+    commit sonrası bir kez yenilenir. ``MappingChanges`` döner.
+    """
+    to_create = []
+    to_update = []
+    to_delete = []
+    touched_parents = set()
+
+    for (parent_id, child_id), weight in weights.items():
+        mapping = existing.get((parent_id, child_id))
+        if weight is None:
+            if mapping is not None:
+                to_delete.append(mapping.pk)
+                touched_parents.add(parent_id)
+        elif mapping is None:
+            to_create.append(model(**{
+                f"{parent_field}_id": parent_id,
+                f"{child_field}_id": child_id,
+                weight_field: weight,
+            }))
+            touched_parents.add(parent_id)
+        elif getattr(mapping, weight_field) != weight:
+            setattr(mapping, weight_field, weight)
+            to_update.append(mapping)
+            touched_parents.add(parent_id)
+
+    changes = MappingChanges(len(to_create), len(to_update), len(to_delete))
+    if not changes:
+        return changes
+
+    parent_model = model._meta.get_field(parent_field).related_model
+    with transaction.atomic():
+        if to_delete:
+            with mapping_signals_suppressed():
+                model.objects.filter(pk__in=to_delete).delete()
+        if to_update:
+            model.objects.bulk_update(to_update, [weight_field])
+        if to_create:
+            model.objects.bulk_create(to_create)
+        # Mapping'ler üst kaydın parçası sayılır → API ETag / Last-Modified değişsin
+        parent_model.objects.filter(pk__in=touched_parents).update(updated_at=timezone.now())
+        request_refresh(curriculum_id)
+        bump_version(CURRICULUM, curriculum_id)
+
+    return changes
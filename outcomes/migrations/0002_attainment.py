@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outcomes', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LearningOutcomeAttainment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('attainment', models.DecimalField(decimal_places=2, help_text='Attainment in percent (0-100).', max_digits=5)),
+                ('computed_at', models.DateTimeField()),
+                ('learning_outcome', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attainments', to='outcomes.learningoutcome')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lo_attainments', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Learning Outcome Attainment',
+                'verbose_name_plural': 'Learning Outcome Attainments',
+                'unique_together': {('student', 'learning_outcome')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ProgramOutcomeAttainment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('attainment', models.DecimalField(decimal_places=2, help_text='Attainment in percent (0-100).', max_digits=5)),
+                ('computed_at', models.DateTimeField()),
+                ('program_outcome', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attainments', to='outcomes.programoutcome')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='po_attainments', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Program Outcome Attainment',
+                'verbose_name_plural': 'Program Outcome Attainments',
+                'unique_together': {('student', 'program_outcome')},
+            },
+        ),
+    ]
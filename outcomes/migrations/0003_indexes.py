@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('curriculum', '0002_indexes'),
+        ('organizations', '0001_initial'),
+        ('outcomes', '0002_attainment'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='learningoutcome',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='learningoutcomeattainment',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='learningoutcomeprogramoutcome',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='programoutcome',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='programoutcomeattainment',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='learningoutcome',
+            constraint=models.UniqueConstraint(fields=('curriculum', 'code'), name='outcomes_lo_curriculum_code_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='learningoutcomeattainment',
+            constraint=models.UniqueConstraint(fields=('student', 'learning_outcome'), name='outcomes_lo_attainment_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='learningoutcomeprogramoutcome',
+            constraint=models.UniqueConstraint(fields=('learning_outcome', 'program_outcome'), name='outcomes_lo_po_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='programoutcome',
+            constraint=models.UniqueConstraint(fields=('program', 'code'), name='outcomes_po_program_code_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='programoutcomeattainment',
+            constraint=models.UniqueConstraint(fields=('student', 'program_outcome'), name='outcomes_po_attainment_uniq'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('curriculum', '0003_updated_at'),
+        ('outcomes', '0004_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingAttainmentRefresh',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('student_ids', models.JSONField(blank=True, help_text='Students to refresh; empty means the whole curriculum.', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('curriculum', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='curriculum.curriculum')),
+            ],
+            options={
+                'verbose_name': 'Pending Attainment Refresh',
+                'verbose_name_plural': 'Pending Attainment Refreshes',
+            },
+        ),
+    ]
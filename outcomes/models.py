@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.db import models
 from organizations.models import Program
 from curriculum.models import Curriculum
@@ -35,9 +36,12 @@ class ProgramOutcome(models.Model):
     )
 
     active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        unique_together = ("program", "code")
+        constraints = [
+            models.UniqueConstraint(fields=["program", "code"], name="outcomes_po_program_code_uniq"),
+        ]
         ordering = ["program", "order", "code"]
 
     def __str__(self):
@@ -77,6 +81,7 @@ class LearningOutcome(models.Model):
     )
 
     active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     program_outcomes = models.ManyToManyField(
         "outcomes.ProgramOutcome",
@@ -86,7 +91,9 @@ class LearningOutcome(models.Model):
     )
 
     class Meta:
-        unique_together = ("curriculum", "code")
+        constraints = [
+            models.UniqueConstraint(fields=["curriculum", "code"], name="outcomes_lo_curriculum_code_uniq"),
+        ]
         ordering = ["curriculum", "order", "code"]
 
     def __str__(self):
@@ -109,7 +116,111 @@ class LearningOutcomeProgramOutcome(models.Model):
     )
 
     class Meta:
-        unique_together = ("learning_outcome", "program_outcome")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["learning_outcome", "program_outcome"],
+                name="outcomes_lo_po_uniq",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.learning_outcome} -> {self.program_outcome} ({self.weight}%)"
+
+
+class LearningOutcomeAttainment(models.Model):
+    """
+    Öğrencinin bir LO'daki başarı yüzdesi (materialized).
+    ``outcomes.attainment`` tarafından sonuç / ağırlık değiştikçe güncellenir;
+    elle düzenlenmez.
+    """
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="lo_attainments",
+    )
+    learning_outcome = models.ForeignKey(
+        LearningOutcome,
+        on_delete=models.CASCADE,
+        related_name="attainments",
+    )
+    attainment = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        help_text="Attainment in percent (0-100).",
+    )
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["student", "learning_outcome"],
+                name="outcomes_lo_attainment_uniq",
+            ),
+        ]
+        verbose_name = "Learning Outcome Attainment"
+        verbose_name_plural = "Learning Outcome Attainments"
+
+    def __str__(self):
+        return f"{self.student} - {self.learning_outcome} ({self.attainment}%)"
+
+
+class ProgramOutcomeAttainment(models.Model):
+    """
+    Öğrencinin bir PO'daki başarı yüzdesi (materialized), programdaki tüm
+    derslerin LO'ları üzerinden hesaplanır.
+    """
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="po_attainments",
+    )
+    program_outcome = models.ForeignKey(
+        ProgramOutcome,
+        on_delete=models.CASCADE,
+        related_name="attainments",
+    )
+    attainment = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        help_text="Attainment in percent (0-100).",
+    )
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["student", "program_outcome"],
+                name="outcomes_po_attainment_uniq",
+            ),
+        ]
+        verbose_name = "Program Outcome Attainment"
+        verbose_name_plural = "Program Outcome Attainments"
+
+    def __str__(self):
+        return f"{self.student} - {self.program_outcome} ({self.attainment}%)"
+
+
+class PendingAttainmentRefresh(models.Model):
+    """
+    Commit sonrası beklemeden, sonra işlenecek attainment yenilemesi
+    (büyük toplu not yazımlarında isteği bekletmemek için). Not yazımıyla
+    aynı transaction'da eklenir; ``refresh_attainment --queued`` işler.
+    """
+    curriculum = models.ForeignKey(
+        Curriculum,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    student_ids = models.JSONField(
+        null=True,
+        blank=True,
+        help_text="Students to refresh; empty means the whole curriculum.",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Pending Attainment Refresh"
+        verbose_name_plural = "Pending Attainment Refreshes"
+
+    def __str__(self):
+        return f"{self.curriculum_id} ({'all' if self.student_ids is None else len(self.student_ids)})"
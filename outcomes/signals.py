@@ -0,0 +1,124 @@
+"""
+Materialized attainment tablolarını (ve mapping değişince üst kaydın
+``updated_at``'ini) güncel tutan signal'ler.
+
+Toplu yazma yolları (bulk_create / bulk_update) signal göndermez; onlar
+``outcomes.attainment.request_refresh``'i doğrudan çağırır. Mapping'lerin
+``save_mapping`` içindeki toplu silinmesi receiver'ları açıkça susturur
+(bkz. ``outcomes.mapping.mapping_signals_suppressed``); admin'deki toplu
+silme gibi diğer queryset silmeleri normal yoldan geçer.
+"""
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from assessments.models import Assessment, AssessmentLearningOutcome, StudentAssessmentResult
+from config.cache import CURRICULUM, bump_version
+from curriculum.models import Curriculum
+from .attainment import refresh_program_attainment, request_refresh
+from .mapping import mapping_signals_are_suppressed
+from .models import LearningOutcome, LearningOutcomeProgramOutcome
+
+
+@receiver(post_save, sender=StudentAssessmentResult)
+def refresh_on_result_change(sender, instance, raw=False, **kwargs):
+    """Sadece o öğrencinin ilgili dersteki satırları yeniden hesaplanır."""
+    if raw:
+        return
+    curriculum_id = (
+        Assessment.objects.filter(pk=instance.assessment_id)
+        .values_list("curriculum_id", flat=True)
+        .first()
+    )
+    if curriculum_id is not None:
+        request_refresh(curriculum_id, [instance.student_id])
+
+
+@receiver(post_delete, sender=StudentAssessmentResult)
+def refresh_on_result_delete(sender, instance, origin=None, **kwargs):
+    # Assessment / öğrenci / ders silinirken gelen cascade'lerde her satır için
+    # çalışmasın: o durumları Assessment / Curriculum receiver'ları karşılar
+    if isinstance(origin, QuerySet):
+        origin = origin.model
+    if origin is not StudentAssessmentResult and not isinstance(origin, StudentAssessmentResult):
+        return
+    curriculum_id = (
+        Assessment.objects.filter(pk=instance.assessment_id)
+        .values_list("curriculum_id", flat=True)
+        .first()
+    )
+    if curriculum_id is not None:
+        request_refresh(curriculum_id, [instance.student_id])
+
+
+@receiver(post_save, sender=Assessment)
+def refresh_on_assessment_change(sender, instance, created=False, raw=False, **kwargs):
+    """max_score değişince yüzdeler değişir → dersin tamamı."""
+    if raw or created:
+        return
+    if instance.has_tracked_changes("max_score"):
+        request_refresh(instance.curriculum_id)
+
+
+@receiver(post_delete, sender=Assessment)
+def refresh_on_assessment_delete(sender, instance, **kwargs):
+    request_refresh(instance.curriculum_id)
+
+
+@receiver(post_save, sender=AssessmentLearningOutcome)
+@receiver(post_delete, sender=AssessmentLearningOutcome)
+def refresh_on_assessment_mapping_change(sender, instance, raw=False, **kwargs):
+    if raw or mapping_signals_are_suppressed():
+        return
+    curriculum_id = (
+        Assessment.objects.filter(pk=instance.assessment_id)
+        .values_list("curriculum_id", flat=True)
+        .first()
+    )
+    if curriculum_id is not None:
+        request_refresh(curriculum_id)
+
+
+@receiver(post_save, sender=LearningOutcomeProgramOutcome)
+@receiver(post_delete, sender=LearningOutcomeProgramOutcome)
+def refresh_on_lo_po_mapping_change(sender, instance, raw=False, **kwargs):
+    """
+    LO → PO ağırlığı sadece o LO'nun dersindeki öğrencilerin PO'larını etkiler.
+    Mapping LO listesinde de görünür → dersin cache versiyonu artar.
+    """
+    if raw or mapping_signals_are_suppressed():
+        return
+    curriculum_id = (
+        LearningOutcome.objects.filter(pk=instance.learning_outcome_id)
+        .values_list("curriculum_id", flat=True)
+        .first()
+    )
+    if curriculum_id is not None:
+        request_refresh(curriculum_id)
+        bump_version(CURRICULUM, curriculum_id)
+
+
+@receiver(post_save, sender=AssessmentLearningOutcome)
+@receiver(post_delete, sender=AssessmentLearningOutcome)
+def touch_assessment_on_mapping_change(sender, instance, raw=False, **kwargs):
+    """Mapping'ler assessment'ın parçası sayılır → API ETag / Last-Modified değişsin."""
+    if raw or mapping_signals_are_suppressed():
+        return
+    Assessment.objects.filter(pk=instance.assessment_id).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=LearningOutcomeProgramOutcome)
+@receiver(post_delete, sender=LearningOutcomeProgramOutcome)
+def touch_learning_outcome_on_mapping_change(sender, instance, raw=False, **kwargs):
+    if raw or mapping_signals_are_suppressed():
+        return
+    LearningOutcome.objects.filter(pk=instance.learning_outcome_id).update(updated_at=timezone.now())
+
+
+@receiver(post_delete, sender=Curriculum)
+def refresh_on_curriculum_delete(sender, instance, **kwargs):
+    """Silinen dersin LO'ları gidince öğrencilerin PO değerleri değişir."""
+    program_id = instance.program_id
+    transaction.on_commit(lambda: refresh_program_attainment(program_id))
@@ -1,3 +1,438 @@
+import io
+import os
+import tempfile
+from decimal import Decimal
+from functools import partial
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from assessments.models import Assessment, AssessmentLearningOutcome, StudentAssessmentResult
+from config.testing import QueryBudgetMixin
+from curriculum.models import Curriculum
+from organizations.models import Faculty, Program
+from .attainment import (
+    batched_refresh,
+    compute_attainment,
+    curriculum_attainment,
+    refresh_curricula_attainment,
+    refresh_program_attainment,
+)
+from .exports import iter_program_attainment_csv
+from .models import (
+    LearningOutcome,
+    LearningOutcomeAttainment,
+    LearningOutcomeProgramOutcome,
+    ProgramOutcome,
+    ProgramOutcomeAttainment,
+)
+
+
+class MappingSaveTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        faculty = Faculty.objects.create(code="ENG", name="Engineering")
+        program = Program.objects.create(code="CENG", name="Computer Eng.", faculty=faculty)
+        cls.lecturer = CustomUser.objects.create_user("lecturer", role=CustomUser.Role.LECTURER)
+        cls.curriculum = Curriculum.objects.create(
+            program=program, code="CENG101", name="Intro", year=1, lecturer=cls.lecturer,
+        )
+        cls.pos = [
+            ProgramOutcome.objects.create(program=program, code=f"PO{i}", short_title=f"PO {i}", order=i)
+            for i in range(30)
+        ]
+        cls.lo = LearningOutcome.objects.create(curriculum=cls.curriculum, code="LO1", short_title="LO 1")
+        cls.lo2 = LearningOutcome.objects.create(curriculum=cls.curriculum, code="LO2", short_title="LO 2")
+        cls.assessment = Assessment.objects.create(curriculum=cls.curriculum, name="Midterm", weight_in_course=100)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.lecturer)
+
+    def test_lo_po_save_is_one_bulk_diff(self):
+        LearningOutcomeProgramOutcome.objects.create(learning_outcome=self.lo, program_outcome=self.pos[0], weight=50)
+        LearningOutcomeProgramOutcome.objects.create(learning_outcome=self.lo, program_outcome=self.pos[1], weight=50)
+        data = {f"po_{po.id}": "20" for po in self.pos}
+        data[f"po_{self.pos[0].id}"] = "50"  # aynı
+        data[f"po_{self.pos[1].id}"] = ""    # silinir
+
+        # Yazma sayısı PO sayısından bağımsız: delete + update + insert + touch
+        with self.assertMaxQueries(12), self.captureOnCommitCallbacks(execute=False) as callbacks:
+            response = self.client.post(reverse("outcomes:learning_outcome_mapping", args=[self.lo.id]), data)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(callbacks), 2)  # attainment + cache versiyonu, tek seferde
+        weights = dict(self.lo.lo_po_mappings.values_list("program_outcome_id", "weight"))
+        self.assertEqual(len(weights), 29)
+        self.assertEqual(weights[self.pos[0].id], 50)
+        self.assertNotIn(self.pos[1].id, weights)
+
+    def test_queryset_delete_outside_save_mapping_still_refreshes(self):
+        # Admin'deki "delete selected" gibi: save_mapping dışındaki toplu silme susturulmaz
+        mapping = LearningOutcomeProgramOutcome.objects.create(
+            learning_outcome=self.lo, program_outcome=self.pos[0], weight=50,
+        )
+        LearningOutcome.objects.filter(pk=self.lo.pk).update(updated_at=self.lo.updated_at.replace(year=2000))
+
+        with mock.patch("outcomes.signals.request_refresh") as request_refresh:
+            LearningOutcomeProgramOutcome.objects.filter(pk=mapping.pk).delete()
+
+        request_refresh.assert_called_once_with(self.curriculum.id)
+        self.lo.refresh_from_db()
+        self.assertGreater(self.lo.updated_at.year, 2000)
+
+    def test_invalid_input_saves_nothing(self):
+        data = {f"po_{self.pos[0].id}": "40", f"po_{self.pos[1].id}": "abc"}
+
+        response = self.client.post(reverse("outcomes:learning_outcome_mapping", args=[self.lo.id]), data)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["errors"]), 1)
+        self.assertFalse(LearningOutcomeProgramOutcome.objects.exists())
+
+    def test_assessment_lo_weights_must_total_100(self):
+        url = reverse("assessments:assessment_lo_mapping", args=[self.assessment.id])
+
+        response = self.client.post(url, {f"lo_{self.lo.id}": "40", f"lo_{self.lo2.id}": "50"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("90%", response.context["errors"][0])
+        self.assertFalse(AssessmentLearningOutcome.objects.exists())
+
+        response = self.client.post(url, {f"lo_{self.lo.id}": "40", f"lo_{self.lo2.id}": "60"})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(AssessmentLearningOutcome.objects.count(), 2)
+
+    def test_matrix_loads_in_three_queries_and_saves_whole_grid(self):
+        url = reverse("outcomes:learning_outcome_matrix", args=[self.curriculum.id])
+        LearningOutcomeProgramOutcome.objects.create(learning_outcome=self.lo, program_outcome=self.pos[0], weight=50)
+
+        # oturum + kullanıcı + yetki kapsamı + ders + LO'lar + PO'lar + mapping'ler
+        with self.assertMaxQueries(7):
+            response = self.client.get(url)
+        self.assertEqual(len(response.context["rows"]), 2)
+
+        data = {f"w_{lo.id}_{po.id}": "10" for lo in (self.lo, self.lo2) for po in self.pos[:12]}
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            response = self.client.post(url, data)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(callbacks), 2)
+        self.assertEqual(LearningOutcomeProgramOutcome.objects.filter(weight=10).count(), 24)
+        self.assertEqual(LearningOutcomeProgramOutcome.objects.count(), 24)
+
+
+class AttainmentRefreshTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        faculty = Faculty.objects.create(code="ENG", name="Engineering")
+        cls.program = Program.objects.create(code="CENG", name="Computer Eng.", faculty=faculty)
+        cls.curriculum = Curriculum.objects.create(program=cls.program, code="CENG101", name="Intro", year=1)
+        cls.s1, cls.s2 = (
+            CustomUser.objects.create_user(
+                f"s{i}", role=CustomUser.Role.STUDENT, student_program=cls.program, student_grade=1,
+            )
+            for i in (1, 2)
+        )
+        cls.lo1 = LearningOutcome.objects.create(curriculum=cls.curriculum, code="LO1", short_title="LO 1")
+        cls.lo2 = LearningOutcome.objects.create(curriculum=cls.curriculum, code="LO2", short_title="LO 2")
+        cls.po = ProgramOutcome.objects.create(program=cls.program, code="PO1", short_title="PO 1")
+        for lo in (cls.lo1, cls.lo2):
+            LearningOutcomeProgramOutcome.objects.create(learning_outcome=lo, program_outcome=cls.po, weight=50)
+        cls.midterm = Assessment.objects.create(curriculum=cls.curriculum, name="Midterm", weight_in_course=40, max_score=50)
+        cls.final = Assessment.objects.create(curriculum=cls.curriculum, name="Final", weight_in_course=60, max_score=100)
+        AssessmentLearningOutcome.objects.create(assessment=cls.midterm, learning_outcome=cls.lo1, weight_in_assessment=100)
+        AssessmentLearningOutcome.objects.create(assessment=cls.final, learning_outcome=cls.lo2, weight_in_assessment=100)
+        for assessment, student, score in (
+            (cls.midterm, cls.s1, "40"), (cls.midterm, cls.s2, "25"), (cls.final, cls.s1, "60"),
+        ):
+            StudentAssessmentResult.objects.create(assessment=assessment, student=student, raw_score=Decimal(score))
+        # setUpTestData'da on_commit çalışmaz: başlangıç durumu elle kurulur
+        refresh_program_attainment(cls.program.id)
+
+    def _lo(self, student):
+        return dict(
+            LearningOutcomeAttainment.objects.filter(student=student)
+            .values_list("learning_outcome__code", "attainment")
+        )
+
+    def _po(self, student):
+        return ProgramOutcomeAttainment.objects.filter(student=student, program_outcome=self.po).values_list(
+            "attainment", flat=True,
+        ).first()
+
+    def test_initial_state(self):
+        self.assertEqual(self._lo(self.s1), {"LO1": Decimal("80.00"), "LO2": Decimal("60.00")})
+        self.assertEqual(self._lo(self.s2), {"LO1": Decimal("50.00")})
+        self.assertEqual((self._po(self.s1), self._po(self.s2)), (Decimal("70.00"), Decimal("50.00")))
+
+    def test_result_save_refreshes_only_that_student(self):
+        untouched = LearningOutcomeAttainment.objects.filter(student=self.s1).values_list("id", "computed_at")
+        before = set(untouched)
+        result = StudentAssessmentResult.objects.get(assessment=self.midterm, student=self.s2)
+        result.raw_score = Decimal("45")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            result.save()
+
+        self.assertEqual(self._lo(self.s2), {"LO1": Decimal("90.00")})
+        self.assertEqual(self._po(self.s2), Decimal("90.00"))
+        self.assertEqual(set(untouched), before)
+
+    def test_result_delete_refreshes_that_student(self):
+        result = StudentAssessmentResult.objects.get(assessment=self.final, student=self.s1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            result.delete()
+
+        self.assertEqual(self._lo(self.s1), {"LO1": Decimal("80.00")})
+        self.assertEqual(self._po(self.s1), Decimal("80.00"))
+        self.assertEqual(self._lo(self.s2), {"LO1": Decimal("50.00")})
+
+    def test_queryset_delete_refreshes_each_deleted_student(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            StudentAssessmentResult.objects.filter(assessment=self.midterm).delete()
+
+        self.assertEqual(self._lo(self.s1), {"LO2": Decimal("60.00")})
+        self.assertEqual(self._lo(self.s2), {})
+        self.assertIsNone(self._po(self.s2))
+
+    def test_cascade_delete_does_not_refresh_per_result(self):
+        with mock.patch("outcomes.signals.request_refresh") as request_refresh:
+            self.final.delete()
+        # Sadece Assessment / mapping receiver'ları: dersin tamamı, öğrenci listesi yok
+        self.assertTrue(request_refresh.called)
+        self.assertTrue(all(len(call.args) == 1 for call in request_refresh.call_args_list))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.midterm.delete()
+        self.assertEqual(self._lo(self.s1), {})
+        self.assertIsNone(self._po(self.s1))
+
+    def test_max_score_change_refreshes_whole_curriculum(self):
+        self.midterm.max_score = 100
+        with self.captureOnCommitCallbacks(execute=True):
+            self.midterm.save()
+
+        self.assertEqual(self._lo(self.s1)["LO1"], Decimal("40.00"))
+        self.assertEqual(self._lo(self.s2)["LO1"], Decimal("25.00"))
+
+    def test_batched_refresh_runs_once(self):
+        results = list(StudentAssessmentResult.objects.filter(assessment=self.midterm))
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            with batched_refresh():
+                for result in results:
+                    result.raw_score = Decimal("50")
+                    result.save()
+        attainment_callbacks = [
+            callback for callback in callbacks
+            if isinstance(callback, partial) and callback.func is refresh_curricula_attainment
+        ]
+        self.assertEqual(len(attainment_callbacks), 1)
+        self.assertEqual(attainment_callbacks[0].args, ({self.curriculum.id: {self.s1.id, self.s2.id}},))
+
+
+class AttainmentExportTests(TestCase):
+    HEADER = "username,first_name,last_name,grade,PO2,PO1,PO3\r\n"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.coordinator = CustomUser.objects.create_user("dean", role=CustomUser.Role.FACULTY_MEMBER)
+        faculty = Faculty.objects.create(code="ENG", name="Engineering", responsible=cls.coordinator)
+        cls.program = Program.objects.create(code="CENG", name="Computer Eng.", faculty=faculty)
+        # Kolon sırası id'ye değil order'a göre
+        po1 = ProgramOutcome.objects.create(program=cls.program, code="PO1", short_title="PO", order=2)
+        po2 = ProgramOutcome.objects.create(program=cls.program, code="PO2", short_title="PO", order=1)
+        po3 = ProgramOutcome.objects.create(program=cls.program, code="PO3", short_title="PO", order=3)
+        students = [
+            CustomUser.objects.create_user(
+                f"s{i}", first_name="Ada", last_name=f"L{i}", role=CustomUser.Role.STUDENT,
+                student_program=cls.program, student_grade=i + 1,
+            )
+            for i in range(4)
+        ]
+        now = timezone.now()
+        ProgramOutcomeAttainment.objects.bulk_create([
+            ProgramOutcomeAttainment(student=student, program_outcome=po, attainment=Decimal(value), computed_at=now)
+            # s2'nin hiç satırı yok (listede çıkmaz), s3'te PO2 eksik
+            for student, po, value in (
+                (students[3], po1, "40.00"), (students[0], po3, "75.50"), (students[1], po2, "90.00"),
+                (students[0], po1, "60.00"), (students[0], po2, "80.00"), (students[3], po3, "10.00"),
+            )
+        ])
+        cls.expected = cls.HEADER + (
+            "s0,Ada,L0,1,80.00,60.00,75.50\r\n"
+            "s1,Ada,L1,2,90.00,,\r\n"
+            "s3,Ada,L3,4,,40.00,10.00\r\n"
+        )
+
+    def test_one_line_per_student_in_student_order(self):
+        lines = iter_program_attainment_csv(self.program, chunk_size=2)
+
+        self.assertEqual(next(lines), self.HEADER)
+        rest = list(lines)
+        self.assertEqual(len(rest), 3)
+        self.assertEqual(self.HEADER + "".join(rest), self.expected)
+
+    def test_chunk_size_does_not_change_output(self):
+        for chunk_size in (1, 4, 2000):
+            self.assertEqual("".join(iter_program_attainment_csv(self.program, chunk_size=chunk_size)), self.expected)
+
+    def test_view_streams_csv(self):
+        self.client.force_login(self.coordinator)
+
+        response = self.client.get(reverse("outcomes:program_attainment_export", args=[self.program.id]))
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="CENG_po_attainment.csv"')
+        self.assertEqual(b"".join(response.streaming_content).decode(), self.expected)
+
+    def test_command_writes_file_or_stdout(self):
+        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as fh:
+            path = fh.name
+        self.addCleanup(os.remove, path)
+
+        call_command("export_attainment", "CENG", "-o", path, "--chunk-size", "1")
+        with open(path, encoding="utf-8", newline="") as fh:
+            self.assertEqual(fh.read(), self.expected)
+
+        stdout = io.StringIO()
+        with mock.patch("sys.stdout", stdout):
+            call_command("export_attainment", "CENG")
+        self.assertEqual(stdout.getvalue(), self.expected)
+
+        with self.assertRaises(CommandError):
+            call_command("export_attainment", "NOPE")
+
+
+class ComputeAttainmentTests(TestCase):
+    """NumPy motoru: elle hesaplanan değerler ve satır satır ORM hesabıyla karşılaştırma."""
+
+    @classmethod
+    def setUpTestData(cls):
+        faculty = Faculty.objects.create(code="ENG", name="Engineering")
+        cls.program = Program.objects.create(code="CENG", name="Computer Eng.", faculty=faculty)
+        other_program = Program.objects.create(code="EE", name="Electrical Eng.", faculty=faculty)
+        cls.c1 = Curriculum.objects.create(program=cls.program, code="CENG101", name="Intro", year=1)
+        cls.c2 = Curriculum.objects.create(program=cls.program, code="CENG201", name="Data", year=2)
+        cls.po1, cls.po2, cls.po3 = (
+            ProgramOutcome.objects.create(program=cls.program, code=f"PO{i}", short_title="PO", order=i)
+            for i in (1, 2, 3)
+        )
+        foreign_po = ProgramOutcome.objects.create(program=other_program, code="EE-PO1", short_title="PO")
+        cls.lo_a, cls.lo_b, cls.lo_z = (
+            LearningOutcome.objects.create(curriculum=cls.c1, code=code, short_title="LO") for code in ("A", "B", "Z")
+        )
+        cls.lo_c = LearningOutcome.objects.create(curriculum=cls.c2, code="C", short_title="LO")
+
+        a1 = Assessment.objects.create(curriculum=cls.c1, name="A1", weight_in_course=30, max_score=50)
+        a2 = Assessment.objects.create(curriculum=cls.c1, name="A2", weight_in_course=50, max_score=100)
+        a3 = Assessment.objects.create(curriculum=cls.c1, name="A3", weight_in_course=20, max_score=20)
+        a4 = Assessment.objects.create(curriculum=cls.c2, name="A4", weight_in_course=100, max_score=10)
+        for assessment, lo, weight in (
+            (a1, cls.lo_a, 60), (a1, cls.lo_b, 40), (a2, cls.lo_a, 100),
+            (a3, cls.lo_b, 0),  # sıfır ağırlık: hiçbir şeye katkı yok
+            (a4, cls.lo_c, 100),
+        ):
+            AssessmentLearningOutcome.objects.create(assessment=assessment, learning_outcome=lo, weight_in_assessment=weight)
+        for lo, po, weight in (
+            (cls.lo_a, cls.po1, 70), (cls.lo_b, cls.po1, 30), (cls.lo_b, cls.po2, 50), (cls.lo_c, cls.po2, 50),
+            (cls.lo_z, cls.po2, 0), (cls.lo_a, foreign_po, 100),
+        ):
+            LearningOutcomeProgramOutcome.objects.create(learning_outcome=lo, program_outcome=po, weight=weight)
+
+        cls.s1, cls.s2, cls.s3, cls.s4 = (
+            CustomUser.objects.create_user(
+                f"s{i}", role=CustomUser.Role.STUDENT, student_program=cls.program, student_grade=1,
+            )
+            for i in range(1, 5)
+        )
+        for student, assessment, score in (
+            (cls.s1, a1, "40"), (cls.s1, a2, "90"), (cls.s1, a3, "20"), (cls.s1, a4, "5"),
+            (cls.s2, a1, "25"),  # A2 / A3 notu yok
+            (cls.s4, a3, "10"), (cls.s4, a2, None),  # sadece sıfır ağırlıklı not + boş not
+        ):
+            StudentAssessmentResult.objects.create(
+                assessment=assessment, student=student, raw_score=None if score is None else Decimal(score),
+            )
+
+    def _report(self, student_ids=None):
+        return compute_attainment([self.c1.id, self.c2.id], program_id=self.program.id, student_ids=student_ids)
+
+    def test_hand_computed_values(self):
+        report = self._report()
+        self.assertEqual(report.po_ids.tolist(), [self.po1.id, self.po2.id, self.po3.id])
+
+        los, pos = report.student_row(self.s1.id)
+        # A: (0.8·60 + 0.9·100) / 160; B: (0.8·40 + 1.0·0) / 40; Z hesaplanamaz
+        self.assertEqual(set(los), {self.lo_a.id, self.lo_b.id, self.lo_c.id})
+        self.assertAlmostEqual(los[self.lo_a.id], 86.25)
+        self.assertAlmostEqual(los[self.lo_b.id], 80.0)
+        self.assertAlmostEqual(los[self.lo_c.id], 50.0)
+        # PO1: (86.25·70 + 80·30) / 100; PO2 iki dersten: (80·50 + 50·50) / 100; PO3 mapping yok
+        self.assertEqual(set(pos), {self.po1.id, self.po2.id})
+        self.assertAlmostEqual(pos[self.po1.id], 84.375)
+        self.assertAlmostEqual(pos[self.po2.id], 65.0)
+
+        los, pos = report.student_row(self.s2.id)
+        self.assertEqual(los, {self.lo_a.id: 50.0, self.lo_b.id: 50.0})
+        self.assertEqual(pos, {self.po1.id: 50.0, self.po2.id: 50.0})
+
+        # Kayıtlı ama notsuz / sadece sıfır ağırlıklı notu olan öğrenci: satır var, değer yok
+        self.assertIn(self.s3.id, report.student_ids.tolist())
+        self.assertEqual(report.student_row(self.s3.id), ({}, {}))
+        self.assertEqual(report.student_row(self.s4.id), ({}, {}))
+
+        self.assertAlmostEqual(report.po_averages()[self.po1.id], (84.375 + 50) / 2)
+
+    def test_matches_orm_reference(self):
+        report = self._report()
+        for student in (self.s1, self.s2, self.s3, self.s4):
+            expected_los, expected_pos = self._reference(student)
+            los, pos = report.student_row(student.id)
+            self.assertEqual(set(los), set(expected_los), student)
+            self.assertEqual(set(pos), set(expected_pos), student)
+            for lo_id, value in expected_los.items():
+                self.assertAlmostEqual(los[lo_id], value)
+            for po_id, value in expected_pos.items():
+                self.assertAlmostEqual(pos[po_id], value)
+
+    def test_student_subset_and_single_curriculum(self):
+        full = self._report().student_row(self.s2.id)
+        subset = self._report(student_ids=[self.s2.id])
+        self.assertEqual(subset.student_ids.tolist(), [self.s2.id])
+        self.assertEqual(subset.student_row(self.s2.id), full)
+
+        # Tek ders: PO2 sadece CENG201'in LO'su üzerinden
+        los, pos = curriculum_attainment(self.c2).student_row(self.s1.id)
+        self.assertEqual(los, {self.lo_c.id: 50.0})
+        self.assertEqual(pos, {self.po2.id: 50.0})
 
-# Create your tests here.
+    def _reference(self, student):
+        """Satır satır, ORM nesneleriyle aynı formül."""
+        los = {}
+        for lo in LearningOutcome.objects.filter(curriculum__in=[self.c1, self.c2]):
+            earned = total = 0.0
+            for mapping in AssessmentLearningOutcome.objects.filter(learning_outcome=lo).select_related("assessment"):
+                result = StudentAssessmentResult.objects.filter(
+                    assessment=mapping.assessment, student=student, raw_score__isnull=False,
+                ).first()
+                if result is not None:
+                    earned += float(result.raw_score) / float(mapping.assessment.max_score) * mapping.weight_in_assessment
+                    total += mapping.weight_in_assessment
+            if total > 0:
+                los[lo.id] = earned / total * 100
+        pos = {}
+        for po in ProgramOutcome.objects.filter(program=self.program):
+            earned = total = 0.0
+            for mapping in LearningOutcomeProgramOutcome.objects.filter(program_outcome=po):
+                if mapping.learning_outcome_id in los:
+                    earned += los[mapping.learning_outcome_id] * mapping.weight
+                    total += mapping.weight
+            if total > 0:
+                pos[po.id] = earned / total
+        return los, pos
@@ -3,10 +3,13 @@ from .views import (
     program_outcome_manage,
     program_outcome_edit,
     program_outcome_delete,
+    program_attainment_report,
+    program_attainment_export,
     learning_outcome_manage,
     learning_outcome_edit,
     learning_outcome_delete,
 	learning_outcome_mapping,
+    learning_outcome_matrix,
 )
 
 app_name = "outcomes"
@@ -15,9 +18,12 @@ urlpatterns = [
     path("program/<int:program_id>/po/", program_outcome_manage, name="program_outcome_manage"),
     path("po/<int:pk>/edit/", program_outcome_edit, name="program_outcome_edit"),
     path("po/<int:pk>/delete/", program_outcome_delete, name="program_outcome_delete"),
+    path("program/<int:program_id>/attainment/", program_attainment_report, name="program_attainment_report"),
+    path("program/<int:program_id>/attainment.csv", program_attainment_export, name="program_attainment_export"),
 
     path("curriculum/<int:curriculum_id>/lo/", learning_outcome_manage, name="learning_outcome_manage"),
     path("lo/<int:pk>/edit/", learning_outcome_edit, name="learning_outcome_edit"),
     path("lo/<int:pk>/delete/", learning_outcome_delete, name="learning_outcome_delete"),
 	path("lo/<int:pk>/mapping/", learning_outcome_mapping, name="learning_outcome_mapping"),
+    path("curriculum/<int:curriculum_id>/lo/matrix/", learning_outcome_matrix, name="learning_outcome_matrix"),
 ]
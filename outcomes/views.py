@@ -1,29 +1,23 @@
+from django.db.models import Avg, Count, Max, Min
+from django.http import StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
-from django.core.exceptions import PermissionDenied
 
 from accounts.decorators import role_required
+from accounts.permissions import require_curriculum_access, require_program_access
 from accounts.models import CustomUser
+from config.cache import CURRICULUM, PROGRAM, get_version, get_versions
 from organizations.models import Program
 from curriculum.models import Curriculum
+from .exports import iter_program_attainment_csv
+from .mapping import clean_weight, save_mapping
 from .models import ProgramOutcome, LearningOutcome, LearningOutcomeProgramOutcome
 from .forms import ProgramOutcomeForm, LearningOutcomeForm
 
 
-def _check_program_permission(user: CustomUser, program: Program):
-    """
-    Faculty Member sadece sorumlu olduğu faculty'deki programlar için
-    PO düzenleyebilsin. Admin her yere girebilir.
-    """
-    if user.is_admin:
-        return
-    if program.faculty.responsible_id != user.id:
-        raise PermissionDenied("You are not allowed to manage this program.")
-
-
 @role_required(CustomUser.Role.FACULTY_MEMBER)
 def program_outcome_manage(request, program_id):
     program = get_object_or_404(Program, id=program_id)
-    _check_program_permission(request.user, program)
+    require_program_access(request, program)
 
     outcomes = ProgramOutcome.objects.filter(program=program).order_by("order", "code")
 
@@ -41,6 +35,7 @@ def program_outcome_manage(request, program_id):
         "program": program,
         "outcomes": outcomes,
         "form": form,
+        "po_version": get_version(PROGRAM, program.id),
     }
     return render(request, "outcomes/program_outcome_manage.html", context)
 
@@ -49,7 +44,7 @@ def program_outcome_manage(request, program_id):
 def program_outcome_edit(request, pk):
     po = get_object_or_404(ProgramOutcome, pk=pk)
     program = po.program
-    _check_program_permission(request.user, program)
+    require_program_access(request, program)
 
     if request.method == "POST":
         form = ProgramOutcomeForm(request.POST, instance=po)
@@ -71,7 +66,7 @@ def program_outcome_edit(request, pk):
 def program_outcome_delete(request, pk):
     po = get_object_or_404(ProgramOutcome, pk=pk)
     program = po.program
-    _check_program_permission(request.user, program)
+    require_program_access(request, program)
 
     if request.method == "POST":
         po.delete()
@@ -84,15 +79,45 @@ def program_outcome_delete(request, pk):
     return render(request, "outcomes/program_outcome_confirm_delete.html", context)
 
 
-def _check_curriculum_permission_for_lecturer(user: CustomUser, curriculum: Curriculum):
+@role_required(CustomUser.Role.FACULTY_MEMBER)
+def program_attainment_report(request, program_id):
     """
-    Lecturer sadece kendisine atanmış curriculum'lar için LO yönetebilsin.
-    Admin her şeye girebilir.
+    Akreditasyon raporları için: programın her PO'su için öğrenci
+    attainment özetleri (tek aggregate sorgu) + CSV export linki.
     """
-    if user.is_admin:
-        return
-    if curriculum.lecturer_id != user.id:
-        raise PermissionDenied("You are not allowed to manage this curriculum.")
+    program = get_object_or_404(Program.objects.select_related("faculty"), id=program_id)
+    require_program_access(request, program)
+
+    outcomes = (
+        ProgramOutcome.objects.filter(program=program)
+        .annotate(
+            student_count=Count("attainments"),
+            average=Avg("attainments__attainment"),
+            minimum=Min("attainments__attainment"),
+            maximum=Max("attainments__attainment"),
+        )
+        .order_by("order", "code")
+    )
+
+    context = {
+        "program": program,
+        "outcomes": outcomes,
+    }
+    return render(request, "outcomes/program_attainment_report.html", context)
+
+
+@role_required(CustomUser.Role.FACULTY_MEMBER)
+def program_attainment_export(request, program_id):
+    """Öğrenci × PO attainment CSV'si, bellekte toplamadan stream edilir."""
+    program = get_object_or_404(Program.objects.select_related("faculty"), id=program_id)
+    require_program_access(request, program)
+
+    response = StreamingHttpResponse(
+        iter_program_attainment_csv(program),
+        content_type="text/csv",
+    )
+    response["Content-Disposition"] = f'attachment; filename="{program.code}_po_attainment.csv"'
+    return response
 
 
 @role_required(CustomUser.Role.LECTURER)
@@ -101,7 +126,7 @@ def learning_outcome_manage(request, curriculum_id):
         Curriculum.objects.select_related("program"),
         id=curriculum_id,
     )
-    _check_curriculum_permission_for_lecturer(request.user, curriculum)
+    require_curriculum_access(request, curriculum)
 
     los = LearningOutcome.objects.filter(
         curriculum=curriculum
@@ -117,10 +142,14 @@ def learning_outcome_manage(request, curriculum_id):
     else:
         form = LearningOutcomeForm()
 
+    # LO listesi PO kodlarını da gösterir → iki versiyon
+    lo_version, po_version = get_versions((CURRICULUM, curriculum.id), (PROGRAM, curriculum.program_id))
     context = {
         "curriculum": curriculum,
         "los": los,
         "form": form,
+        "lo_version": lo_version,
+        "po_version": po_version,
     }
     return render(request, "outcomes/learning_outcome_manage.html", context)
 
@@ -132,7 +161,7 @@ def learning_outcome_edit(request, pk):
         pk=pk,
     )
     curriculum = lo.curriculum
-    _check_curriculum_permission_for_lecturer(request.user, curriculum)
+    require_curriculum_access(request, curriculum)
 
     if request.method == "POST":
         form = LearningOutcomeForm(request.POST, instance=lo)
@@ -157,7 +186,7 @@ def learning_outcome_delete(request, pk):
         pk=pk,
     )
     curriculum = lo.curriculum
-    _check_curriculum_permission_for_lecturer(request.user, curriculum)
+    require_curriculum_access(request, curriculum)
 
     if request.method == "POST":
         lo.delete()
@@ -182,67 +211,44 @@ def learning_outcome_mapping(request, pk):
         pk=pk,
     )
     curriculum = lo.curriculum
-    _check_curriculum_permission_for_lecturer(request.user, curriculum)
+    require_curriculum_access(request, curriculum)
 
     program = curriculum.program
     pos = ProgramOutcome.objects.filter(program=program).order_by("order", "code")
 
     # Mevcut mapping'leri dictionary olarak tutalım
     existing = {
-        m.program_outcome_id: m
+        (lo.id, m.program_outcome_id): m
         for m in lo.lo_po_mappings.all()
     }
 
+    errors = []
+    posted = {}
     if request.method == "POST":
+        # Tüm satırlar önce doğrulanır; hata varsa hiçbir şey yazılmaz
+        weights = {}
         for po in pos:
-            field_name = f"po_{po.id}"
-            raw_value = request.POST.get(field_name, "").strip()
-
-            # Boş → mapping sil
-            if raw_value == "":
-                mapping = existing.get(po.id)
-                if mapping:
-                    mapping.delete()
-                continue
-
-            # Sayıya çevir
+            posted[po.id] = request.POST.get(f"po_{po.id}", "").strip()
             try:
-                weight = int(raw_value)
-            except ValueError:
-                continue  # invalid input'u şimdilik ignore
-
-            # 0 veya altı → mapping sil
-            if weight <= 0:
-                mapping = existing.get(po.id)
-                if mapping:
-                    mapping.delete()
-                continue
-
-            # 100'den büyükse clamp
-            if weight > 100:
-                weight = 100
-
-            mapping = existing.get(po.id)
-            if mapping:
-                mapping.weight = weight
-                mapping.save()
-            else:
-                LearningOutcomeProgramOutcome.objects.create(
-                    learning_outcome=lo,
-                    program_outcome=po,
-                    weight=weight,
-                )
-
-        return redirect("outcomes:learning_outcome_manage", curriculum_id=curriculum.id)
+                weights[(lo.id, po.id)] = clean_weight(posted[po.id])
+            except ValueError as exc:
+                errors.append(f"{po.code}: {exc}")
+
+        if not errors:
+            save_mapping(
+                LearningOutcomeProgramOutcome, "learning_outcome", "program_outcome", "weight",
+                weights, existing, curriculum.id,
+            )
+            return redirect("outcomes:learning_outcome_manage", curriculum_id=curriculum.id)
 
-    # GET → template'e PO + mevcut weight listesi gönder
+    # template'e PO + mevcut weight listesi (hatalı POST'ta girilen değerler korunur)
     rows = []
     for po in pos:
-        mapping = existing.get(po.id)
+        mapping = existing.get((lo.id, po.id))
         rows.append(
             {
                 "po": po,
-                "weight": mapping.weight if mapping else "",
+                "weight": posted.get(po.id, mapping.weight if mapping else ""),
             }
         )
 
@@ -250,5 +256,69 @@ def learning_outcome_mapping(request, pk):
         "curriculum": curriculum,
         "lo": lo,
         "rows": rows,
+        "errors": errors,
     }
     return render(request, "outcomes/learning_outcome_mapping.html", context)
+
+
+@role_required(CustomUser.Role.LECTURER)
+def learning_outcome_matrix(request, curriculum_id):
+    """
+    Dersin tüm LO → PO mapping'i tek ekranda (LO × PO tablosu).
+    LO'lar, programın PO'ları ve mevcut mapping'ler üç sorguda yüklenir;
+    kaydederken bütün matris tek bir bulk diff olarak yazılır.
+    """
+    curriculum = get_object_or_404(
+        Curriculum.objects.select_related("program"),
+        id=curriculum_id,
+    )
+    require_curriculum_access(request, curriculum)
+
+    los = list(LearningOutcome.objects.filter(curriculum=curriculum).order_by("order", "code"))
+    pos = list(ProgramOutcome.objects.filter(program_id=curriculum.program_id).order_by("order", "code"))
+    existing = {
+        (m.learning_outcome_id, m.program_outcome_id): m
+        for m in LearningOutcomeProgramOutcome.objects.filter(learning_outcome__curriculum=curriculum)
+    }
+
+    errors = []
+    posted = {}
+    if request.method == "POST":
+        # Tüm hücreler önce doğrulanır; hata varsa hiçbir şey yazılmaz
+        weights = {}
+        for lo in los:
+            for po in pos:
+                key = (lo.id, po.id)
+                posted[key] = request.POST.get(f"w_{lo.id}_{po.id}", "").strip()
+                try:
+                    weights[key] = clean_weight(posted[key])
+                except ValueError as exc:
+                    errors.append(f"{lo.code} → {po.code}: {exc}")
+
+        if not errors:
+            save_mapping(
+                LearningOutcomeProgramOutcome, "learning_outcome", "program_outcome", "weight",
+                weights, existing, curriculum.id,
+            )
+            return redirect("outcomes:learning_outcome_matrix", curriculum_id=curriculum.id)
+
+    # Hatalı POST'ta girilen değerler korunur
+    rows = []
+    for lo in los:
+        cells = []
+        for po in pos:
+            key = (lo.id, po.id)
+            mapping = existing.get(key)
+            cells.append({
+                "name": f"w_{lo.id}_{po.id}",
+                "weight": posted.get(key, mapping.weight if mapping else ""),
+            })
+        rows.append({"lo": lo, "cells": cells})
+
+    context = {
+        "curriculum": curriculum,
+        "pos": pos,
+        "rows": rows,
+        "errors": errors,
+    }
+    return render(request, "outcomes/learning_outcome_matrix.html", context)